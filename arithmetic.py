@@ -1,6 +1,7 @@
+from contracts import level
 from gates import NOT, NOT16, AND16, OR16WAY, XOR, AND, MUX16
 from typing import Tuple
-from utils import is_n_bit_vector
+from utils import Word16, as_word, is_n_bit_vector
 
 
 ZERO16 = (False,) * 16
@@ -8,9 +9,12 @@ ZERO16 = (False,) * 16
 
 def HALFADDER(x: bool, y: bool) -> tuple[bool, bool]:
     """Adds up 2 bits."""
+    checks = level("arithmetic.HALFADDER")
+
     # pre-conditions
-    assert isinstance(x, bool)
-    assert isinstance(y, bool)
+    if checks:
+        assert isinstance(x, bool)
+        assert isinstance(y, bool)
 
     # body
     s = XOR(x, y)
@@ -18,17 +22,21 @@ def HALFADDER(x: bool, y: bool) -> tuple[bool, bool]:
     out = s, carry
 
     # post-conditions
-    assert is_n_bit_vector(out, n=2)
+    if checks:
+        assert is_n_bit_vector(out, n=2)
 
     return out
 
 
 def FULLADDER(x: bool, y: bool, carry: bool) -> tuple[bool, bool]:
     """Adds up 3 bits."""
+    checks = level("arithmetic.FULLADDER")
+
     # pre-conditions
-    assert isinstance(x, bool)
-    assert isinstance(y, bool)
-    assert isinstance(carry, bool)
+    if checks:
+        assert isinstance(x, bool)
+        assert isinstance(y, bool)
+        assert isinstance(carry, bool)
 
     # body
     fst_sum, fst_carry = HALFADDER(x, y)
@@ -40,66 +48,85 @@ def FULLADDER(x: bool, y: bool, carry: bool) -> tuple[bool, bool]:
     out = new_sum, new_carry
 
     # post-conditions
-    assert is_n_bit_vector(out, n=2), "Output must be 2-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(out, n=2), "Output must be 2-tuple of `bool`s"
 
     return out
 
 
 def ADD16(xs: tuple[bool, ...], ys: tuple[bool, ...]) -> tuple[bool, ...]:
     """Adds up two 16-bit two's complement numbers. Overflow is ignored."""
+    checks = level("arithmetic.ADD16")
+
     # pre-conditions
-    assert is_n_bit_vector(xs, n=16), "`x` must be a 16-tuple of `bool`s"
-    assert is_n_bit_vector(ys, n=16), "`y` must be a 16-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(xs, n=16), "`x` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(ys, n=16), "`y` must be a 16-tuple of `bool`s"
 
     # body
-    out, carry = [False] * 16, False
+    if type(xs) is Word16 or type(ys) is Word16:
+        out = Word16((as_word(xs).value + as_word(ys).value) & 0xFFFF)
+    else:
+        out, carry = [False] * 16, False
 
-    for i, (x, y) in enumerate(zip(xs[::-1], ys[::-1])):
-        out[i], carry = FULLADDER(x, y, carry)
+        for i, (x, y) in enumerate(zip(xs[::-1], ys[::-1])):
+            out[i], carry = FULLADDER(x, y, carry)
 
-    out = tuple(out[::-1])  # type: ignore
+        out = tuple(out[::-1])  # type: ignore
 
     # post-conditions
-    assert is_n_bit_vector(out, n=16), "`out` must be a 16-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(out, n=16), "`out` must be a 16-tuple of `bool`s"
 
     return out  # type: ignore
 
 
 def INC16(xs: tuple[bool, ...]) -> tuple[bool, ...]:
     """Adds 1 to input. Overflow is ignored."""
+    checks = level("arithmetic.INC16")
+
     # pre-conditions
-    assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
 
     # body
     one = (False,) * 15 + (True,)
     out = ADD16(xs, one)
 
     # post-conditions
-    assert is_n_bit_vector(out, n=16), "`out` must be a 16-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(out, n=16), "`out` must be a 16-tuple of `bool`s"
 
     return out
 
 
 def NEG16(xs: tuple[bool, ...]) -> tuple[bool, ...]:
     """Negates input."""
+    checks = level("arithmetic.NEG16")
+
     # pre-conditions
-    assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
 
     # body
     out = INC16(NOT16(xs))
 
     # post-conditions
-    assert is_n_bit_vector(out, n=16), "`out` must be a 16-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(out, n=16), "`out` must be a 16-tuple of `bool`s"
 
     return out
 
 
 def _PRESET16(xs: tuple[bool, ...], zx: bool, nx: bool) -> tuple[bool, ...]:
     """Prepares input for ALU. Zeroes out input if `zx` is `True` then negates input if `nx` is `True`."""
+    checks = level("arithmetic._PRESET16")
+
     # pre-conditions
-    assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
-    assert isinstance(zx, bool), "`zx` must be a `bool`"
-    assert isinstance(nx, bool), "`nx` must be a `bool`"
+    if checks:
+        assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
+        assert isinstance(zx, bool), "`zx` must be a `bool`"
+        assert isinstance(nx, bool), "`nx` must be a `bool`"
 
     # body
     zeroed = MUX16(
@@ -115,7 +142,8 @@ def _PRESET16(xs: tuple[bool, ...], zx: bool, nx: bool) -> tuple[bool, ...]:
     )
 
     # post-conditions
-    assert is_n_bit_vector(out, n=16), "`out` must be a 16-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(out, n=16), "`out` must be a 16-tuple of `bool`s"
 
     return out
 
@@ -148,15 +176,18 @@ def ALU(
         zr: if True, `out` is 0
         ng: if True, `out` is negative
     """
+    checks = level("arithmetic.ALU")
+
     # pre-conditions
-    assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
-    assert is_n_bit_vector(ys, n=16), "`ys` must be a 16-tuple of `bool`s"
-    assert isinstance(zx, bool), "`zx` must be a `bool`"
-    assert isinstance(nx, bool), "`nx` must be a `bool`"
-    assert isinstance(zy, bool), "`zy` must be a `bool`"
-    assert isinstance(ny, bool), "`ny` must be a `bool`"
-    assert isinstance(f, bool), "`f` must be a `bool`"
-    assert isinstance(no, bool), "`no` must be a `bool`"
+    if checks:
+        assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(ys, n=16), "`ys` must be a 16-tuple of `bool`s"
+        assert isinstance(zx, bool), "`zx` must be a `bool`"
+        assert isinstance(nx, bool), "`nx` must be a `bool`"
+        assert isinstance(zy, bool), "`zy` must be a `bool`"
+        assert isinstance(ny, bool), "`ny` must be a `bool`"
+        assert isinstance(f, bool), "`f` must be a `bool`"
+        assert isinstance(no, bool), "`no` must be a `bool`"
 
     # body
     tx = _PRESET16(xs, zx, nx)
@@ -178,8 +209,9 @@ def ALU(
     ng = tout[0]
 
     # post-conditions
-    assert is_n_bit_vector(out, n=16), "`out` must be a 16-tuple of `bool`s"
-    assert isinstance(zr, bool), "`zr` must be a `bool`"
-    assert isinstance(ng, bool), "`ng` must be a `bool`"
+    if checks:
+        assert is_n_bit_vector(out, n=16), "`out` must be a 16-tuple of `bool`s"
+        assert isinstance(zr, bool), "`zr` must be a `bool`"
+        assert isinstance(ng, bool), "`ng` must be a `bool`"
 
     return tout, zr, ng
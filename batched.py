@@ -0,0 +1,272 @@
+"""Batched gates and arithmetic over NumPy arrays.
+
+Each `<GATE>_batch` function evaluates `<GATE>` over many input vectors at once and
+agrees with the scalar reference on every vector. Inputs broadcast against each other.
+
+- 1-bit signals are boolean arrays.
+- 16-bit words are either `uint16` arrays or boolean arrays whose last axis holds the 16
+  bits, most significant bit first, as in the tuple form. 16-bit outputs are boolean
+  arrays if any 16-bit input is, and `uint16` arrays otherwise.
+- Selectors are either boolean arrays whose last axis holds the selector bits, most
+  significant bit first, or unsigned integer arrays of selector values. They span the
+  batch axes only, never the bit axis of the words they select between.
+- Multi-output gates (`DMUX`, `DMUX4WAY`, `DMUX8WAY`) stack their outputs on a new last
+  axis.
+
+NumPy is listed in `requirements.txt`, but only this module needs it: the rest of the package
+imports and runs without it.
+"""
+
+import numpy as np
+
+from contracts import level
+from typing import Any
+
+
+_SHIFTS16 = np.arange(15, -1, -1, dtype=np.uint16)
+
+
+def _is_bits(xs: Any, n: int) -> bool:
+    """Returns `True` iff `xs` is a boolean array of `n`-bit vectors."""
+    return xs.dtype == np.bool_ and xs.ndim >= 1 and xs.shape[-1] == n
+
+
+def _words(xs: Any) -> Any:
+    """Returns the 16-bit words `xs` as a `uint16` array."""
+    xs = np.asarray(xs)
+
+    if xs.dtype == np.bool_:
+        assert _is_bits(xs, 16), "boolean words must have 16 bits on their last axis"
+        packed = np.packbits(xs, axis=-1, bitorder="big").astype(np.uint16)
+        return (packed[..., 0] << 8) | packed[..., 1]
+
+    assert xs.dtype == np.uint16, "words must be `uint16` or boolean arrays"
+
+    return xs
+
+
+def _bits(words: Any) -> Any:
+    """Returns the `uint16` array `words` as a boolean array of 16-bit vectors."""
+    return ((words[..., None] >> _SHIFTS16) & 1).astype(np.bool_)
+
+
+def _like(words: Any, *inputs: Any) -> Any:
+    """Returns `words` as bits if any of `inputs` is given as bits."""
+    if any(np.asarray(xs).dtype == np.bool_ for xs in inputs):
+        return _bits(words)
+
+    return words
+
+
+def _selector(sel: Any, n: int) -> Any:
+    """Returns the `n`-bit selector `sel` as an array of selector values."""
+    sel = np.asarray(sel)
+
+    if sel.dtype == np.bool_:
+        assert _is_bits(sel, n), f"boolean selectors must have {n} bits on their last axis"
+        return (sel.astype(np.uint8) << np.arange(n - 1, -1, -1, dtype=np.uint8)).sum(
+            axis=-1, dtype=np.uint8
+        )
+
+    assert np.issubdtype(sel.dtype, np.unsignedinteger), "selectors must be unsigned"
+    assert np.all(sel < 2**n), f"selector values must be in [0, 2^{n})"
+
+    return sel
+
+
+# elementary logic gates
+def AND_batch(x: Any, y: Any) -> Any:
+    """Batched And gate."""
+    return np.logical_and(x, y)
+
+
+def OR_batch(x: Any, y: Any) -> Any:
+    """Batched Or gate."""
+    return np.logical_or(x, y)
+
+
+def NOT_batch(x: Any) -> Any:
+    """Batched Not gate."""
+    return np.logical_not(x)
+
+
+def NAND_batch(x: Any, y: Any) -> Any:
+    """Batched Nand gate."""
+    return np.logical_not(np.logical_and(x, y))
+
+
+def XOR_batch(x: Any, y: Any) -> Any:
+    """Batched Xor gate."""
+    return np.logical_xor(x, y)
+
+
+def MUX_batch(x: Any, y: Any, sel: Any) -> Any:
+    """Batched selection between two inputs."""
+    return np.where(sel, y, x).astype(np.bool_)
+
+
+def DMUX_batch(x: Any, sel: Any) -> Any:
+    """Batched channelling of the input to one out of two outputs."""
+    x, sel = np.broadcast_arrays(np.asarray(x, dtype=np.bool_), np.asarray(sel, dtype=np.bool_))
+    return np.stack([x & ~sel, x & sel], axis=-1)
+
+
+# 16-bit variants
+def NOT16_batch(xs: Any) -> Any:
+    """Batched 16-bit Not."""
+    checks = level("batched.NOT16_batch")
+
+    # body
+    out = _like(~_words(xs), xs)
+
+    # post-conditions
+    if checks:
+        assert out.dtype in (np.bool_, np.uint16), "output must be words"
+
+    return out
+
+
+def AND16_batch(xs: Any, ys: Any) -> Any:
+    """Batched 16-bit And."""
+    checks = level("batched.AND16_batch")
+
+    # body
+    out = _like(_words(xs) & _words(ys), xs, ys)
+
+    # post-conditions
+    if checks:
+        assert out.dtype in (np.bool_, np.uint16), "output must be words"
+
+    return out
+
+
+def OR16_batch(xs: Any, ys: Any) -> Any:
+    """Batched 16-bit Or."""
+    checks = level("batched.OR16_batch")
+
+    # body
+    out = _like(_words(xs) | _words(ys), xs, ys)
+
+    # post-conditions
+    if checks:
+        assert out.dtype in (np.bool_, np.uint16), "output must be words"
+
+    return out
+
+
+def MUX16_batch(xs: Any, ys: Any, sel: Any) -> Any:
+    """Batched selection between two 16-bit inputs."""
+    checks = level("batched.MUX16_batch")
+
+    # body
+    out = _like(np.where(sel, _words(ys), _words(xs)).astype(np.uint16), xs, ys)
+
+    # post-conditions
+    if checks:
+        assert out.dtype in (np.bool_, np.uint16), "output must be words"
+
+    return out
+
+
+# multi-way variants
+def OR8WAY_batch(xs: Any) -> Any:
+    """Batched 8-way Or over boolean arrays with 8 bits on their last axis."""
+    checks = level("batched.OR8WAY_batch")
+
+    # pre-conditions
+    if checks:
+        assert _is_bits(np.asarray(xs), 8), "`xs` must have 8 bits on its last axis"
+
+    # body
+    out = np.any(xs, axis=-1)
+
+    return out
+
+
+def OR16WAY_batch(xs: Any) -> Any:
+    """Batched 16-way Or."""
+    return _words(xs) != 0
+
+
+def MUX4WAY16_batch(xs: Any, ys: Any, zs: Any, ws: Any, sel: Any) -> Any:
+    """Batched selection between four 16-bit inputs."""
+    checks = level("batched.MUX4WAY16_batch")
+
+    # body
+    words = np.broadcast_arrays(*(_words(a) for a in (xs, ys, zs, ws)))
+    out = _like(np.choose(_selector(sel, 2), words).astype(np.uint16), xs, ys, zs, ws)
+
+    # post-conditions
+    if checks:
+        assert out.dtype in (np.bool_, np.uint16), "output must be words"
+
+    return out
+
+
+def MUX8WAY16_batch(
+    xs: Any, ys: Any, zs: Any, ws: Any, us: Any, vs: Any, ms: Any, ns: Any, sel: Any
+) -> Any:
+    """Batched selection between eight 16-bit inputs."""
+    checks = level("batched.MUX8WAY16_batch")
+
+    # body
+    inputs = (xs, ys, zs, ws, us, vs, ms, ns)
+    words = np.broadcast_arrays(*(_words(a) for a in inputs))
+    out = _like(np.choose(_selector(sel, 3), words).astype(np.uint16), *inputs)
+
+    # post-conditions
+    if checks:
+        assert out.dtype in (np.bool_, np.uint16), "output must be words"
+
+    return out
+
+
+def DMUX4WAY_batch(x: Any, sel: Any) -> Any:
+    """Batched channelling of the input to one out of four outputs."""
+    idx = _selector(sel, 2)
+    return np.asarray(x, dtype=np.bool_)[..., None] & (idx[..., None] == np.arange(4))
+
+
+def DMUX8WAY_batch(x: Any, sel: Any) -> Any:
+    """Batched channelling of the input to one out of eight outputs."""
+    idx = _selector(sel, 3)
+    return np.asarray(x, dtype=np.bool_)[..., None] & (idx[..., None] == np.arange(8))
+
+
+# arithmetic
+def ADD16_batch(xs: Any, ys: Any) -> Any:
+    """Batched 16-bit two's complement addition. Overflow is ignored."""
+    out = (_words(xs).astype(np.uint32) + _words(ys)).astype(np.uint16)
+    return _like(out, xs, ys)
+
+
+def INC16_batch(xs: Any) -> Any:
+    """Batched 16-bit increment. Overflow is ignored."""
+    return _like((_words(xs) + np.uint16(1)).astype(np.uint16), xs)
+
+
+def ALU_batch(
+    xs: Any, ys: Any, zx: Any, nx: Any, zy: Any, ny: Any, f: Any, no: Any
+) -> tuple[Any, Any, Any]:
+    """Batched `arithmetic.ALU`, built from the batched gates. Returns `(out, zr, ng)`."""
+    checks = level("batched.ALU_batch")
+
+    # body
+    zero = np.uint16(0)
+    tx = MUX16_batch(xs, zero, zx)
+    tx = MUX16_batch(tx, NOT16_batch(tx), nx)
+    ty = MUX16_batch(ys, zero, zy)
+    ty = MUX16_batch(ty, NOT16_batch(ty), ny)
+
+    out = MUX16_batch(AND16_batch(tx, ty), ADD16_batch(tx, ty), f)
+    tout = MUX16_batch(out, NOT16_batch(out), no)
+
+    words = _words(tout)
+    zr = NOT_batch(OR16WAY_batch(words))
+    ng = (words >> 15).astype(np.bool_)
+
+    # post-conditions
+    if checks:
+        assert zr.shape == ng.shape == words.shape, "flags must have a value per word"
+
+    return tout, zr, ng
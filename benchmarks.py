@@ -0,0 +1,640 @@
+"""Micro-benchmarks for the simulator's hot paths.
+
+Run with `python benchmarks.py [name ...]`; with no names, every benchmark is run.
+"""
+
+import argparse
+import contracts
+import dataclasses
+import engines
+import gates
+import intgates
+import random
+import time
+import tracemalloc
+
+from computer import CPU, Computer, is_valid_instruction
+from decoder import (
+    DEST_SYMBOL_TO_INSTRUCTION,
+    COMP_SYMBOL_TO_INSTRUCTION,
+    JUMP_SYMBOL_TO_INSTRUCTION,
+)
+from stimulus import Stimulus, to_bits
+from typing import Callable, Sequence
+from utils import Word16, as_word, int_to_bit_vector, is_n_bit_vector, sample_bits, to_int
+
+
+def _rate(fn: Callable, inputs: Sequence, min_seconds: float = 0.2) -> float:
+    """Returns the number of calls of `fn` per second, cycling through `inputs`."""
+    # pre-conditions
+    assert len(inputs) > 0, "`inputs` must be non-empty"
+
+    # body
+    fn(*inputs[0])  # warm up lazily built tables outside the timed loop
+
+    calls, elapsed = 0, 0.0
+
+    while elapsed < min_seconds:
+        start = time.perf_counter()
+
+        for args in inputs:
+            fn(*args)
+
+        elapsed += time.perf_counter() - start
+        calls += len(inputs)
+
+    out = calls / elapsed
+
+    # post-conditions
+    assert out > 0, "output must be positive"
+
+    return out
+
+
+def _legacy_to_int(bs: tuple[bool, ...]) -> int:
+    """`utils.to_int` before the lookup tables, kept as the baseline."""
+    assert isinstance(bs, tuple), "input must be a tuple"
+    assert all(isinstance(b, bool) for b in bs), "input must be a tuple of bools"
+
+    int_values = [int(value) for value in bs]
+    str_values = [str(value) for value in int_values]
+    binary_repr = "".join(str_values)
+    out = int(binary_repr, 2)
+
+    assert isinstance(out, int), "output must be an integer"
+
+    return out
+
+
+def _legacy_int_to_bit_vector(i: int, n: int) -> tuple[bool, ...]:
+    """`utils.int_to_bit_vector` before the lookup tables, kept as the baseline."""
+    assert isinstance(i, int), "input must be an integer"
+    assert isinstance(n, int), "input must be an integer"
+    assert n >= 0, "input must be a non-negative integer"
+
+    if n < i.bit_length():
+        raise ValueError("input is too large to fit in `n` bits")
+
+    binary = bin(i)[2:].zfill(n)
+    out = tuple(bit == "1" for bit in binary)
+
+    assert is_n_bit_vector(out, n), "output must be an `n`-bit tuple of bools"
+
+    return out
+
+
+def _legacy_is_valid_instruction(instruction: tuple[bool, ...]) -> bool:
+    """`computer.is_valid_instruction` before the decode table, kept as the baseline."""
+    if not is_n_bit_vector(instruction, n=16):
+        return False
+
+    if instruction[0] == False:
+        return True
+
+    comp = instruction[3:10]
+    dest = instruction[10:13]
+    jump = instruction[13:16]
+
+    if to_int(comp) not in COMP_SYMBOL_TO_INSTRUCTION.values():
+        return False
+
+    if to_int(dest) not in DEST_SYMBOL_TO_INSTRUCTION.values():
+        return False
+
+    if to_int(jump) not in JUMP_SYMBOL_TO_INSTRUCTION.values():
+        return False
+
+    return True
+
+
+def _legacy_sample_bits(n: int) -> tuple:
+    """`utils.sample_bits` before batching, kept as the baseline."""
+    assert n >= 0 and isinstance(n, int), "`n` must be a non-negative integer"
+
+    out = tuple(random.choice([True, False]) for _ in range(n))
+
+    assert is_n_bit_vector(out, n), "output must be an `n`-bit tuple of bools"
+
+    return out
+
+
+def bench_conversions(samples: int = 4_096) -> dict[str, tuple[float, float]]:
+    """Conversions per second before and after the lookup tables, for the widths used by the simulator."""
+    out = {}
+
+    for n in (16, 15, 14, 3):
+        ints = [(random.randrange(2**n), n) for _ in range(samples)]
+        vectors = [(int_to_bit_vector(i, n),) for i, _ in ints]
+
+        out[f"to_int ({n}-bit)"] = (
+            _rate(_legacy_to_int, vectors),
+            _rate(to_int, vectors),
+        )
+        out[f"int_to_bit_vector ({n}-bit)"] = (
+            _rate(_legacy_int_to_bit_vector, ints),
+            _rate(int_to_bit_vector, ints),
+        )
+
+    return out
+
+
+def bench_decode(samples: int = 4_096) -> dict[str, tuple[float, float]]:
+    """Instruction validity checks per second before and after the decode table."""
+    c_instructions = [
+        (int_to_bit_vector(0b111 << 13 | random.randrange(2**13), n=16),)
+        for _ in range(samples)
+    ]
+    instructions = [(int_to_bit_vector(random.randrange(2**16), n=16),) for _ in range(samples)]
+    words = [(as_word(xs),) for xs, in instructions]
+
+    return {
+        "is_valid_instruction (C-instr.)": (
+            _rate(_legacy_is_valid_instruction, c_instructions),
+            _rate(is_valid_instruction, c_instructions),
+        ),
+        "is_valid_instruction (any)": (
+            _rate(_legacy_is_valid_instruction, instructions),
+            _rate(is_valid_instruction, instructions),
+        ),
+        "is_valid_instruction (Word16)": (
+            _rate(_legacy_is_valid_instruction, words),
+            _rate(is_valid_instruction, words),
+        ),
+    }
+
+
+def bench_stimulus(samples: int = 4_096) -> dict[str, tuple[float, float]]:
+    """Random 16-bit words per second, drawn one at a time before and in batches after."""
+    stimulus = Stimulus(seed=0)
+    baseline = _rate(_legacy_sample_bits, [(16,)] * samples)
+
+    out = {
+        "sample_bits": (baseline, _rate(sample_bits, [(16,)] * samples)),
+        "batch of tuples": (
+            baseline,
+            _rate(lambda: to_bits(stimulus.words(samples)), [()]) * samples,
+        ),
+        "batch of packed ints": (
+            baseline,
+            _rate(lambda: stimulus.words(samples), [()]) * samples,
+        ),
+    }
+
+    try:
+        np_stimulus = Stimulus(seed=0, numpy=True)
+    except ImportError:
+        return out
+
+    out["batch of numpy uint16s"] = (
+        baseline,
+        _rate(lambda: np_stimulus.words(samples), [()]) * samples,
+    )
+
+    return out
+
+
+def _reachable(root: object) -> set[int]:
+    """Returns the ids of the components, tuples and words reachable from `root`."""
+    seen: set[int] = set()
+    stack = [root]
+
+    while stack:
+        obj = stack.pop()
+
+        if id(obj) in seen:
+            continue
+
+        if dataclasses.is_dataclass(obj):
+            stack.extend(getattr(obj, f.name) for f in dataclasses.fields(obj))
+        elif isinstance(obj, tuple):
+            stack.extend(obj)
+        elif type(obj) is not Word16:
+            continue  # bools, ints and `None` are shared by the interpreter
+
+        seen.add(id(obj))
+
+    return seen
+
+
+def bench_memory(cycles: int = 4) -> dict[str, float]:
+    """Bytes per `Computer` and objects allocated per cycle, measured with boundary checks."""
+    instructions = (
+        Word16(0b0000000000000111),  # @7
+        Word16(0b1110110000010000),  # D=A
+        Word16(0b0000000000000000),  # @0
+        Word16(0b1110001100001000),  # M=D
+        Word16(0b0000000000000000),  # @0
+        Word16(0b1110101010000111),  # 0;JMP
+    )
+
+    with contracts.policy("boundary"):
+        Computer.create(instructions)(reset=True)  # builds the lookup tables shared by all computers
+        tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[0]
+        computer = Computer.create(instructions)
+        bytes_per_computer = tracemalloc.get_traced_memory()[0] - start
+
+        computers = [computer(reset=True)]
+        start = tracemalloc.get_traced_memory()[0]
+
+        for _ in range(cycles):
+            computers.append(computers[-1](reset=False))
+
+        bytes_per_cycle = (tracemalloc.get_traced_memory()[0] - start) / cycles
+        tracemalloc.stop()
+
+    objects = [_reachable(c) for c in computers]
+    allocated = [len(new - old) for old, new in zip(objects, objects[1:])]
+
+    return {
+        "bytes per Computer": bytes_per_computer,
+        "objects per Computer": len(objects[0]),
+        "bytes retained per cycle": bytes_per_cycle,
+        "objects allocated per cycle": sum(allocated) / cycles,
+    }
+
+
+def bench_gates16(samples: int = 1_024) -> dict[str, tuple[float, float]]:
+    """Calls per second of the 16-bit gates on tuples, reference before and `intgates` after."""
+    words = [sample_bits(16) for _ in range(8 * samples)]
+    selectors = [sample_bits(3) for _ in range(samples)]
+    args = {
+        "NOT16": [(words[i],) for i in range(samples)],
+        "AND16": [(words[i], words[i + 1]) for i in range(samples)],
+        "OR16": [(words[i], words[i + 1]) for i in range(samples)],
+        "MUX16": [(words[i], words[i + 1], selectors[i][0]) for i in range(samples)],
+        "OR16WAY": [(words[i],) for i in range(samples)],
+        "MUX4WAY16": [(*words[i : i + 4], selectors[i][1:]) for i in range(samples)],
+        "MUX8WAY16": [(*words[i : i + 8], selectors[i]) for i in range(samples)],
+    }
+
+    out = {
+        name: (_rate(getattr(gates, name), inputs), _rate(getattr(intgates, name), inputs))
+        for name, inputs in args.items()
+    }
+
+    computer = Computer.create(tuple(to_bits(Stimulus(seed=0).instructions(64))))
+    before = _rate(computer, [(False,)])
+
+    with engines.using(intgates.ENGINE):
+        after = _rate(computer, [(False,)])
+
+    out["Computer cycle (tuple path)"] = (before, after)
+
+    return out
+
+
+def bench_batched(samples: int = 65_536) -> dict[str, tuple[float, float]]:
+    """Input vectors per second, one call per vector before and one `batched` call per batch after."""
+    try:
+        import batched
+        import numpy as np
+    except ImportError:
+        return {}
+
+    import arithmetic
+
+    rng = np.random.default_rng(0)
+    words = rng.integers(0, 2**16, size=(8, samples), dtype=np.uint16)
+    selectors = rng.integers(0, 8, size=samples, dtype=np.uint8)
+    tuples = [to_bits(w[:1_024]) for w in words]
+    tuple_selectors = [int_to_bit_vector(int(s), n=3) for s in selectors[:1_024]]
+    controls = (False, True, False, False, True, True)  # x-y
+
+    cases = {
+        "AND16": (
+            gates.AND16,
+            list(zip(tuples[0], tuples[1])),
+            lambda: batched.AND16_batch(words[0], words[1]),
+        ),
+        "MUX8WAY16": (
+            gates.MUX8WAY16,
+            list(zip(*tuples, tuple_selectors)),
+            lambda: batched.MUX8WAY16_batch(*words, selectors),
+        ),
+        "DMUX8WAY": (
+            gates.DMUX8WAY,
+            [(True, s) for s in tuple_selectors],
+            lambda: batched.DMUX8WAY_batch(True, selectors),
+        ),
+        "ALU": (
+            arithmetic.ALU,
+            [(x, y, *controls) for x, y in zip(tuples[0], tuples[1])],
+            lambda: batched.ALU_batch(words[0], words[1], *controls),
+        ),
+    }
+
+    return {
+        name: (_rate(reference, inputs), _rate(batch, [()]) * samples)
+        for name, (reference, inputs, batch) in cases.items()
+    }
+
+
+def bench_lanes(widths: Sequence[int] = (64, 4_096)) -> dict[str, tuple[float, float]]:
+    """Gate-level stimuli per second with checks off, one instance per call before and `width` lanes per call after."""
+    import arithmetic
+    import lanes
+
+    stimulus = Stimulus(seed=0)
+    words = list(stimulus.words(max(widths)))
+    instructions = list(stimulus.instructions(max(widths)))
+    tuples = to_bits(words[:1_024])
+    controls = (False, True, False, False, True, True)  # x-y
+    cpu = CPU.create()
+
+    with contracts.policy("off"):
+        before = {
+            "ADD16": _rate(arithmetic.ADD16, list(zip(tuples, tuples[1:]))),
+            "ALU": _rate(arithmetic.ALU, [(x, y, *controls) for x, y in zip(tuples, tuples[1:])]),
+            "CPU cycle": _rate(
+                cpu, list(zip(to_bits(instructions[:1_024]), tuples, [False] * 1_024))
+            ),
+        }
+
+    out = {}
+
+    for width in widths:
+        xs, ys = lanes.pack(words[:width]), lanes.pack(words[::-1][:width])
+        instruction = lanes.pack(instructions[:width])
+
+        with lanes.simulate(width):
+            after = {
+                "ADD16": _rate(arithmetic.ADD16, [(xs, ys)]),
+                "ALU": _rate(arithmetic.ALU, [(xs, ys, *controls)]),
+                "CPU cycle": _rate(cpu, [(instruction, ys, False)]),
+            }
+
+        for case, rate in after.items():
+            out[f"{case} x{width}"] = (before[case], rate * width)
+
+    return out
+
+
+def bench_compiled(samples: int = 1_024) -> dict[str, tuple[float, float]]:
+    """Gate-level calls per second with checks off, interpreted before and compiled after."""
+    import arithmetic
+    import compiler
+
+    compiler.load()
+    words = [sample_bits(16) for _ in range(samples + 1)]
+    instructions = to_bits(Stimulus(seed=0).instructions(samples))
+    controls = (False, True, False, False, True, True)  # x-y
+    alu_inputs = [(x, y, *controls) for x, y in zip(words, words[1:])]
+    cpu = CPU.create()
+    cpu_inputs = list(zip(instructions, words, [False] * samples))
+    computer = Computer.create(tuple(instructions[:64]))
+
+    with contracts.policy("off"):
+        out = {
+            "ALU": (_rate(arithmetic.ALU, alu_inputs), _rate(compiler.ALU, alu_inputs)),
+            "CPU cycle": (
+                _rate(cpu, cpu_inputs),
+                _rate(lambda *args: compiler.CPU__call__(cpu, *args), cpu_inputs),
+            ),
+        }
+        before = _rate(computer, [(False,)])
+
+        with engines.using(compiler.ENGINE):
+            out["Computer cycle (tuple path)"] = (before, _rate(computer, [(False,)]))
+
+    return out
+
+
+def bench_indexed(samples: int = 8) -> dict[str, tuple[float, float]]:
+    """Memory reads and `Computer` cycles per second with checks off, reference before and `indexed` after."""
+    import indexed
+    from computer import Memory
+    from memory import RAM8, RAM16K
+
+    words = [sample_bits(16) for _ in range(samples)]
+    ram8, ram16k, memory = RAM8.create(), RAM16K.create(), Memory.create()
+    ram8_reads = [(xs, False, sample_bits(3)) for xs in words]
+    ram16k_reads = [(xs, False, sample_bits(14)) for xs in words]
+    memory_reads = [(xs, (False, *sample_bits(14)), False) for xs in words]
+    computer = Computer.create(tuple(to_bits(Stimulus(seed=0).instructions(64))))
+    cases = {
+        "RAM8 read": (ram8, ram8_reads),
+        "RAM16K read": (ram16k, ram16k_reads),
+        "Memory read": (memory, memory_reads),
+        "Computer cycle": (computer, [(False,)]),
+    }
+
+    with contracts.policy("off"):
+        before = {case: _rate(fn, inputs) for case, (fn, inputs) in cases.items()}
+
+        with engines.using(indexed.ENGINE):
+            after = {case: _rate(fn, inputs) for case, (fn, inputs) in cases.items()}
+
+    return {case: (before[case], after[case]) for case in cases}
+
+
+
+def bench_adder(samples: int = 1_024) -> dict[str, tuple[float, float]]:
+    """Adds per second with checks off, ripple adder before and `byteadder` after."""
+    import arithmetic
+    import byteadder
+    from memory import PC
+
+    words = [tuple(sample_bits(16)) for _ in range(samples + 1)]
+    pairs = [(words[i], words[i + 1]) for i in range(samples)]
+    pc = PC.create()
+    cases = {
+        "ADD16": ("ADD16", pairs),
+        "ADD16 (Word16)": ("ADD16", [(as_word(xs), as_word(ys)) for xs, ys in pairs]),
+        "INC16": ("INC16", [(xs,) for xs in words]),
+        "NEG16": ("NEG16", [(xs,) for xs in words]),
+        "ALU": ("ALU", [(*pair, *sample_bits(6)) for pair in pairs]),
+    }
+
+    def rates() -> dict[str, float]:
+        # the engine rebinds the functions in `arithmetic`, so look them up on every run
+        out = {case: _rate(getattr(arithmetic, f), args) for case, (f, args) in cases.items()}
+        out["PC cycle"] = _rate(pc, [(xs, False, True, False) for xs in words])
+
+        return out
+
+    with contracts.policy("off"):
+        before = rates()
+
+        with engines.using(byteadder.ENGINE):
+            after = rates()
+
+    return {case: (before[case], after[case]) for case in before}
+
+
+def bench_alu(samples: int = 1_024) -> dict[str, tuple[float, float]]:
+    """ALU calls and `CPU` cycles per second with checks off, gate-level ALU before and `alukernels` after."""
+    import alukernels
+    import arithmetic
+
+    codes = list(alukernels.CONTROLS.values())
+    words = [tuple(sample_bits(16)) for _ in range(samples + 1)]
+    args = [(words[i], words[i + 1], *codes[i % len(codes)]) for i in range(samples)]
+    word_args = [(as_word(xs), as_word(ys), *controls) for xs, ys, *controls in args]
+    instructions = to_bits(Stimulus(seed=0).instructions(samples, c_fraction=1.0))
+    cycles = [(instruction, xs, False) for instruction, xs in zip(instructions, words)]
+    cpu = CPU.create()
+
+    def rates() -> dict[str, float]:
+        return {
+            "ALU": _rate(arithmetic.ALU, args),
+            "ALU (Word16)": _rate(arithmetic.ALU, word_args),
+            "CPU cycle": _rate(cpu, cycles),
+        }
+
+    with contracts.policy("off"):
+        before = rates()
+
+        with engines.using(alukernels.ENGINE):
+            after = rates()
+
+    return {case: (before[case], after[case]) for case in before}
+
+
+def _c(comp: str, dest: str = "null", jump: str = "null") -> int:
+    """Assembles a C-instruction."""
+    return (
+        0b111 << 13
+        | COMP_SYMBOL_TO_INSTRUCTION[comp] << 6
+        | DEST_SYMBOL_TO_INSTRUCTION[dest] << 3
+        | JUMP_SYMBOL_TO_INSTRUCTION[jump]
+    )
+
+
+# RAM[0] = 100, then decrement it to zero and halt
+COUNTDOWN = [
+    100,  # @100
+    _c("A", "D"),  # D=A
+    0,  # @0
+    _c("D", "M"),  # M=D
+    0,  # (LOOP) @0
+    _c("M-1", "M"),  # M=M-1
+    _c("M", "D"),  # D=M
+    4,  # @LOOP
+    _c("D", jump="JGT"),  # D;JGT
+    9,  # (END) @END
+    _c("0", jump="JMP"),  # 0;JMP
+]
+
+
+def bench_events(cycles: int = 512) -> dict[str, float]:
+    """Gates evaluated per cycle by the event-driven `Computer` running a countdown loop, against the whole netlist."""
+    import events
+
+    computer = events.Computer(COUNTDOWN)
+
+    for cycle in range(cycles):
+        computer(reset=cycle == 0)
+
+    gates = len(computer.simulator.netlist.gates)
+    evaluated = computer.evaluated[1:]  # the first cycle applies reset to the initial state
+
+    return {
+        "gates in netlist": gates,
+        "mean evaluated per cycle": sum(evaluated) / len(evaluated),
+        "max evaluated per cycle": max(evaluated),
+        "mean evaluated (% of netlist)": 100 * sum(evaluated) / len(evaluated) / gates,
+    }
+
+
+def bench_memo(samples: int = 1_024) -> dict[str, tuple[float, float]]:
+    """ALU calls and `CPU` cycles per second with checks off, before and under `memo.memoising`."""
+    import arithmetic
+    import memo
+
+    words = [tuple(sample_bits(16)) for _ in range(samples + 1)]
+    distinct = [(words[i], words[i + 1], *sample_bits(6)) for i in range(samples)]
+    repeated = [distinct[i % 64] for i in range(samples)]
+
+    # the loop of `COUNTDOWN` counting down from 100, with RAM[0] as `in_m`
+    loop = [int_to_bit_vector(i, n=16) for i in COUNTDOWN[4:9]]
+    cycles = [
+        (instruction, int_to_bit_vector(count, n=16), False)
+        for count in range(100, 0, -1)
+        for instruction in loop
+    ]
+    cpu = CPU.create()
+
+    def rates() -> dict[str, float]:
+        # the engine rebinds `arithmetic.ALU`, so look it up on every run
+        return {
+            "ALU (64 repeated inputs)": _rate(arithmetic.ALU, repeated),
+            "ALU (distinct, evicting)": _rate(arithmetic.ALU, distinct),
+            "CPU cycle (countdown loop)": _rate(cpu, cycles),
+        }
+
+    with contracts.policy("off"):
+        before = rates()
+
+        with memo.memoising(capacity=samples // 2):
+            after = rates()
+
+    return {case: (before[case], after[case]) for case in before}
+
+
+def bench_lazyflags(samples: int = 1_024) -> dict[str, tuple[float, float]]:
+    """`CPU` cycles per second with checks off, eager flags before and `lazyflags` after."""
+    import lazyflags
+
+    stimulus = Stimulus(seed=0)
+    instructions, in_ms = stimulus.instructions(samples), stimulus.words(samples)
+    cycles = list(zip(to_bits(instructions), to_bits(in_ms), [False] * samples))
+    word_cycles = [(as_word(i), as_word(m), reset) for i, m, reset in cycles]
+    cpu = CPU.create()
+
+    def rates() -> dict[str, float]:
+        return {"CPU cycle": _rate(cpu, cycles), "CPU cycle (Word16)": _rate(cpu, word_cycles)}
+
+    with contracts.policy("off"):
+        before = rates()
+
+        with engines.using(lazyflags.ENGINE):
+            after = rates()
+
+    return {case: (before[case], after[case]) for case in before}
+
+
+BENCHMARKS: dict[str, Callable[[], dict[str, tuple[float, float]] | dict[str, float]]] = {
+    "conversions": bench_conversions,
+    "decode": bench_decode,
+    "stimulus": bench_stimulus,
+    "memory": bench_memory,
+    "gates16": bench_gates16,
+    "batched": bench_batched,
+    "lanes": bench_lanes,
+    "compiled": bench_compiled,
+    "events": bench_events,
+    "indexed": bench_indexed,
+    "adder": bench_adder,
+    "alu": bench_alu,
+    "memo": bench_memo,
+    "lazyflags": bench_lazyflags,
+}
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("names", nargs="*", choices=[[], *BENCHMARKS], default=[])
+    args = parser.parse_args(argv)
+
+    for name in args.names or BENCHMARKS:
+        results = BENCHMARKS[name]()
+        print(f"# {name}")
+
+        if all(isinstance(v, tuple) for v in results.values()):
+            print(f"{'case':<32} {'before/s':>14} {'after/s':>14} {'speed-up':>9}")
+
+            for case, (before, after) in results.items():  # type: ignore
+                print(f"{case:<32} {before:>14,.0f} {after:>14,.0f} {after / before:>8.1f}x")
+        else:
+            print(f"{'case':<32} {'value':>14}")
+
+            for case, value in results.items():
+                spec = ",.0f" if abs(value) >= 100 else ".2f"
+                print(f"{case:<32} {value:>14{spec}}")
+
+        print()
+
+
+if __name__ == "__main__":
+    main()
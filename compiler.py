@@ -0,0 +1,300 @@
+"""Compiles gate netlists to straight-line Python.
+
+A netlist from `netlist` becomes one Python function with a local variable per wire,
+evaluated level by level: every gate of a level only reads wires of lower levels. The
+function takes one argument per input port, a bit sequence or a `bool`, and returns a
+tuple with one entry per output port. This removes the nested calls and contract checks
+of the interpreted gate-level path.
+
+`ALU`, `CPU__call__` and `RAM8__call__` wrap the compiled kernels as drop-in, bit-exact
+replacements for `arithmetic.ALU`, `CPU.__call__` and `RAM8.__call__` on the gate-level
+path. `Word16` inputs already take the faster word-level path, so they are passed on to
+the interpreted components. Install `ENGINE` to run the `Computer` datapath on them,
+since every RAM is built from `RAM8`s:
+
+    with engines.using(compiler.ENGINE):
+        computer = computer(reset=False)
+
+Kernels are traced and compiled on first use. `load(cache_dir)` also caches their code on
+disk, keyed by a hash of the modules they are traced from, so a change to any component
+invalidates the cache.
+"""
+
+import arithmetic
+import engines
+import hashlib
+import importlib
+import marshal
+import netlist
+import os
+import sys
+
+from computer import CPU, is_valid_instruction
+from contracts import level
+from memory import PC, RAM8, REGISTER16
+from netlist import Netlist
+from types import CodeType
+from typing import Callable
+from utils import Word16, is_n_bit_vector
+
+
+# The modules a kernel depends on: the components it is traced from and the tools
+SOURCES = ["utils", "gates", "arithmetic", "memory", "computer", "netlist", "compiler"]
+
+NETLISTS: dict[str, Callable[[], Netlist]] = {
+    "ALU": netlist.alu,
+    "CPU": netlist.cpu,
+    "RAM8": netlist.ram8,
+}
+
+_KERNELS: dict[str, Callable] = {}
+
+# The interpreted components, which kernels are traced from even while `ENGINE` is installed
+_REFERENCE: dict[str, Callable] = {
+    "arithmetic.ALU": arithmetic.ALU,
+    "computer.CPU.__call__": CPU.__call__,
+    "memory.RAM8.__call__": RAM8.__call__,
+}
+
+_EXPRESSIONS = {
+    "AND": "{0} & {1}",
+    "OR": "{0} | {1}",
+    "NOT": "not {0}",
+    "NAND": "not ({0} & {1})",
+    "XOR": "{0} ^ {1}",
+    "MUX": "{1} if {2} else {0}",
+}
+
+
+def levels(n: Netlist) -> list[int]:
+    """The logic level of every wire: 0 for inputs and constants, else one more than the deepest input."""
+    out = [0] * n.wires
+
+    for k, (_, ins) in enumerate(n.gates):
+        out[n.first_gate + k] = 1 + max(out[i] for i in ins)
+
+    return out
+
+
+def source(n: Netlist, name: str = "kernel") -> str:
+    """Returns the Python source of a function `name` that evaluates `n`."""
+    wire_levels = levels(n)
+    order = sorted(range(len(n.gates)), key=lambda k: wire_levels[n.first_gate + k])
+
+    def var(w: int) -> str:
+        return ("False", "True")[w] if w < 2 else f"w{w}"
+
+    lines = [f"def {name}({', '.join(n.inputs)}):"]
+
+    for port, ws in n.inputs.items():
+        if len(ws) == 1:
+            lines.append(f"    {var(ws[0])} = {port}")
+        else:
+            lines.append(f"    {', '.join(var(w) for w in ws)} = {port}")
+
+    for k in order:
+        op, ins = n.gates[k]
+        expression = _EXPRESSIONS[op].format(*(var(i) for i in ins))
+        lines.append(f"    {var(n.first_gate + k)} = {expression}")
+
+    outputs = [
+        var(ws[0]) if len(ws) == 1 else f"({', '.join(var(w) for w in ws)},)"
+        for ws in n.outputs.values()
+    ]
+    lines.append(f"    return ({', '.join(outputs)},)")
+
+    return "\n".join(lines) + "\n"
+
+
+def fingerprint() -> str:
+    """A hash of the source of every module in `SOURCES` and of the Python version."""
+    digest = hashlib.sha256(sys.implementation.cache_tag.encode())
+
+    for module_name in SOURCES:
+        with open(importlib.import_module(module_name).__file__, "rb") as f:  # type: ignore
+            digest.update(f.read())
+
+    return digest.hexdigest()
+
+
+def kernel(name: str, cache_dir: str | None = None) -> Callable:
+    """Returns the compiled kernel of the netlist `name`, caching its code in `cache_dir` if given."""
+    # pre-conditions
+    assert name in NETLISTS, f"`name` must be one of {list(NETLISTS)}"
+
+    # body
+    if name in _KERNELS:
+        return _KERNELS[name]
+
+    code = None
+    cache_path = None
+
+    if cache_dir is not None:
+        cache_path = os.path.join(cache_dir, f"{name}-{fingerprint()[:16]}.bin")
+
+        try:
+            with open(cache_path, "rb") as f:
+                code = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            code = None
+
+        if not isinstance(code, CodeType):
+            code = None  # a missing or stale cache is rebuilt
+
+    if code is None:
+        with engines.using(_REFERENCE):
+            n = NETLISTS[name]()
+
+        code = compile(source(n, name), f"<compiled {name}>", "exec")
+
+        if cache_path is not None:
+            os.makedirs(cache_dir, exist_ok=True)  # type: ignore
+            temporary_path = f"{cache_path}.{os.getpid()}"
+
+            with open(temporary_path, "wb") as f:
+                marshal.dump(code, f)
+
+            os.replace(temporary_path, cache_path)
+
+    namespace: dict = {}
+    exec(code, namespace)
+    _KERNELS[name] = namespace[name]
+
+    # post-conditions
+    assert callable(_KERNELS[name]), "kernel must be callable"
+
+    return _KERNELS[name]
+
+
+def load(cache_dir: str | None = None) -> None:
+    """Compiles every kernel now, caching their code in `cache_dir` if given."""
+    for name in NETLISTS:
+        kernel(name, cache_dir)
+
+
+def ALU(
+    xs: tuple[bool, ...],
+    ys: tuple[bool, ...],
+    zx: bool,
+    nx: bool,
+    zy: bool,
+    ny: bool,
+    f: bool,
+    no: bool,
+) -> tuple[tuple[bool, ...], bool, bool]:
+    """Compiled `arithmetic.ALU`."""
+    checks = level("compiler.ALU")
+
+    # pre-conditions
+    if checks:
+        assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(ys, n=16), "`ys` must be a 16-tuple of `bool`s"
+        assert all(
+            isinstance(c, bool) for c in (zx, nx, zy, ny, f, no)
+        ), "control bits must be `bool`s"
+
+    # body
+    if type(xs) is Word16 or type(ys) is Word16:
+        return _REFERENCE["arithmetic.ALU"](xs, ys, zx, nx, zy, ny, f, no)
+
+    out, zr, ng = (_KERNELS.get("ALU") or kernel("ALU"))(xs, ys, zx, nx, zy, ny, f, no)
+
+    # post-conditions
+    if checks:
+        assert is_n_bit_vector(out, n=16), "`out` must be a 16-tuple of `bool`s"
+
+    return out, zr, ng
+
+
+def CPU__call__(
+    self: CPU, instruction: tuple[bool, ...], in_m: tuple[bool, ...], reset: bool
+) -> CPU:
+    """Compiled `CPU.__call__`."""
+    checks = level("compiler.CPU")
+
+    # pre-conditions
+    if checks:
+        assert is_n_bit_vector(instruction, n=16), "instruction must be a 16-bit tuple"
+        assert is_n_bit_vector(in_m, n=16), "in_m must be a 16-bit tuple"
+        assert isinstance(reset, bool), "reset must be a bool"
+
+        assert is_n_bit_vector(self.out_m, n=16), "out_m must be a 16-bit tuple"
+        assert isinstance(self.zr, bool), "zr must be a bool"
+        assert isinstance(self.ng, bool), "ng must be a bool"
+
+        assert is_valid_instruction(instruction), "instruction must be a valid instruction"
+
+    # body
+    if type(instruction) is Word16 or type(in_m) is Word16:
+        return _REFERENCE["computer.CPU.__call__"](self, instruction, in_m, reset)
+
+    old_a, old_d, old_pc = self.a_register.out, self.d_register.out, self.pc.out
+    out_m, write_m, a, d, pc, zr, ng = (_KERNELS.get("CPU") or kernel("CPU"))(
+        instruction, in_m, reset, old_a, old_d, old_pc, self.zr, self.ng
+    )
+
+    new_cpu = CPU(
+        a_register=_register(self.a_register, old_a, a),
+        d_register=_register(self.d_register, old_d, d),
+        pc=PC(_register(self.pc.register, old_pc, pc)),
+        _zr=zr,
+        _ng=ng,
+        out_m=out_m,
+        write_m=write_m,
+    )
+
+    # post-conditions
+    if checks:
+        assert isinstance(new_cpu, CPU), "output must be a CPU"
+
+    return new_cpu
+
+
+def RAM8__call__(
+    self: RAM8, xs: tuple[bool, ...], load: bool, address: tuple[bool, ...]
+) -> RAM8:
+    """Compiled `RAM8.__call__`."""
+    checks = level("compiler.RAM8")
+
+    # pre-conditions
+    if checks:
+        assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
+        assert isinstance(load, bool), "`load` must be a `bool`"
+        assert is_n_bit_vector(address, n=3), "`address` must be a 3-tuple of `bool`s"
+
+    # body
+    if type(xs) is Word16:
+        return _REFERENCE["memory.RAM8.__call__"](self, xs, load, address)
+
+    registers = self.registers
+    old = [r.out for r in registers]
+    out, *new = (_KERNELS.get("RAM8") or kernel("RAM8"))(xs, load, address, *old)
+
+    new_ram8 = RAM8(tuple(_register(*args) for args in zip(registers, old, new)), out)
+
+    if load is False:
+        # the contents are unchanged, so the cached digest carries over
+        object.__setattr__(new_ram8, "_digest", self._digest)
+
+    # post-conditions
+    if checks:
+        assert isinstance(new_ram8, RAM8), "`new_ram8` must be a `RAM8`"
+
+    return new_ram8
+
+
+def _register(
+    register: REGISTER16, old: tuple[bool, ...], new: tuple[bool, ...]
+) -> REGISTER16:
+    """The register storing `new`: `register`, which stores `old`, if they are equal, else the canonical one."""
+    if old == new:
+        return register
+
+    return REGISTER16.from_word(Word16.from_bits(new))
+
+
+ENGINE: dict[str, Callable] = {
+    "arithmetic.ALU": ALU,
+    "computer.CPU.__call__": CPU__call__,
+    "memory.RAM8.__call__": RAM8__call__,
+}
@@ -1,73 +1,70 @@
+from contracts import FULL, level, peek
 from dataclasses import dataclass
-from gates import AND, OR, NOT, MUX16, DMUX
+from decoder import (
+    ALU_MASK,
+    ALU_SHIFT,
+    A_BIT,
+    C_INSTRUCTION,
+    DEST_MASK,
+    DEST_SHIFT,
+    DEST_SYMBOL_TO_INSTRUCTION,
+    COMP_SYMBOL_TO_INSTRUCTION,
+    JUMP_MASK,
+    JUMP_SYMBOL_TO_INSTRUCTION,
+    VALID,
+    entry,
+    is_valid,
+)
+from gates import AND, OR, NOT, MUX16, DMUX, OR16WAY
 from arithmetic import ALU
 from memory import REGISTER16, RAM8K, RAM16K, ROM32K, PC
 from utils import (
     ZERO16,
+    Word16,
     is_n_bit_vector,
     is_negative,
     to_int,
 )
 
 
-# Symbol to machine code lookup tables for C-instructions
-DEST_SYMBOL_TO_INSTRUCTION = {
-    "null": 0b000,
-    "M": 0b001,
-    "D": 0b010,
-    "MD": 0b011,
-    "A": 0b100,
-    "AM": 0b101,
-    "AD": 0b110,
-    "AMD": 0b111,
-}
-
-COMP_SYMBOL_TO_INSTRUCTION = {
-    # a = 0
-    "0": 0b0101010,
-    "1": 0b0111111,
-    "-1": 0b0111010,
-    "D": 0b0001100,
-    "A": 0b0110000,
-    "!D": 0b0001101,
-    "!A": 0b0110001,
-    "-D": 0b0001111,
-    "-A": 0b0110011,
-    "D+1": 0b0011111,
-    "A+1": 0b0110111,
-    "D-1": 0b0001110,
-    "A-1": 0b0110010,
-    "D+A": 0b0000010,
-    "D-A": 0b0010011,
-    "A-D": 0b0000111,
-    "D&A": 0b0000000,
-    "D|A": 0b0010101,
-    # a = 1
-    "M": 0b1110000,
-    "!M": 0b1110001,
-    "-M": 0b1110011,
-    "M+1": 0b1110111,
-    "M-1": 0b1110010,
-    "D+M": 0b1000010,
-    "D-M": 0b1010011,
-    "M-D": 0b1000111,
-    "D&M": 0b1000000,
-    "D|M": 0b1010101,
-}
-
-JUMP_SYMBOL_TO_INSTRUCTION = {
-    "null": 0b000,
-    "JGT": 0b001,
-    "JEQ": 0b010,
-    "JGE": 0b011,
-    "JLT": 0b100,
-    "JNE": 0b101,
-    "JLE": 0b110,
-    "JMP": 0b111,
-}
-
-
-@dataclass(frozen=True)
+# The bits of every ALU control word and every dest or jump mask, most significant first
+_CONTROL_BITS = [tuple(bool(c >> (5 - i) & 1) for i in range(6)) for c in range(64)]
+_MASK_BITS = [tuple(bool(m >> (2 - i) & 1) for i in range(3)) for m in range(8)]
+
+# The decoded fields of an instruction: whether it is a C-instruction, the a-bit, the ALU
+# control bits, and the dest and jump masks
+Fields = tuple[bool, bool, tuple[bool, ...], tuple[bool, ...], tuple[bool, ...]]
+
+
+def decode_fields(instruction: tuple[bool, ...]) -> Fields | None:
+    """Returns the fields of `instruction` from its entry in the predecoded table (see `decoder`), or `None` if its bits are not `bool`s, e.g. while tracing, or it is invalid."""
+    # body
+    if type(instruction) is Word16:
+        word = instruction.value
+    elif all(type(b) is bool for b in instruction):
+        word = to_int(instruction)
+    else:
+        return None
+
+    e = entry(word)
+
+    if not e & VALID:
+        return None
+
+    if e & C_INSTRUCTION:
+        return (
+            True,
+            bool(e & A_BIT),
+            _CONTROL_BITS[e >> ALU_SHIFT & ALU_MASK],
+            _MASK_BITS[e >> DEST_SHIFT & DEST_MASK],
+            _MASK_BITS[e & JUMP_MASK],
+        )
+
+    # the ALU also runs on the comp bits of an A-instruction, and `out_m` keeps its output
+    return False, False, _CONTROL_BITS[word >> 6 & 0b111111], _MASK_BITS[0], _MASK_BITS[0]
+
+
+@dataclass(frozen=True, slots=True)
 class CPU:
     """The Central Processing Unit (CPU). Consists of an ALU and set of registers, designed to fetch and execute instructions written in the Hack machine language."""
 
@@ -76,22 +73,42 @@ class CPU:
     d_register: REGISTER16
     pc: PC
 
-    # intermediate outputs of ALU
-    _zr: bool
-    _ng: bool
+    # intermediate outputs of ALU, or `None` if they are derived from `out_m` when read
+    _zr: bool | None
+    _ng: bool | None
 
     # outputs
     out_m: tuple[bool, ...]
     write_m: bool
 
     def __post_init__(self) -> None:
-        if self.out_m == ZERO16:
-            assert self._zr, "`zr` must be `True` if `out_m` is zero"
-            assert not self._ng, "`ng` must be `False` if `out_m` is zero"
+        # lazy flags are derived from `out_m`, so only stored flags can disagree with it
+        if peek("computer.CPU") == FULL:
+            if self.out_m == ZERO16:
+                assert self._zr is not False, "`zr` must be `True` if `out_m` is zero"
+                assert not self._ng, "`ng` must be `False` if `out_m` is zero"
+
+            if is_negative(self.out_m):
+                assert not self._zr, "`zr` must be `False` if `out_m` is negative"
+                assert self._ng is not False, "`ng` must be `True` if `out_m` is negative"
+
+    def __eq__(self, other: object) -> bool:
+        # lazy flags are equal to the flags they are derived to
+        if type(other) is not CPU:
+            return NotImplemented
+
+        return (
+            self.a_register == other.a_register
+            and self.d_register == other.d_register
+            and self.pc == other.pc
+            and self.out_m == other.out_m
+            and self.write_m == other.write_m
+            and self.zr == other.zr
+            and self.ng == other.ng
+        )
 
-        if is_negative(self.out_m):
-            assert not self._zr, "`zr` must be `False` if `out_m` is negative"
-            assert self._ng, "`ng` must be `True` if `out_m` is negative"
+    def __hash__(self) -> int:
+        return hash((self.a_register, self.d_register, self.pc, self.out_m, self.write_m))
 
     def __call__(
         self,
@@ -100,85 +117,103 @@ class CPU:
         reset: bool,
     ) -> "CPU":
         """Returns the next state of the CPU."""
+        checks = level("computer.CPU")
+
         # pre-conditions
-        assert is_n_bit_vector(instruction, n=16), f"instruction must be a 16-bit tuple"
-        assert is_n_bit_vector(in_m, n=16), "in_m must be a 16-bit tuple"
-        assert isinstance(reset, bool), "reset must be a bool"
+        if checks:
+            assert is_n_bit_vector(instruction, n=16), f"instruction must be a 16-bit tuple"
+            assert is_n_bit_vector(in_m, n=16), "in_m must be a 16-bit tuple"
+            assert isinstance(reset, bool), "reset must be a bool"
 
-        assert isinstance(self.out_m, tuple), "out_m must be a tuple"
-        assert is_n_bit_vector(self.out_m, n=16), "out_m must be a 16-bit tuple"
-        assert isinstance(self._zr, bool), "zr must be a bool"
-        assert isinstance(self._ng, bool), "ng must be a bool"
+            assert is_n_bit_vector(self.out_m, n=16), "out_m must be a 16-bit tuple"
+            assert isinstance(self.zr, bool), "zr must be a bool"
+            assert isinstance(self.ng, bool), "ng must be a bool"
 
-        assert is_valid_instruction(
-            instruction
-        ), "instruction must be a valid instruction"
+            assert is_valid_instruction(
+                instruction
+            ), "instruction must be a valid instruction"
 
         # body
+        if type(instruction) is Word16 or type(in_m) is Word16:
+            a_out, d_out = self.a_register.word, self.d_register.word
+        else:
+            a_out, d_out = self.a_register.out, self.d_register.out
+
+        # a single lookup in the predecoded table, or the bits themselves if they are symbolic
+        fields = decode_fields(instruction)
+
+        if fields is None:
+            bits = instruction.bits if type(instruction) is Word16 else instruction
+            is_c, a, controls, dest, jump = bits[0], bits[3], bits[4:10], bits[10:13], bits[13:]
+        else:
+            is_c, a, controls, dest, jump = fields
+
         selected_register_value = MUX16(
-            xs=self.a_register.out,  # A register in current time step
+            xs=a_out,  # A register in current time step
             ys=in_m,  # RAM[A] register in current time step
             sel=AND(
-                x=instruction[0],  # is C-instruction
-                y=instruction[3],  # a=1
+                x=is_c,  # is C-instruction
+                y=a,  # a=1
             ),
         )
 
         new_out_m, new_zr, new_ng = ALU(
-            xs=self.d_register.out,
+            xs=d_out,
             ys=selected_register_value,
-            zx=instruction[4],  # c1
-            nx=instruction[5],  # c2
-            zy=instruction[6],  # c3
-            ny=instruction[7],  # c4
-            f=instruction[8],  # c5
-            no=instruction[9],  # c6
+            zx=controls[0],  # c1
+            nx=controls[1],  # c2
+            zy=controls[2],  # c3
+            ny=controls[3],  # c4
+            f=controls[4],  # c5
+            no=controls[5],  # c6
         )
 
         new_a_register_value = MUX16(
             xs=instruction,  # A-instruction
             ys=new_out_m,  # new ALU output is immediately available since its combinational
-            sel=instruction[0],  # is C-instruction
+            sel=is_c,  # is C-instruction
         )
 
         new_a_register = self.a_register(  # A register in next time step
             xs=new_a_register_value,
             load=OR(
-                x=NOT(instruction[0]),  # is A-instruction
-                y=AND(instruction[0], instruction[10]),  # is C-instruction and d1=1
+                x=NOT(is_c),  # is A-instruction
+                y=AND(is_c, dest[0]),  # is C-instruction and d1=1
             ),
         )
 
         new_d_register = self.d_register(  # D register in next time step
             xs=new_out_m,
             load=AND(
-                instruction[0],  # is C-instruction
-                instruction[11],  # is d2=1
+                is_c,  # is C-instruction
+                dest[1],  # is d2=1
             ),
         )
 
-        is_jgt = AND(AND(NOT(instruction[13]), NOT(instruction[14])), instruction[15])
-        is_jeq = AND(AND(NOT(instruction[13]), instruction[14]), NOT(instruction[15]))
-        is_jge = AND(AND(NOT(instruction[13]), instruction[14]), instruction[15])
-        is_jlt = AND(AND(instruction[13], NOT(instruction[14])), NOT(instruction[15]))
-        is_jne = AND(AND(instruction[13], NOT(instruction[14])), instruction[15])
-        is_jle = AND(AND(instruction[13], instruction[14]), NOT(instruction[15]))
-        is_jmp = AND(AND(instruction[13], instruction[14]), instruction[15])
+        j1, j2, j3 = jump
+
+        is_jgt = AND(AND(NOT(j1), NOT(j2)), j3)
+        is_jeq = AND(AND(NOT(j1), j2), NOT(j3))
+        is_jge = AND(AND(NOT(j1), j2), j3)
+        is_jlt = AND(AND(j1, NOT(j2)), NOT(j3))
+        is_jne = AND(AND(j1, NOT(j2)), j3)
+        is_jle = AND(AND(j1, j2), NOT(j3))
+        is_jmp = AND(AND(j1, j2), j3)
 
         should_jmp = AND(
-            x=instruction[0],  # is C-instruction
+            x=is_c,  # is C-instruction
             y=OR(
-                x=AND(is_jgt, AND(NOT(self._ng), NOT(self._zr))),
+                x=AND(is_jgt, AND(NOT(self.ng), NOT(self.zr))),
                 y=OR(
-                    x=AND(is_jeq, self._zr),
+                    x=AND(is_jeq, self.zr),
                     y=OR(
-                        x=AND(is_jge, NOT(self._ng)),
+                        x=AND(is_jge, NOT(self.ng)),
                         y=OR(
-                            x=AND(is_jlt, self._ng),
+                            x=AND(is_jlt, self.ng),
                             y=OR(
-                                x=AND(is_jne, NOT(self._zr)),
+                                x=AND(is_jne, NOT(self.zr)),
                                 y=OR(
-                                    x=AND(is_jle, OR(self._ng, self._zr)),
+                                    x=AND(is_jle, OR(self.ng, self.zr)),
                                     y=is_jmp,
                                 ),
                             ),
@@ -189,15 +224,15 @@ class CPU:
         )
 
         new_pc = self.pc(
-            xs=self.a_register.out,
+            xs=a_out,
             load=should_jmp,
             inc=True,
             reset=reset,
         )
 
         new_write_m = AND(
-            x=instruction[0],  # is C-instruction
-            y=instruction[12],  # is d3=1
+            x=is_c,  # is C-instruction
+            y=dest[2],  # is d3=1
         )
 
         new_cpu = CPU(
@@ -211,16 +246,27 @@ class CPU:
         )
 
         # post-conditions
-        assert isinstance(new_cpu, CPU), "output must be a CPU"
-        assert is_n_bit_vector(new_cpu.out_m, n=16), "out_m must be a 16-bit tuple"
-        assert isinstance(new_cpu.write_m, bool), "write_m must be a bool"
-        assert is_n_bit_vector(
-            new_cpu.address_m, n=15
-        ), "address_m must be a 15-bit tuple"
-        assert is_n_bit_vector(new_cpu.pc_out, n=15), "pc must be a 15-bit tuple"
+        if checks:
+            assert isinstance(new_cpu, CPU), "output must be a CPU"
+            assert is_n_bit_vector(new_cpu.out_m, n=16), "out_m must be a 16-bit tuple"
+            assert isinstance(new_cpu.write_m, bool), "write_m must be a bool"
+            assert is_n_bit_vector(
+                new_cpu.address_m, n=15
+            ), "address_m must be a 15-bit tuple"
+            assert is_n_bit_vector(new_cpu.pc_out, n=15), "pc must be a 15-bit tuple"
 
         return new_cpu
 
+    @property
+    def zr(self) -> bool:
+        """Whether `out_m` is zero, derived as the ALU does if the flags are lazy."""
+        return NOT(OR16WAY(self.out_m)) if self._zr is None else self._zr
+
+    @property
+    def ng(self) -> bool:
+        """Whether `out_m` is negative, derived as the ALU does if the flags are lazy."""
+        return self.out_m[0] if self._ng is None else self._ng
+
     @property
     def address_m(self) -> tuple[bool, ...]:
         """Returns the memory address to which `out_m` should be written."""
@@ -248,7 +294,7 @@ class CPU:
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Memory:
     """The main memory of the computer. Consists of RAM, a screen memory map and a register storing the output of the keyboard."""
 
@@ -263,13 +309,16 @@ class Memory:
         address: tuple[bool, ...],
         load: bool,
     ) -> "Memory":
+        checks = level("computer.Memory")
+
         # pre-conditions
-        assert is_n_bit_vector(xs, n=16), "xs must be a 16-bit tuple"
-        assert is_n_bit_vector(address, n=15), "address must be a 15-bit tuple"
-        assert isinstance(load, bool), "load must be a bool"
-        assert (
-            0 <= to_int(address) < 2**14 + 2**13
-        ), "address must be in [0, 2^14 + 2^13)"
+        if checks:
+            assert is_n_bit_vector(xs, n=16), "xs must be a 16-bit tuple"
+            assert is_n_bit_vector(address, n=15), "address must be a 15-bit tuple"
+            assert isinstance(load, bool), "load must be a bool"
+            assert (
+                0 <= to_int(address) < 2**14 + 2**13
+            ), "address must be in [0, 2^14 + 2^13)"
 
         # body
         load_bits = DMUX(
@@ -312,7 +361,8 @@ class Memory:
         )
 
         # post-conditions
-        assert isinstance(new_memory, Memory), "output must be of type `Memory`"
+        if checks:
+            assert isinstance(new_memory, Memory), "output must be of type `Memory`"
 
         return new_memory
 
@@ -321,6 +371,11 @@ class Memory:
         """The entire state of the main memory."""
         return self.ram.state + self.screen.state + (self.keyboard.out,)
 
+    @property
+    def digest(self) -> int:
+        """A Merkle hash of `state` and `out`, computed from the cached digests of the RAM and screen memory map."""
+        return hash((self.ram.digest, self.screen.digest, self.keyboard.digest, to_int(self.out)))
+
     @staticmethod
     def create() -> "Memory":
         """Returns a new `Memory` with all registers initialized to zero."""
@@ -330,7 +385,7 @@ class Memory:
         return Memory(ram, screen, keyboard, ZERO16)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Computer:
     """The Hack computer, including the CPU, ROM and RAM. When reset is zero, the program stored in the ROM is executed. When reset is one, the execution of the program restarts."""
 
@@ -359,17 +414,38 @@ class Computer:
 
         return new_computer
 
+    @property
+    def digest(self) -> int:
+        """A fingerprint of everything the next cycle reads or outputs, e.g. for deduplicating snapshots of a run. Excludes the ROM."""
+        cpu = self.cpu
+
+        return hash(
+            (
+                cpu.a_register.digest,
+                cpu.d_register.digest,
+                cpu.pc.register.digest,
+                cpu.zr,
+                cpu.ng,
+                to_int(cpu.out_m),
+                cpu.write_m,
+                self.memory.digest,
+            )
+        )
+
     @staticmethod
     def create(instructions: tuple[tuple[bool, ...], ...]) -> "Computer":
         """Returns a new `Computer` with the given `instructions` loaded into ROM."""
+        checks = peek("computer.Computer")
+
         # pre-conditions
-        assert isinstance(instructions, tuple), "`instructions` must be a tuple"
-        assert all(
-            isinstance(instruction, tuple) for instruction in instructions
-        ), "each instruction must be a tuple"
-        assert all(
-            is_valid_instruction(instruction) for instruction in instructions
-        ), "each instruction must be a valid instruction"
+        if checks:
+            assert isinstance(instructions, tuple), "`instructions` must be a tuple"
+            assert all(
+                isinstance(instruction, (tuple, Word16)) for instruction in instructions
+            ), "each instruction must be a tuple or a `Word16`"
+            assert all(
+                is_valid_instruction(instruction) for instruction in instructions
+            ), "each instruction must be a valid instruction"
 
         # body
         rom = ROM32K.create(instructions)
@@ -378,7 +454,8 @@ class Computer:
         computer = Computer(rom, cpu, memory)
 
         # post-conditions
-        assert isinstance(computer, Computer), "output must be a `Computer`"
+        if checks:
+            assert isinstance(computer, Computer), "output must be a `Computer`"
 
         return computer
 
@@ -388,23 +465,7 @@ def is_valid_instruction(instruction: tuple[bool, ...]) -> bool:
     if not is_n_bit_vector(instruction, n=16):
         return False
 
-    if instruction[0] == False:
-        return True
-
-    comp = instruction[3:10]
-    dest = instruction[10:13]
-    jump = instruction[13:16]
-
-    if to_int(comp) not in COMP_SYMBOL_TO_INSTRUCTION.values():
-        return False
-
-    if to_int(dest) not in DEST_SYMBOL_TO_INSTRUCTION.values():
-        return False
-
-    if to_int(jump) not in JUMP_SYMBOL_TO_INSTRUCTION.values():
-        return False
-
-    return True
+    return is_valid(to_int(instruction))
 
 
 def render_screen(screen: tuple[tuple[bool, ...], ...]) -> None:
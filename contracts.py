@@ -0,0 +1,135 @@
+"""Runtime-selectable contract checking.
+
+Every component guards its pre- and post-conditions with the level returned by `level`:
+
+- `OFF`: no checks.
+- `BOUNDARY`: interface checks only, i.e. the types and shapes of inputs and outputs.
+- `FULL`: interface checks plus behavioural invariants, including O(N) state comparisons.
+
+Policies are set per component (e.g. `"memory.RAM16K"`) or per module (e.g. `"memory"`),
+falling back to the default policy, which is `"full"`. The available modes are `"full"`,
+`"boundary"`, `"sampled"` (full checks on every `every`-th call of a component and
+boundary checks otherwise, counting the calls of every component on its own, even under a
+module or default policy) and `"off"`. Running with `python -O` still drops every check.
+
+A call of a component counts once: its own `level` call. Constructors, i.e. the
+`__post_init__` of the node a call builds and helpers such as `create`, take the level of
+the current call with `peek` instead, so they neither count as calls nor shift the sample.
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+
+OFF, BOUNDARY, FULL = 0, 1, 2
+
+MODES = ("full", "boundary", "sampled", "off")
+
+
+@dataclass
+class Policy:
+    """A checking policy for a component, a module or the default."""
+
+    mode: str
+    every: int = 1
+    calls: dict[str, int] = field(default_factory=dict)  # per component, in `sampled` mode
+
+    def __post_init__(self) -> None:
+        assert self.mode in MODES, f"`mode` must be one of {MODES}"
+        assert (
+            isinstance(self.every, int) and self.every >= 1
+        ), "`every` must be a positive integer"
+
+    def next_level(self, component: str) -> int:
+        """Returns the checking level for the next call of `component`."""
+        if self.mode == "full":
+            return FULL
+
+        if self.mode == "boundary":
+            return BOUNDARY
+
+        if self.mode == "off":
+            return OFF
+
+        calls = self.calls[component] = self.calls.get(component, 0) + 1
+
+        return FULL if calls % self.every == 0 else BOUNDARY
+
+    def current_level(self, component: str) -> int:
+        """Returns the checking level of the current call of `component`, without counting a call."""
+        if self.mode == "full":
+            return FULL
+
+        if self.mode == "boundary":
+            return BOUNDARY
+
+        if self.mode == "off":
+            return OFF
+
+        return FULL if self.calls.get(component, 0) % self.every == 0 else BOUNDARY
+
+
+_DEFAULT = "*"
+_POLICIES: dict[str, Policy] = {_DEFAULT: Policy("full")}
+_RESOLVED: dict[str, Policy] = {}
+
+
+def _resolve(component: str) -> Policy:
+    """Returns the most specific policy for `component`: its own, its module's or the default."""
+    module = component.partition(".")[0]
+    out = _POLICIES.get(component) or _POLICIES.get(module) or _POLICIES[_DEFAULT]
+    _RESOLVED[component] = out
+
+    return out
+
+
+def level(component: str) -> int:
+    """Returns the checking level (`OFF`, `BOUNDARY` or `FULL`) for the current call of `component`."""
+    policy = _RESOLVED.get(component) or _resolve(component)
+    return policy.next_level(component)
+
+
+def peek(component: str) -> int:
+    """Returns the checking level of the current call of `component`, without counting a call."""
+    policy = _RESOLVED.get(component) or _resolve(component)
+    return policy.current_level(component)
+
+
+def set_policy(mode: str, *components: str, every: int = 1) -> None:
+    """Sets the checking policy of `components`, or the default policy if none are given."""
+    # pre-conditions
+    assert mode in MODES, f"`mode` must be one of {MODES}"
+    assert mode == "sampled" or every == 1, "`every` only applies to `sampled` mode"
+
+    # body
+    for component in components or (_DEFAULT,):
+        _POLICIES[component] = Policy(mode, every)
+
+    _RESOLVED.clear()
+
+
+def get_policy(component: str) -> Policy:
+    """Returns the checking policy that applies to `component`."""
+    return _RESOLVED.get(component) or _resolve(component)
+
+
+def reset() -> None:
+    """Restores full checking for every component."""
+    _POLICIES.clear()
+    _POLICIES[_DEFAULT] = Policy("full")
+    _RESOLVED.clear()
+
+
+@contextmanager
+def policy(mode: str, *components: str, every: int = 1) -> Iterator[None]:
+    """Temporarily sets the checking policy of `components`, or the default policy if none are given."""
+    saved = dict(_POLICIES)
+
+    try:
+        set_policy(mode, *components, every=every)
+        yield
+    finally:
+        _POLICIES.clear()
+        _POLICIES.update(saved)
+        _RESOLVED.clear()
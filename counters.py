@@ -0,0 +1,188 @@
+"""Counts of gate evaluations, attributed to the enclosing component.
+
+While `counting` is active, every call of a function in `gates` and `arithmetic` is
+counted, together with the primitive gate evaluations (`AND`, `OR`, `NOT`, `NAND`, `XOR`,
+`MUX` and `DMUX`) it performed, under the innermost component whose `__call__` is running,
+e.g. `"RAM8"` or `"CPU"`. Calls of the components themselves are counted the same way
+under their enclosing component, so `("Computer", "CPU")` holds the cost of the CPU within
+a `Computer` cycle and `("RAM8", "DMUX8WAY")` the cost of the RAM8 address decoder. The
+gate evaluations of a row include those of the calls nested in it, so the rows of one
+component overlap, e.g. `("RAM8", "MUX16")` includes the `MUX`s it calls:
+
+    with counters.counting() as counts:
+        computer = computer(reset=False)
+
+    print(counts.table())
+
+Counting installs wrappers as an engine (see `engines`), so nothing is counted, and
+nothing is slowed down, outside `counting`. Word-level fast paths of the gates perform no
+primitive gate evaluations, so they show up as calls that cost no gates.
+"""
+
+import argparse
+import computer
+import engines
+import importlib
+import inspect
+import json
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from stimulus import Stimulus, to_bits
+from typing import Callable, Iterator, Sequence
+
+
+# The modules whose functions are counted
+FUNCTION_MODULES = ["gates", "arithmetic"]
+
+# The modules whose classes are components that gate evaluations are attributed to
+COMPONENT_MODULES = ["memory", "computer"]
+
+PRIMITIVES = ["AND", "OR", "NOT", "NAND", "XOR", "MUX", "DMUX"]
+
+# The enclosing component of calls made outside of any component
+TOP = "<top>"
+
+
+@dataclass
+class Counts:
+    """Calls and primitive gate evaluations per (enclosing component, callee)."""
+
+    calls: dict[tuple[str, str], int] = field(default_factory=dict)
+    gates: dict[tuple[str, str], int] = field(default_factory=dict)
+    total: int = 0
+
+    def rows(self) -> list[dict[str, str | int]]:
+        """One row per (component, callee), the most gate evaluations first."""
+        keys = sorted(self.calls, key=lambda key: (-self.gates[key], key))
+
+        return [
+            {
+                "component": component,
+                "callee": callee,
+                "calls": self.calls[component, callee],
+                "gates": self.gates[component, callee],
+            }
+            for component, callee in keys
+        ]
+
+    def table(self, limit: int | None = None) -> str:
+        """The rows as a text table, with the `limit` most expensive ones if given."""
+        lines = [
+            f"{'component':<12} {'callee':<12} {'calls':>10} {'gates':>12} {'gates/call':>11}"
+        ]
+
+        for row in self.rows()[:limit]:
+            lines.append(
+                f"{row['component']:<12} {row['callee']:<12} {row['calls']:>10,}"
+                f" {row['gates']:>12,} {row['gates'] / row['calls']:>11,.1f}"  # type: ignore
+            )
+
+        lines.append(f"{'total':<12} {'':<12} {'':>10} {self.total:>12,}")
+
+        return "\n".join(lines)
+
+    def to_json(self) -> str:
+        """The rows and the total number of gate evaluations as JSON."""
+        return json.dumps({"total": self.total, "rows": self.rows()}, indent=2)
+
+
+def _names(module_name: str, kind: Callable[[object], bool]) -> list[str]:
+    """The names of the members of `module_name` of `kind` that it defines itself."""
+    module = importlib.import_module(module_name)
+
+    return [
+        name
+        for name, value in vars(module).items()
+        if kind(value) and value.__module__ == module_name
+    ]
+
+
+def engine(counts: Counts) -> dict[str, Callable]:
+    """An engine that wraps the currently installed functions and components to count into `counts`."""
+    stack = [TOP]
+    calls, gates_ = counts.calls, counts.gates
+
+    def counted(name: str, f: Callable, primitive: bool) -> Callable:
+        def wrapper(*args, **kwargs):  # type: ignore
+            key = (stack[-1], name)
+            calls[key] = calls.get(key, 0) + 1
+
+            if primitive:
+                counts.total += 1
+
+            start = counts.total - primitive
+
+            try:
+                return f(*args, **kwargs)
+            finally:
+                gates_[key] = gates_.get(key, 0) + counts.total - start
+
+        return wrapper
+
+    def component(name: str, f: Callable) -> Callable:
+        def wrapper(self, *args, **kwargs):  # type: ignore
+            key = (stack[-1], name)
+            calls[key] = calls.get(key, 0) + 1
+            start = counts.total
+            stack.append(name)
+
+            try:
+                return f(self, *args, **kwargs)
+            finally:
+                stack.pop()
+                gates_[key] = gates_.get(key, 0) + counts.total - start
+
+        return wrapper
+
+    out: dict[str, Callable] = {}
+
+    for module_name in FUNCTION_MODULES:
+        module = importlib.import_module(module_name)
+
+        for name in _names(module_name, inspect.isfunction):
+            primitive = module_name == "gates" and name in PRIMITIVES
+            out[f"{module_name}.{name}"] = counted(name, getattr(module, name), primitive)
+
+    for module_name in COMPONENT_MODULES:
+        module = importlib.import_module(module_name)
+
+        for name in _names(module_name, inspect.isclass):
+            cls = getattr(module, name)
+
+            if "__call__" in vars(cls):
+                out[f"{module_name}.{name}.__call__"] = component(name, vars(cls)["__call__"])
+
+    return out
+
+
+@contextmanager
+def counting() -> Iterator[Counts]:
+    """Counts the gate evaluations within the block into the `Counts` it yields."""
+    counts = Counts()
+
+    with engines.using(engine(counts)):
+        yield counts
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Gate evaluations per component over cycles of a `Computer` running a random program."
+    )
+    parser.add_argument("--cycles", type=int, default=1)
+    parser.add_argument("--limit", type=int, default=None, help="show the most expensive rows only")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    program = tuple(to_bits(Stimulus(seed=0).instructions(64)))
+    state = computer.Computer.create(program)
+
+    with counting() as counts:
+        for cycle in range(args.cycles):
+            state = state(reset=cycle == 0)
+
+    print(counts.to_json() if args.json else counts.table(args.limit))
+
+
+if __name__ == "__main__":
+    main()
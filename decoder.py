@@ -0,0 +1,242 @@
+"""Predecoded Hack machine language instructions.
+
+The decoded fields of every 16-bit word are computed once and packed into a table of
+2^16 `int`s, so decoding an instruction is a single index lookup. Bits 0-2 of an entry
+hold the jump mask, bits 3-5 the dest mask, bits 6-11 the ALU control bits (zx, nx, zy,
+ny, f, no), bit 12 the a-bit, bit 13 whether the word is a C-instruction and bit 14
+whether it is valid. A validity bitmap with one bit per word is kept alongside.
+
+The tables are built lazily on first use and can optionally be cached on disk.
+"""
+
+import hashlib
+import os
+import sys
+
+from array import array
+from dataclasses import dataclass
+
+
+# Symbol to machine code lookup tables for C-instructions
+DEST_SYMBOL_TO_INSTRUCTION = {
+    "null": 0b000,
+    "M": 0b001,
+    "D": 0b010,
+    "MD": 0b011,
+    "A": 0b100,
+    "AM": 0b101,
+    "AD": 0b110,
+    "AMD": 0b111,
+}
+
+COMP_SYMBOL_TO_INSTRUCTION = {
+    # a = 0
+    "0": 0b0101010,
+    "1": 0b0111111,
+    "-1": 0b0111010,
+    "D": 0b0001100,
+    "A": 0b0110000,
+    "!D": 0b0001101,
+    "!A": 0b0110001,
+    "-D": 0b0001111,
+    "-A": 0b0110011,
+    "D+1": 0b0011111,
+    "A+1": 0b0110111,
+    "D-1": 0b0001110,
+    "A-1": 0b0110010,
+    "D+A": 0b0000010,
+    "D-A": 0b0010011,
+    "A-D": 0b0000111,
+    "D&A": 0b0000000,
+    "D|A": 0b0010101,
+    # a = 1
+    "M": 0b1110000,
+    "!M": 0b1110001,
+    "-M": 0b1110011,
+    "M+1": 0b1110111,
+    "M-1": 0b1110010,
+    "D+M": 0b1000010,
+    "D-M": 0b1010011,
+    "M-D": 0b1000111,
+    "D&M": 0b1000000,
+    "D|M": 0b1010101,
+}
+
+JUMP_SYMBOL_TO_INSTRUCTION = {
+    "null": 0b000,
+    "JGT": 0b001,
+    "JEQ": 0b010,
+    "JGE": 0b011,
+    "JLT": 0b100,
+    "JNE": 0b101,
+    "JLE": 0b110,
+    "JMP": 0b111,
+}
+
+# Layout of a table entry
+JUMP_MASK = 0b111
+DEST_SHIFT, DEST_MASK = 3, 0b111
+ALU_SHIFT, ALU_MASK = 6, 0b111111
+A_BIT = 1 << 12
+C_INSTRUCTION = 1 << 13
+VALID = 1 << 14
+
+_CACHE_MAGIC = b"HACKDEC1"
+
+_TABLE: array | None = None
+_BITMAP: bytes | None = None
+
+
+@dataclass(frozen=True)
+class Instruction:
+    """The decoded fields of a 16-bit Hack machine language word."""
+
+    valid: bool
+    is_c_instruction: bool
+    a: bool
+    alu: int  # zx, nx, zy, ny, f, no from most to least significant bit
+    dest: int  # A, D, M from most to least significant bit
+    jump: int  # lt, eq, gt from most to least significant bit
+
+    @property
+    def alu_controls(self) -> tuple[bool, ...]:
+        """The ALU control bits `(zx, nx, zy, ny, f, no)`."""
+        return tuple(bool(self.alu >> (5 - i) & 1) for i in range(6))
+
+
+def _fingerprint() -> bytes:
+    """Identifies the instruction set the tables were built for, to detect stale caches."""
+    symbols = (
+        sorted(DEST_SYMBOL_TO_INSTRUCTION.items()),
+        sorted(COMP_SYMBOL_TO_INSTRUCTION.items()),
+        sorted(JUMP_SYMBOL_TO_INSTRUCTION.items()),
+    )
+    return hashlib.sha256(repr(symbols).encode()).digest()[:8]
+
+
+def _build() -> tuple[array, bytes]:
+    """Decodes all 2^16 words."""
+    comps = set(COMP_SYMBOL_TO_INSTRUCTION.values())
+    dests = set(DEST_SYMBOL_TO_INSTRUCTION.values())
+    jumps = set(JUMP_SYMBOL_TO_INSTRUCTION.values())
+
+    table = array("H", bytes(2 * 2**16))
+    bitmap = bytearray(2**16 // 8)
+
+    for word in range(2**16):
+        if word >> 15 == 0:
+            entry = VALID
+        elif (
+            ((word >> 6) & 0b1111111) in comps
+            and ((word >> 3) & 0b111) in dests
+            and (word & 0b111) in jumps
+        ):
+            entry = VALID | C_INSTRUCTION | (word & 0b1_111111_111_111)
+        else:
+            entry = C_INSTRUCTION
+
+        table[word] = entry
+
+        if entry & VALID:
+            bitmap[word >> 3] |= 1 << (word & 7)
+
+    return table, bytes(bitmap)
+
+
+def _load(cache_path: str) -> tuple[array, bytes] | None:
+    """Reads the tables from `cache_path`, or returns `None` if it is missing or stale."""
+    try:
+        with open(cache_path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    header = _CACHE_MAGIC + _fingerprint()
+    size = len(header) + 2 * 2**16 + 2**16 // 8
+
+    if len(data) != size or not data.startswith(header):
+        return None
+
+    table = array("H", data[len(header) : len(header) + 2 * 2**16])
+
+    if sys.byteorder != "little":
+        table.byteswap()
+
+    return table, data[len(header) + 2 * 2**16 :]
+
+
+def _save(cache_path: str, table: array, bitmap: bytes) -> None:
+    """Writes the tables to `cache_path` atomically, little-endian."""
+    little_endian = array("H", table)
+
+    if sys.byteorder != "little":
+        little_endian.byteswap()
+
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+
+    with open(tmp_path, "wb") as f:
+        f.write(_CACHE_MAGIC + _fingerprint())
+        f.write(little_endian.tobytes())
+        f.write(bitmap)
+
+    os.replace(tmp_path, cache_path)
+
+
+def load(cache_path: str | None = None) -> array:
+    """Builds the tables if necessary and returns the decode table. If `cache_path` is given, the tables are read from it, or built and written to it if it is missing or stale."""
+    global _TABLE, _BITMAP
+
+    # body
+    if _TABLE is None or cache_path is not None:
+        tables = _load(cache_path) if cache_path is not None else None
+
+        if tables is None:
+            tables = _build()
+
+            if cache_path is not None:
+                _save(cache_path, *tables)
+
+        _TABLE, _BITMAP = tables
+
+    # post-conditions
+    assert len(_TABLE) == 2**16, "decode table must have an entry for every word"
+    assert _BITMAP is not None and len(_BITMAP) == 2**13, "bitmap must have a bit per word"
+
+    return _TABLE
+
+
+def entry(word: int) -> int:
+    """Returns the packed decode table entry of the 16-bit `word`."""
+    table = _TABLE if _TABLE is not None else load()
+    return table[word]
+
+
+def is_valid(word: int) -> bool:
+    """Returns `True` iff the 16-bit `word` is a valid Hack machine language instruction."""
+    if _BITMAP is None:
+        load()
+
+    return bool(_BITMAP[word >> 3] >> (word & 7) & 1)  # type: ignore
+
+
+def decode(word: int) -> Instruction:
+    """Returns the decoded fields of the 16-bit `word`."""
+    # pre-conditions
+    assert isinstance(word, int) and 0 <= word < 2**16, "`word` must be a 16-bit integer"
+
+    # body
+    e = entry(word)
+
+    out = Instruction(
+        valid=bool(e & VALID),
+        is_c_instruction=bool(e & C_INSTRUCTION),
+        a=bool(e & A_BIT),
+        alu=(e >> ALU_SHIFT) & ALU_MASK,
+        dest=(e >> DEST_SHIFT) & DEST_MASK,
+        jump=e & JUMP_MASK,
+    )
+
+    # post-conditions
+    assert out.valid == is_valid(word), "table and bitmap must agree"
+
+    return out
@@ -0,0 +1,93 @@
+"""Swappable implementations of components.
+
+An engine maps qualified component names, e.g. `"gates.MUX16"`, to functions with the
+same signature. Installing an engine rebinds each component wherever it is referenced
+at module level: in its defining module and in every module in `MODULES` that imported
+it by name. Every call site then uses the replacement without changes. Engines nest:
+`uninstall` restores the bindings that were in place before the last `install`.
+
+Methods are named by their class, e.g. `"computer.CPU.__call__"`, and are rebound on the
+class itself.
+
+To use a replacement at a single call site only, import it directly instead, e.g.
+`from intgates import MUX16`.
+"""
+
+import importlib
+
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Any, Callable, Iterator
+
+
+MODULES = ["gates", "arithmetic", "memory", "computer"]
+
+_INSTALLED: list[list[tuple[ModuleType | type, str, Any]]] = []
+
+
+def _owner(component: str) -> tuple[ModuleType | type, str]:
+    """Returns the module or class that defines `component`, and the name it is defined under."""
+    module_name, *path, name = component.split(".")
+    owner = importlib.import_module(module_name)
+
+    for attr in path:
+        owner = getattr(owner, attr)
+
+    return owner, name
+
+
+def install(engine: dict[str, Callable]) -> None:
+    """Rebinds the components named in `engine` to their replacements."""
+    # pre-conditions
+    assert all(callable(f) for f in engine.values()), "replacements must be callable"
+    assert all(
+        "." in c and hasattr(*_owner(c)) for c in engine
+    ), "every component must exist"
+
+    # body
+    modules = [importlib.import_module(m) for m in MODULES]
+    rebound: list[tuple[ModuleType | type, str, Any]] = []
+
+    for component, replacement in engine.items():
+        owner, name = _owner(component)
+
+        if isinstance(owner, type):
+            rebound.append((owner, name, vars(owner)[name]))
+            setattr(owner, name, replacement)
+            continue
+
+        current = getattr(owner, name)
+
+        for m in {owner, *modules}:
+            for attr, value in list(vars(m).items()):
+                if value is current:
+                    rebound.append((m, attr, value))
+                    setattr(m, attr, replacement)
+
+    _INSTALLED.append(rebound)
+
+    # post-conditions
+    assert all(
+        vars(owner)[name] is f for owner, name, f in ((*_owner(c), f) for c, f in engine.items())
+    ), "every component must be rebound"
+
+
+def uninstall() -> None:
+    """Restores the bindings that were in place before the last `install`."""
+    # pre-conditions
+    assert _INSTALLED, "no engine is installed"
+
+    # body
+    for module, attr, value in reversed(_INSTALLED.pop()):
+        setattr(module, attr, value)
+
+
+@contextmanager
+def using(engine: dict[str, Callable]) -> Iterator[None]:
+    """Temporarily installs `engine`."""
+    install(engine)
+
+    try:
+        yield
+    finally:
+        uninstall()
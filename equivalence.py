@@ -0,0 +1,397 @@
+"""Exhaustive equivalence checking of the multi-way gates.
+
+`MUX4WAY16`, `MUX8WAY16`, `DMUX4WAY` and `DMUX8WAY` are bit-sliced: bit `i` of a multiplexer
+output depends only on bit `i` of every data input and on the selector. So a multiplexer
+is specified by the truth table of one bit slice, e.g. 2^11 rows for `MUX8WAY16` (8 data
+bits and 3 selector bits), and a demultiplexer by its whole truth table.
+
+`check` evaluates an implementation on every row of that truth table at once: every input
+bit is a Python int whose bit `t` is its value in row `t`. Every bit position of a word
+walks the data rows in a different order, so a bit leaking into another position shows
+up as a mismatch. An implementation is
+
+- traced into a netlist (see `netlist`) if it is built from the primitive gates, or
+  into one netlist per selector value if it computes on the selector bits as `bool`s,
+  like the `not`s and `and`s of the selector in `gates.MUX4WAY16`. The netlists are
+  evaluated on the row ints, and the inputs that every output bit depends on are read off
+  their structure. An output bit that reads only its own slice and matches the truth
+  table is correct on all 2^(16 * words + selector bits) inputs;
+- otherwise called once per row, or once for all rows if it is batched (see `batched`).
+  This covers every row of every bit slice, but a black box cannot be shown to be
+  bit-sliced, so a multiplexer is `proved` only for traced implementations. The truth
+  table of a demultiplexer is its whole input space, so it is always `proved`.
+
+Only an implementation that computes on its traced inputs as values, raising
+`netlist.Untraceable`, is a black box, and the result says so (`black_box`). Any other
+error is a bug in the implementation and is raised.
+
+Any replacement can be checked, e.g. every multi-way gate in an engine (see `engines`):
+
+    for result in equivalence.check_engine(intgates.ENGINE):
+        assert result.equivalent
+
+Run `python equivalence.py` to check the gates and every fast path.
+"""
+
+import argparse
+import contracts
+import gates
+import indexed
+import intgates
+import netlist
+
+from dataclasses import dataclass
+from netlist import Netlist
+from typing import Any, Callable, Sequence
+from utils import Word16
+
+
+# The number of data inputs and selector bits of every gate
+GATES: dict[str, tuple[int, int]] = {
+    "MUX4WAY16": (4, 2),
+    "MUX8WAY16": (8, 3),
+    "DMUX4WAY": (1, 2),
+    "DMUX8WAY": (1, 3),
+}
+
+_WIDTH = 16
+
+
+@dataclass(frozen=True, slots=True)
+class Result:
+    """The outcome of checking one implementation of a gate."""
+
+    gate: str
+    implementation: str
+    rows: int
+    mismatches: int
+    proved: bool
+    black_box: bool
+    counterexample: dict[str, Any] | None
+
+    @property
+    def equivalent(self) -> bool:
+        """`True` iff the implementation matches the truth table on every row."""
+        return self.mismatches == 0
+
+
+def _is_mux(gate: str) -> bool:
+    return gate.startswith("MUX")
+
+
+def rows(gate: str) -> int:
+    """The number of rows of the truth table of one bit slice of `gate`."""
+    words, select = GATES[gate]
+    return 1 << (words + select)
+
+
+def inputs(gate: str) -> tuple[list, list[int]]:
+    """
+    The inputs of every row of the truth table of `gate`, bit-sliced.
+
+    Returns:
+        the arguments of `gate`, with an int holding a bit of every row in place of every
+        `bool`, and the selector value of every row
+    """
+    # pre-conditions
+    assert gate in GATES, f"`gate` must be one of {list(GATES)}"
+
+    # body
+    words, select = GATES[gate]
+    count = rows(gate)
+    data_rows = 1 << words
+    selectors = [t >> words for t in range(count)]
+
+    def lanes(bit: Callable[[int], int]) -> int:
+        return sum(bit(t) << t for t in range(count))
+
+    sel = tuple(
+        lanes(lambda t, j=j: (selectors[t] >> (select - 1 - j)) & 1) for j in range(select)
+    )
+
+    if not _is_mux(gate):
+        return [lanes(lambda t: t & 1), sel], selectors
+
+    # bit `i` of every word walks the data rows offset by `i`
+    data = [
+        tuple(
+            lanes(lambda t, k=k, i=i: (((t % data_rows) + i) % data_rows >> k) & 1)
+            for i in range(_WIDTH)
+        )
+        for k in range(words)
+    ]
+
+    return [*data, sel], selectors
+
+
+def _chosen(gate: str, selectors: list[int]) -> list[int]:
+    """The rows with every selector value, as a bit per row."""
+    _, select = GATES[gate]
+    return [sum(1 << t for t, s in enumerate(selectors) if s == k) for k in range(1 << select)]
+
+
+def expected(gate: str, args: list, selectors: list[int]) -> tuple[int, ...]:
+    """The outputs of every row of the truth table of `gate`, bit-sliced."""
+    words, select = GATES[gate]
+    chosen = _chosen(gate, selectors)
+
+    if _is_mux(gate):
+        return tuple(
+            sum(args[k][i] & chosen[k] for k in range(words)) for i in range(_WIDTH)
+        )
+
+    return tuple(args[0] & chosen[k] for k in range(1 << select))
+
+
+def _traced(gate: str, fn: Callable, sel: tuple[bool, ...] | None = None) -> Netlist | None:
+    """
+    `fn` traced into a netlist, with the constant selector `sel` if given, or `None`.
+
+    With a constant selector, a gate that indexes its inputs by the selector hands the
+    traced data through untouched, e.g. to `Word16.from_bits`, whose pre-condition then
+    rejects the wires. That is a black box too; a real bug in `fn` still raises when it is
+    called on every row.
+    """
+    words, select = GATES[gate]
+    names = [f"in{k}" for k in range(words)]
+    widths = {name: _WIDTH if _is_mux(gate) else 1 for name in names} | {"sel": select}
+
+    def traced(**ports):  # type: ignore
+        out = fn(*(ports[name] for name in names), ports["sel"] if sel is None else sel)
+        return {"out": out}
+
+    try:
+        return netlist.trace(gate, traced, widths)
+    except netlist.Untraceable:  # it computes on the wires as values: a black box
+        return None
+    except AssertionError:
+        if sel is None:
+            raise
+
+        return None  # a pre-condition that asks for `bool`s rejected the wires
+
+
+def _netlists(gate: str, fn: Callable) -> dict[int | None, Netlist] | None:
+    """`fn` traced into one netlist, keyed `None`, or into one per selector value, or `None`."""
+    n = _traced(gate, fn)
+
+    if n is not None:
+        return {None: n}
+
+    _, select = GATES[gate]
+    out = {}
+
+    for k in range(1 << select):
+        n = _traced(gate, fn, tuple(bool(k >> (select - 1 - j) & 1) for j in range(select)))
+
+        if n is None:
+            return None
+
+        out[k] = n
+
+    return out
+
+
+def _evaluate(n: Netlist, args: list, mask: int) -> tuple[int, ...]:
+    """The outputs of `n` on the bit-sliced `args`."""
+    values = [0, mask]
+    values += [v for arg in args for v in (arg if isinstance(arg, tuple) else (arg,))]
+    values += [0] * len(n.gates)
+
+    for k, (op, ins) in enumerate(n.gates):
+        a, *rest = (values[i] for i in ins)
+
+        if op == "AND":
+            out = a & rest[0]
+        elif op == "OR":
+            out = a | rest[0]
+        elif op == "NOT":
+            out = a ^ mask
+        elif op == "NAND":
+            out = (a & rest[0]) ^ mask
+        elif op == "XOR":
+            out = a ^ rest[0]
+        else:
+            out = a ^ ((a ^ rest[0]) & rest[1])
+
+        values[n.first_gate + k] = out
+
+    return tuple(values[w] for w in n.outputs["out"])
+
+
+def _sliced(n: Netlist) -> bool:
+    """`True` iff every output bit of the multiplexer `n` reads only its bit slice and the selector."""
+    support: list[set[int]] = [{w} for w in range(n.first_gate)]
+
+    for _, ins in n.gates:
+        support.append(set().union(*(support[i] for i in ins)))
+
+    sel = set(n.inputs["sel"])
+    data = [ws for port, ws in n.inputs.items() if port != "sel"]
+
+    return all(
+        support[w] - {0, 1} <= sel | {ws[i] for ws in data}
+        for i, w in enumerate(n.outputs["out"])
+    )
+
+
+def _row(args: list, t: int) -> list:
+    """The arguments of row `t` as `bool`s."""
+    return [
+        tuple(bool(v >> t & 1) for v in arg) if isinstance(arg, tuple) else bool(arg >> t & 1)
+        for arg in args
+    ]
+
+
+def _called(fn: Callable, args: list, count: int) -> tuple[int, ...]:
+    """The outputs of `fn`, called once per row, bit-sliced."""
+    out: list[int] = []
+
+    for t in range(count):
+        bits = fn(*_row(args, t))
+        bits = bits.bits if type(bits) is Word16 else bits
+        out = out or [0] * len(bits)
+
+        for i, b in enumerate(bits):
+            out[i] |= bool(b) << t
+
+    return tuple(out)
+
+
+def _batched(fn: Callable, args: list, count: int) -> tuple[int, ...]:
+    """The outputs of the batched `fn`, called once on every row, bit-sliced."""
+    import numpy as np
+
+    def array(arg: Any) -> Any:
+        lanes = arg if isinstance(arg, tuple) else (arg,)
+        bits = np.array([[v >> t & 1 for v in lanes] for t in range(count)], dtype=np.bool_)
+        return bits if isinstance(arg, tuple) else bits[:, 0]
+
+    out = np.asarray(fn(*(array(arg) for arg in args)))
+
+    if out.dtype != np.bool_:
+        out = (out[:, None] >> np.arange(_WIDTH - 1, -1, -1)) & 1  # uint16 words
+
+    return tuple(sum(int(b) << t for t, b in enumerate(column)) for column in out.T)
+
+
+def check(gate: str, fn: Callable, name: str = "", batched: bool = False) -> Result:
+    """
+    Checks `fn` against the truth table of `gate`.
+
+    Args:
+        gate: the gate `fn` implements
+        fn: the implementation, with the signature of the gate in `gates`, or of its
+            `batched` counterpart if `batched`
+        name: the name of the implementation in the result
+        batched: whether `fn` takes arrays of every row at once
+    """
+    # pre-conditions
+    assert gate in GATES, f"`gate` must be one of {list(GATES)}"
+
+    # body
+    count = rows(gate)
+    mask = (1 << count) - 1
+    args, selectors = inputs(gate)
+    netlists = None if batched else _netlists(gate, fn)
+
+    if netlists is not None and None in netlists:
+        out = _evaluate(netlists[None], args, mask)
+    elif netlists is not None:
+        # every selector value has its own netlist, which is right on the rows it selects
+        outs = {k: _evaluate(n, args, mask) for k, n in netlists.items()}
+        out = tuple(
+            sum(o[i] & rows for o, rows in zip(outs.values(), _chosen(gate, selectors)))
+            for i in range(len(outs[0]))
+        )
+    elif batched:
+        out = _batched(fn, args, count)
+    else:
+        with contracts.policy("boundary"):
+            out = _called(fn, args, count)
+
+    want = expected(gate, args, selectors)
+    wrong = [a ^ b for a, b in zip(out, want)] if len(out) == len(want) else [mask]
+    mismatches = sum(bin(w).count("1") for w in wrong)
+    counterexample = None
+
+    if mismatches:
+        t = min((w & -w).bit_length() - 1 for w in wrong if w)
+        counterexample = {"row": t, "inputs": _row(args, t)}
+
+    proved = not _is_mux(gate) or (
+        netlists is not None and all(_sliced(n) for n in netlists.values())
+    )
+    name = name or getattr(fn, "__qualname__", repr(fn))
+
+    return Result(gate, name, count, mismatches, proved, netlists is None, counterexample)
+
+
+def check_engine(
+    engine: dict[str, Callable], name: str = "", batched: bool = False
+) -> list[Result]:
+    """Checks every multi-way gate that `engine` replaces, e.g. `{"gates.MUX8WAY16": MUX8WAY16}`."""
+    return [
+        check(component.partition(".")[2], fn, name or component, batched)
+        for component, fn in engine.items()
+        if component.partition(".")[2] in GATES
+    ]
+
+
+def implementations() -> dict[str, tuple[dict[str, Callable], bool]]:
+    """Every implementation of the multi-way gates, as an engine and whether it is batched."""
+    out = {
+        "gates": ({f"gates.{gate}": getattr(gates, gate) for gate in GATES}, False),
+        "intgates": (intgates.ENGINE, False),
+        "indexed": (indexed.ENGINE, False),
+    }
+
+    try:
+        import batched
+    except ImportError:
+        return out  # NumPy is optional
+
+    engine = {f"gates.{gate}": getattr(batched, f"{gate}_batch") for gate in GATES}
+    out["batched"] = (engine, True)
+
+    return out
+
+
+def table(results: Sequence[Result]) -> str:
+    """The results as a text table."""
+    lines = [f"{'gate':<10} {'implementation':<16} {'rows':>6} {'mismatches':>10}  verdict"]
+
+    for r in results:
+        verdict = (
+            "counterexample " + repr(r.counterexample)
+            if not r.equivalent
+            else "proved" if r.proved else "equivalent on every bit slice"
+        )
+        verdict += " (black box)" if r.black_box else ""
+        lines.append(
+            f"{r.gate:<10} {r.implementation:<16} {r.rows:>6,} {r.mismatches:>10,}  {verdict}"
+        )
+
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Exhaustive equivalence checks of the multi-way gates."
+    )
+    parser.parse_args(argv)
+
+    results = [
+        r
+        for name, (engine, batched) in implementations().items()
+        for r in check_engine(engine, name, batched)
+    ]
+
+    print(table(results))
+
+    if not all(r.equivalent for r in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""Event-driven simulation of gate netlists.
+
+An `EventSimulator` keeps the value of every wire of a netlist between steps. A step
+re-evaluates only the gates downstream of the inputs that changed, level by level, and
+stops propagating wherever a gate's output does not change. `evaluated` records how many
+gates every step evaluated; evaluating the whole netlist costs `len(netlist.gates)`.
+
+A netlist with state ports, i.e. an output `next_<port>` for an input `<port>`, is
+clocked: after each step the state outputs are latched into the state inputs for the
+next step, and only the state bits that changed propagate.
+
+`Computer` runs the netlist of the Hack computer (`netlist.computer`) this way. Between
+consecutive cycles most signals in the CPU and the memory decoders keep their values, so
+most cycles evaluate a fraction of the netlist:
+
+    computer = events.Computer(program)
+
+    for _ in range(cycles):
+        computer(reset=False)
+
+    print(computer.evaluated)
+"""
+
+import netlist
+
+from array import array
+from contracts import level
+from netlist import OPS, Netlist
+from typing import Sequence
+
+
+_AND, _OR, _NOT, _NAND, _XOR, _MUX = range(len(OPS))
+
+
+class EventSimulator:
+    """Event-driven simulation of a netlist, clocked if it has state ports."""
+
+    def __init__(self, n: Netlist, inputs: dict[str, int] | None = None) -> None:
+        """Evaluates the whole netlist once, with every input port zero unless given in `inputs`."""
+        self.netlist = n
+        self.evaluated: list[int] = []
+
+        first_gate, count = n.first_gate, len(n.gates)
+        self._first_gate = first_gate
+        self._ops = bytearray(OPS.index(op) for op, _ in n.gates)
+        self._ins = [array("I", (ins[i] if i < len(ins) else 0 for _, ins in n.gates)) for i in range(3)]
+
+        # the logic level of every gate, for evaluating a step in order
+        wire_levels = array("I", bytes(4 * n.wires))
+
+        for k, (_, ins) in enumerate(n.gates):
+            wire_levels[first_gate + k] = 1 + max(wire_levels[i] for i in ins)
+
+        self._levels = wire_levels[first_gate:]
+        self._buckets: list[list[int]] = [[] for _ in range(max(self._levels, default=0) + 1)]
+
+        # the gates reading every wire, in compressed sparse row form
+        offsets = array("I", bytes(4 * (n.wires + 1)))
+
+        for _, ins in n.gates:
+            for i in set(ins):
+                offsets[i + 1] += 1
+
+        for w in range(n.wires):
+            offsets[w + 1] += offsets[w]
+
+        fanout, cursor = array("I", bytes(4 * offsets[-1])), array("I", offsets)
+
+        for k, (_, ins) in enumerate(n.gates):
+            for i in set(ins):
+                fanout[cursor[i]] = k
+                cursor[i] += 1
+
+        self._offsets, self._fanout = offsets, fanout
+        self._scheduled = bytearray(count)
+
+        # clocked state: pairs of state input and state output wires
+        self._state = [
+            (i, o)
+            for port, ws in n.inputs.items()
+            if f"next_{port}" in n.outputs
+            for i, o in zip(ws, n.outputs[f"next_{port}"])
+        ]
+
+        # the values of every wire, computed in full once
+        self.values = bytearray(n.wires)
+        self.values[1] = 1
+
+        for port, value in (inputs or {}).items():
+            self._write(port, value)
+
+        for k in range(count):
+            self._evaluate(k)
+
+        self._pending: list[int] = []
+
+    def _write(self, port: str, value: int) -> list[int]:
+        """Sets the wires of `port` to `value` and returns those that changed."""
+        ws, values = self.netlist.inputs[port], self.values
+        changed = []
+
+        for i, w in enumerate(ws):
+            bit = (value >> (len(ws) - 1 - i)) & 1
+
+            if values[w] != bit:
+                values[w] = bit
+                changed.append(w)
+
+        return changed
+
+    def _evaluate(self, k: int) -> bool:
+        """Evaluates gate `k` and returns `True` iff its output changed."""
+        values, ins = self.values, self._ins
+        op, a = self._ops[k], values[ins[0][k]]
+
+        if op == _AND:
+            out = a & values[ins[1][k]]
+        elif op == _OR:
+            out = a | values[ins[1][k]]
+        elif op == _NOT:
+            out = a ^ 1
+        elif op == _NAND:
+            out = (a & values[ins[1][k]]) ^ 1
+        elif op == _XOR:
+            out = a ^ values[ins[1][k]]
+        else:
+            out = values[ins[1][k]] if values[ins[2][k]] else a
+
+        w = self._first_gate + k
+
+        if values[w] == out:
+            return False
+
+        values[w] = out
+
+        return True
+
+    def _schedule(self, wires: list[int]) -> None:
+        """Schedules the gates reading `wires`."""
+        offsets, fanout, scheduled = self._offsets, self._fanout, self._scheduled
+        gate_levels, buckets = self._levels, self._buckets
+
+        for w in wires:
+            for k in fanout[offsets[w] : offsets[w + 1]]:
+                if not scheduled[k]:
+                    scheduled[k] = 1
+                    buckets[gate_levels[k]].append(k)
+
+    def step(self, inputs: dict[str, int]) -> int:
+        """Sets the input ports in `inputs`, propagates the changes and latches the state. Returns the number of gates evaluated."""
+        checks = level("events.EventSimulator")
+
+        # pre-conditions
+        if checks:
+            assert all(port in self.netlist.inputs for port in inputs), "ports must be input ports"
+
+        # body
+        changed = self._pending
+
+        for port, value in inputs.items():
+            changed.extend(self._write(port, value))
+
+        self._schedule(changed)
+
+        evaluated, first_gate, scheduled = 0, self._first_gate, self._scheduled
+
+        for bucket in self._buckets:
+            for k in bucket:
+                scheduled[k] = 0
+                evaluated += 1
+
+                if self._evaluate(k):
+                    self._schedule([first_gate + k])
+
+            bucket.clear()
+
+        values = self.values
+        self._pending = []
+
+        for i, o in self._state:
+            if values[i] != values[o]:
+                values[i] = values[o]
+                self._pending.append(i)
+
+        self.evaluated.append(evaluated)
+
+        return evaluated
+
+    def read(self, port: str) -> int:
+        """The value of the port `port`, most significant bit first. State ports hold their latched value."""
+        ws = self.netlist.outputs.get(port) or self.netlist.inputs[port]
+        values = self.values
+
+        return sum(values[w] << (len(ws) - 1 - i) for i, w in enumerate(ws))
+
+
+_COMPUTER: Netlist | None = None
+
+
+class Computer:
+    """The Hack computer simulated event by event on its gate netlist, with the program in ROM."""
+
+    def __init__(self, program: Sequence[int]) -> None:
+        global _COMPUTER
+
+        # pre-conditions
+        assert len(program) <= 2**15, "`program` must fit in the ROM"
+
+        # body
+        if _COMPUTER is None:
+            _COMPUTER = netlist.computer()
+
+        self.program = list(program)
+        self.simulator = EventSimulator(_COMPUTER, {"zr": 1})  # the state of `CPU.create`
+
+    def __call__(self, reset: bool) -> "Computer":
+        """Runs one clock cycle."""
+        pc = self.simulator.read("pc") & 0x7FFF
+        instruction = self.program[pc] if pc < len(self.program) else 0
+        self.simulator.step({"instruction": instruction, "reset": int(reset)})
+
+        return self
+
+    @property
+    def evaluated(self) -> list[int]:
+        """The number of gates evaluated in every cycle so far."""
+        return self.simulator.evaluated
+
+    def read(self, port: str) -> int:
+        """The value of a state port, e.g. `"a"`, `"pc"` or `"ram17"`."""
+        return self.simulator.read(port)
@@ -0,0 +1,510 @@
+"""Exhaustive verification of the ALU over every pair of operands.
+
+`test_arithmetic.py` and `alukernels.verify` sample operands. Here every one of the 18
+control words of the Hack ISA (its comp codes with `a` = 0, see `decoder`) is checked on
+all 2^16 x 2^16 pairs `(x, y)`, for every implementation in `IMPLEMENTATIONS`:
+
+- `gates`, the reference: the netlist of `arithmetic.ALU` (see `netlist`), evaluated
+  bit-sliced on NumPy `uint64` arrays, so every gate is a few vector operations on 64
+  pairs per word;
+- `kogge-stone` and `brent-kung`, the netlist of the ALU with a prefix adder (see
+  `prefixadder`), evaluated the same way;
+- `batched`, `batched.ALU_batch`;
+- `alukernels`, the kernel that `alukernels.ALU` dispatches to, run on NumPy arrays.
+
+All of them are compared with `spec`, an integer model of the ALU written from its
+documented behaviour. The work is split into chunks of `block` values of `x`, each paired
+with every `y`, which run on a process pool. Every finished chunk is appended to a
+checkpoint file, one JSON line per chunk, so a run that is interrupted resumes where it
+stopped. The results depend only on the implementations, not on the order in which
+chunks finish, and the report carries the fingerprints of the netlists it checked:
+
+    python exhaustive.py --checkpoint alu.jsonl --json > report.json
+
+A chunk of 16 values of `x` (2^20 pairs) takes ~35ms for `gates`, `batched` and
+`alukernels` on one core, so a full run of them is ~40 CPU-minutes, a few minutes on a
+machine with many cores. Every prefix adder adds ~45 CPU-minutes.
+`--symbols` and `--xs` restrict a run to some control words or a range of `x`.
+
+NumPy is listed in `requirements.txt`, but only this module and `batched` need it.
+"""
+
+import alukernels
+import argparse
+import batched
+import json
+import numpy as np
+import os
+import prefixadder
+import sys
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from decoder import COMP_SYMBOL_TO_INSTRUCTION
+from functools import partial
+from netlist import Netlist
+from typing import Any, Callable, Sequence
+from utils import int_to_bit_vector
+
+
+# The control word `zx nx zy ny f no` of every comp code of the Hack ISA with `a` = 0
+CONTROLS: dict[str, int] = {
+    symbol: code for symbol, code in COMP_SYMBOL_TO_INSTRUCTION.items() if code < 1 << 6
+}
+
+# The outputs `(out, zr, ng)` of an ALU on every `x` in a chunk paired with every `y`
+Outputs = tuple[Any, Any, Any]
+
+_WORDS = 1 << 16
+
+_YS = np.arange(_WORDS, dtype=np.uint32)
+
+_SHIFTS = np.arange(15, -1, -1, dtype=np.uint32)
+
+_ZERO, _ONES = np.uint64(0), np.uint64(2**64 - 1)
+
+# Bit `i` of every `y`, most significant first, 64 pairs per word
+_Y_PLANES = [
+    np.packbits((_YS >> shift & 1).astype(np.bool_), bitorder="little").view(np.uint64)
+    for shift in _SHIFTS
+]
+
+_NETLISTS: dict[str, Netlist] = {}
+
+
+def _bits(control: int) -> tuple[bool, ...]:
+    """The control bits `(zx, nx, zy, ny, f, no)` of `control`."""
+    return tuple(int_to_bit_vector(control, n=6))
+
+
+def spec(xs: Any, control: int) -> Outputs:
+    """
+    The ALU as an integer model of its documented behaviour.
+
+    Args:
+        xs: the values of `x`, a `uint16` array
+        control: the control word `zx nx zy ny f no`
+
+    Returns:
+        `(out, zr, ng)`, arrays of shape `(len(xs), 2^16)` indexed by `x` and `y`
+    """
+    zx, nx, zy, ny, f, no = _bits(control)
+
+    x = xs.astype(np.uint32)[:, None]
+    y = _YS[None, :]
+
+    if zx:
+        x = x & 0
+    if nx:
+        x = x ^ 0xFFFF
+    if zy:
+        y = y & 0
+    if ny:
+        y = y ^ 0xFFFF
+
+    out = (x + y) & 0xFFFF if f else x & y
+
+    if no:
+        out = out ^ 0xFFFF
+
+    out = out.astype(np.uint16)
+
+    return out, out == 0, out >= 0x8000
+
+
+def _netlist(adder: str = "ripple") -> Netlist:
+    """The netlist of the ALU with `adder` in `prefixadder.ADDERS`, traced once per process."""
+    if adder not in _NETLISTS:
+        _NETLISTS[adder] = prefixadder.netlists(adder)["ALU"]
+
+    return _NETLISTS[adder]
+
+
+def _evaluate(n: Netlist, ports: dict[str, list[Any]]) -> list[Any]:
+    """The value of every wire of `n`, with bit-sliced `uint64` arrays or scalars on `ports`."""
+    values: list[Any] = [None] * (n.first_gate + len(n.gates))
+    values[0], values[1] = _ZERO, _ONES
+
+    for port, ws in n.inputs.items():
+        for w, value in zip(ws, ports[port]):
+            values[w] = value
+
+    for k, (op, ins) in enumerate(n.gates, start=n.first_gate):
+        x = values[ins[0]]
+
+        if op == "AND":
+            values[k] = x & values[ins[1]]
+        elif op == "OR":
+            values[k] = x | values[ins[1]]
+        elif op == "NOT":
+            values[k] = ~x
+        elif op == "NAND":
+            values[k] = ~(x & values[ins[1]])
+        elif op == "XOR":
+            values[k] = x ^ values[ins[1]]
+        else:  # MUX: `y` where `sel` is set, `x` elsewhere
+            values[k] = x ^ ((x ^ values[ins[1]]) & values[ins[2]])
+
+    return values
+
+
+def _unsliced(plane: Any, words: int) -> Any:
+    """The bits of the bit-sliced `plane` of `words` words, one `uint8` per pair."""
+    plane = np.full(words, plane, dtype=np.uint64) if np.ndim(plane) == 0 else plane
+    return np.unpackbits(plane.view(np.uint8), bitorder="little")
+
+
+def gates(xs: Any, control: int, adder: str = "ripple") -> Outputs:
+    """The gate-level ALU with `adder`, as `spec`: its netlist run on 64 pairs per `uint64`."""
+    n, count = _netlist(adder), len(xs)
+    words = count * _WORDS // 64
+    x_bits = (xs.astype(np.uint32)[:, None] >> _SHIFTS & 1).astype(np.bool_)
+
+    ports = {
+        "xs": [np.repeat(np.where(x_bits[:, i], _ONES, _ZERO), _WORDS // 64) for i in range(16)],
+        "ys": [np.tile(plane, count) for plane in _Y_PLANES],
+    }
+    controls = zip(("zx", "nx", "zy", "ny", "f", "no"), _bits(control))
+    ports |= {port: [_ONES if bit else _ZERO] for port, bit in controls}
+
+    values = _evaluate(n, ports)
+
+    # every output bit is the bit of one position in a byte of the output word
+    high, low = np.zeros(words * 64, dtype=np.uint8), np.zeros(words * 64, dtype=np.uint8)
+
+    for i, w in enumerate(n.outputs["out"]):
+        bits = _unsliced(values[w], words)
+        bits <<= 7 - i % 8
+        byte = high if i < 8 else low
+        byte |= bits
+
+    out = (high.astype(np.uint16) << 8 | low).reshape(count, _WORDS)
+    zr, ng = (
+        _unsliced(values[n.outputs[port][0]], words).view(np.bool_).reshape(count, _WORDS)
+        for port in ("zr", "ng")
+    )
+
+    return out, zr, ng
+
+
+def batched_alu(xs: Any, control: int) -> Outputs:
+    """`batched.ALU_batch`, as `spec`."""
+    return batched.ALU_batch(xs[:, None], _YS.astype(np.uint16)[None, :], *_bits(control))
+
+
+def kernels(xs: Any, control: int) -> Outputs:
+    """The kernel of `control` in `alukernels.DISPATCH`, on NumPy arrays, as `spec`."""
+    _, kernel = alukernels.DISPATCH[_bits(control)]
+    out = np.asarray(kernel(xs.astype(np.uint32)[:, None], _YS[None, :]), dtype=np.uint32)
+    out = np.broadcast_to(out, (len(xs), _WORDS)).astype(np.uint16)
+
+    return out, out == 0, out >= 0x8000
+
+
+# Every implementation checked against `spec`
+IMPLEMENTATIONS: dict[str, Callable[[Any, int], Outputs]] = {
+    "gates": gates,
+    **{network: partial(gates, adder=network) for network in prefixadder.NETWORKS},
+    "batched": batched_alu,
+    "alukernels": kernels,
+}
+
+# The adder of every implementation that is a netlist
+_ADDERS = {"gates": "ripple", **{network: network for network in prefixadder.NETWORKS}}
+
+
+def _fingerprints(names: Sequence[str]) -> dict[str, str]:
+    """The fingerprint of the netlist of every implementation in `names` that is a netlist."""
+    return {name: _netlist(_ADDERS[name]).fingerprint() for name in names if name in _ADDERS}
+
+
+@dataclass(frozen=True, slots=True)
+class Result:
+    """The outcome of checking the implementations on one control word."""
+
+    symbol: str
+    control: int
+    vectors: int
+    mismatches: dict[str, int]
+    counterexamples: dict[str, dict[str, int | bool] | None]
+
+    @property
+    def exhaustive(self) -> bool:
+        """`True` iff every pair of operands was checked."""
+        return self.vectors == 1 << 32
+
+    @property
+    def equivalent(self) -> bool:
+        """`True` iff every implementation matches `spec` on every pair checked."""
+        return not any(self.mismatches.values())
+
+
+def check(symbol: str, x: int, count: int, names: Sequence[str]) -> dict[str, Any]:
+    """
+    Checks the implementations `names` on `count` values of `x` from `x`, with every `y`.
+
+    Returns:
+        a checkpoint record: the chunk, and the number of mismatches and the first
+        counterexample of every implementation
+    """
+    # pre-conditions
+    assert symbol in CONTROLS, f"`symbol` must be one of {list(CONTROLS)}"
+    assert 0 <= x and count >= 1 and x + count <= _WORDS, "the chunk must hold 16-bit `x`s"
+
+    # body
+    control = CONTROLS[symbol]
+    xs = np.arange(x, x + count, dtype=np.uint16)
+    shape = (count, _WORDS)
+    expected = [np.broadcast_to(e, shape) for e in spec(xs, control)]
+    record: dict[str, Any] = {
+        "symbol": symbol,
+        "x": x,
+        "count": count,
+        "mismatches": {},
+        "counterexamples": {},
+    }
+
+    for name in names:
+        outputs = [np.broadcast_to(o, shape) for o in IMPLEMENTATIONS[name](xs, control)]
+        wrong = np.zeros(shape, dtype=np.bool_)
+
+        for e, o in zip(expected, outputs):
+            wrong |= e != o
+
+        mismatches = int(np.count_nonzero(wrong))
+        counterexample = None
+
+        if mismatches:
+            i, y = divmod(int(np.argmax(wrong)), _WORDS)  # the first, in `x`-major order
+            out, zr, ng = (o[i, y] for o in outputs)
+            counterexample = {
+                "x": x + i,
+                "y": y,
+                "out": int(out),
+                "zr": bool(zr),
+                "ng": bool(ng),
+                "spec": int(expected[0][i, y]),
+            }
+
+        record["mismatches"][name] = mismatches
+        record["counterexamples"][name] = counterexample
+
+    return record
+
+
+def _header(symbols: Sequence[str], names: Sequence[str], xs: range, block: int) -> dict:
+    """What a checkpoint was written for: a checkpoint resumes only the same run."""
+    return {
+        "netlists": _fingerprints(names),
+        "symbols": list(symbols),
+        "implementations": list(names),
+        "xs": [xs.start, xs.stop],
+        "block": block,
+    }
+
+
+def _resumed(path: str, header: dict) -> dict[tuple[str, int], dict[str, Any]]:
+    """The records in the checkpoint at `path`, written for `header`, or none if it is new."""
+    if not os.path.exists(path):
+        with open(path, "w") as f:
+            f.write(json.dumps(header) + "\n")
+
+        return {}
+
+    with open(path) as f:
+        lines = f.read().split("\n")
+
+    assert json.loads(lines[0]) == header, f"the checkpoint {path} was written for another run"
+
+    records = {}
+
+    for line in lines[1:]:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:  # the last line of an interrupted run, or the end
+            continue
+
+        records[record["symbol"], record["x"]] = record
+
+    return records
+
+
+def verify(
+    symbols: Sequence[str] = tuple(CONTROLS),
+    implementations: Sequence[str] = tuple(IMPLEMENTATIONS),
+    xs: range = range(_WORDS),
+    block: int = 16,
+    workers: int | None = None,
+    checkpoint: str | None = None,
+) -> list[Result]:
+    """
+    Checks `implementations` against `spec` on every `x` in `xs`, paired with every `y`.
+
+    Args:
+        symbols: the comp symbols of the control words to check
+        implementations: the names of the implementations in `IMPLEMENTATIONS`
+        xs: the values of `x`, all of them by default
+        block: the number of values of `x` per chunk
+        workers: the number of worker processes, all CPUs if `None`, none if 1
+        checkpoint: a file that records every finished chunk, and from which a run of the
+            same checks resumes
+
+    Returns:
+        a result per control word, in the order of `symbols`
+    """
+    # pre-conditions
+    assert set(symbols) <= set(CONTROLS), f"`symbols` must be some of {list(CONTROLS)}"
+    assert set(implementations) <= set(IMPLEMENTATIONS), "`implementations` must be named"
+    assert xs.step == 1 and 0 <= xs.start < xs.stop <= _WORDS, "`xs` must be 16-bit words"
+    assert block >= 1, "`block` must be positive"
+
+    # body
+    chunks = [
+        (symbol, x, min(block, xs.stop - x))
+        for symbol in symbols
+        for x in range(xs.start, xs.stop, block)
+    ]
+    header = _header(symbols, implementations, xs, block)
+    records = _resumed(checkpoint, header) if checkpoint else {}
+    todo = [chunk for chunk in chunks if chunk[:2] not in records]
+
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(workers) if workers > 1 and len(todo) > 1 else None
+    names = [tuple(implementations)] * len(todo)
+
+    try:
+        if executor is None:
+            done = map(check, *zip(*todo), names)
+        else:
+            done = executor.map(check, *zip(*todo), names)
+
+        with open(checkpoint or os.devnull, "a") as log:
+            for record in done:
+                records[record["symbol"], record["x"]] = record
+                log.write(json.dumps(record) + "\n")
+                log.flush()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    results = []
+
+    for symbol in symbols:
+        chunk_records = [records[symbol, x] for s, x, _ in chunks if s == symbol]
+        counterexamples = {}
+
+        for name in implementations:
+            firsts = [r["counterexamples"][name] for r in chunk_records]
+            counterexamples[name] = next((c for c in firsts if c is not None), None)
+
+        results.append(
+            Result(
+                symbol=symbol,
+                control=CONTROLS[symbol],
+                vectors=sum(r["count"] for r in chunk_records) * _WORDS,
+                mismatches={
+                    name: sum(r["mismatches"][name] for r in chunk_records)
+                    for name in implementations
+                },
+                counterexamples=counterexamples,
+            )
+        )
+
+    # post-conditions
+    assert all(r.vectors == len(xs) * _WORDS for r in results), "every chunk must be checked"
+
+    return results
+
+
+def report(results: Sequence[Result]) -> dict[str, Any]:
+    """The results as a JSON-serialisable `dict`, with the netlists that were checked."""
+    return {
+        "netlists": _fingerprints(list(results[0].mismatches) if results else []),
+        "equivalent": all(r.equivalent for r in results),
+        "exhaustive": all(r.exhaustive for r in results),
+        "results": [
+            {
+                "symbol": r.symbol,
+                "control": format(r.control, "06b"),
+                "vectors": r.vectors,
+                "mismatches": r.mismatches,
+                "counterexamples": r.counterexamples,
+            }
+            for r in results
+        ],
+    }
+
+
+def table(results: Sequence[Result]) -> str:
+    """The results as a text table, with a column of mismatches per implementation."""
+    names = list(results[0].mismatches) if results else []
+    lines = [
+        f"{'symbol':<7} {'control':<8} {'vectors':>13} "
+        + " ".join(f"{name:>10}" for name in names)
+        + "  verdict"
+    ]
+
+    for r in results:
+        if r.equivalent:
+            verdict = "proved" if r.exhaustive else "equivalent"
+        else:
+            name = next(name for name in names if r.mismatches[name])
+            verdict = f"counterexample ({name}) {r.counterexamples[name]!r}"
+
+        lines.append(
+            f"{r.symbol:<7} {r.control:06b}   {r.vectors:>13,} "
+            + " ".join(f"{r.mismatches[name]:>10,}" for name in names)
+            + f"  {verdict}"
+        )
+
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Checks the ALU implementations against an integer model on all operands."
+    )
+    parser.add_argument("--symbols", nargs="+", default=list(CONTROLS), choices=list(CONTROLS))
+    parser.add_argument(
+        "--implementations",
+        nargs="+",
+        default=list(IMPLEMENTATIONS),
+        choices=list(IMPLEMENTATIONS),
+    )
+    parser.add_argument(
+        "--xs",
+        nargs=2,
+        type=int,
+        default=[0, _WORDS],
+        metavar=("START", "STOP"),
+        help="check the `x`s in [START, STOP) only",
+    )
+    parser.add_argument("--block", type=int, default=16, help="values of `x` per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="all CPUs by default")
+    parser.add_argument("--checkpoint", default=None, help="a file to record and resume progress")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = verify(
+        args.symbols,
+        args.implementations,
+        range(*args.xs),
+        args.block,
+        args.workers,
+        args.checkpoint,
+    )
+    print(f"checked in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(report(results), indent=2))
+    else:
+        print(table(results))
+
+    if not all(r.equivalent for r in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
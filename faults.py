@@ -0,0 +1,409 @@
+"""Stuck-at fault simulation of gate netlists.
+
+A stuck-at fault pins one wire of a netlist (see `netlist`), an input bit or the output of
+a gate, to 0 or 1. A test vector detects a fault if the faulty netlist's outputs differ
+from the fault-free ones for that vector. The fault coverage of a set of vectors is the
+fraction of all single stuck-at faults that some vector detects.
+
+`simulate` runs the fault-free machine and every faulty machine at once: every wire
+carries a Python int whose bit 0 is its value in the fault-free machine and whose bit `i`
+is its value in the machine with fault `i`. The netlist is compiled into one
+straight-line function that forces the faulty lanes of every faulted wire, so a vector
+costs one pass over the gates for all faults. Vectors are split over a process pool, and
+detected faults are dropped between rounds, so later rounds run fewer lanes.
+
+`capture` records the vectors that a test suite applies to the components in
+`COMPONENTS`, by running it under an engine (see `engines`) that records their inputs.
+Every call counts, including calls nested in other components. A fault then counts as
+observed when some vector propagates it to the outputs of the component, whether or not
+the test asserts on them, so the report on a test suite is its output-observability
+coverage: an upper bound on the faults its assertions catch, not the faults they catch.
+Run it in a fresh process, so the test modules import the recording components:
+
+    python faults.py --tests test_arithmetic.py test_computer.py
+"""
+
+import argparse
+import engines
+import inspect
+import json
+import netlist
+import os
+import sys
+
+from computer import CPU
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from gates import MUX8WAY16
+from netlist import Netlist
+from typing import Any, Callable, Iterable, Sequence
+from utils import Word16, to_int
+
+
+# A wire stuck at 0 or 1
+Fault = tuple[int, int]
+
+# The inputs of one call of a component, one int per input port of its netlist
+Vector = tuple[int, ...]
+
+TESTS = ["test_arithmetic.py", "test_computer.py"]
+
+
+def _mux8way16() -> Netlist:
+    """The netlist of `gates.MUX8WAY16`."""
+
+    def fn(xs, ys, zs, ws, us, vs, ms, ns, sel):  # type: ignore
+        return {"out": MUX8WAY16(xs, ys, zs, ws, us, vs, ms, ns, sel)}
+
+    words = dict.fromkeys(["xs", "ys", "zs", "ws", "us", "vs", "ms", "ns"], 16)
+
+    return netlist.trace("MUX8WAY16", fn, {**words, "sel": 3})
+
+
+COMPONENTS: dict[str, Callable[[], Netlist]] = {
+    "ALU": netlist.alu,
+    "ADD16": netlist.add16,
+    "MUX8WAY16": _mux8way16,
+    "CPU": netlist.cpu,
+}
+
+# The component whose calls are the vectors of every netlist
+_CALLS = {
+    "ALU": "arithmetic.ALU",
+    "ADD16": "arithmetic.ADD16",
+    "MUX8WAY16": "gates.MUX8WAY16",
+    "CPU": "computer.CPU.__call__",
+}
+
+# The data ports of every netlist, whose fan-out is excluded from its control logic
+DATA_PORTS = {"CPU": ("in_m", "a", "d", "pc")}
+
+# What the coverage of vectors captured from a test suite measures
+METRIC = "output observability"
+
+
+@dataclass(frozen=True, slots=True)
+class Coverage:
+    """The faults of a netlist that a set of vectors detects."""
+
+    name: str
+    vectors: int
+    faults: tuple[Fault, ...]
+    undetected: tuple[Fault, ...]
+    sites: dict[int, str]
+
+    @property
+    def detected(self) -> int:
+        """The number of detected faults."""
+        return len(self.faults) - len(self.undetected)
+
+    @property
+    def coverage(self) -> float:
+        """The fraction of faults detected."""
+        return self.detected / len(self.faults) if self.faults else 1.0
+
+    def to_dict(self) -> dict:
+        """The coverage as a JSON-serialisable `dict`."""
+        return {
+            "name": self.name,
+            "vectors": self.vectors,
+            "faults": len(self.faults),
+            "detected": self.detected,
+            "coverage": self.coverage,
+            "undetected": [
+                {"site": self.sites[w], "stuck_at": v} for w, v in self.undetected
+            ],
+        }
+
+
+def sites(n: Netlist) -> dict[int, str]:
+    """A name for every wire of `n` that can be faulted: input bits and gate outputs."""
+    out = {
+        w: f"{port}[{i}]" if len(ws) > 1 else port
+        for port, ws in n.inputs.items()
+        for i, w in enumerate(ws)
+    }
+
+    for k, (op, _) in enumerate(n.gates):
+        out[n.first_gate + k] = f"{op}#{k}"
+
+    return out
+
+
+def control(n: Netlist, data_ports: Sequence[str]) -> list[int]:
+    """The wires of `n` that no wire of `data_ports` reaches, i.e. its control logic."""
+    # pre-conditions
+    assert set(data_ports) <= set(n.inputs), "`data_ports` must be input ports"
+
+    # body
+    data = [False] * n.wires
+
+    for port in data_ports:
+        for w in n.inputs[port]:
+            data[w] = True
+
+    for k, (_, ins) in enumerate(n.gates):
+        data[n.first_gate + k] = any(data[i] for i in ins)
+
+    return [w for w in sites(n) if not data[w]]
+
+
+def faults(wires: Iterable[int]) -> list[Fault]:
+    """Every single stuck-at fault on `wires`."""
+    return [(w, v) for w in wires for v in (0, 1)]
+
+
+def source(n: Netlist, faults: Sequence[Fault]) -> str:
+    """The Python source of a function `detect(inputs)` that returns the lanes of `faults` that the input lanes detect."""
+    mask = (1 << (len(faults) + 1)) - 1
+    stuck_at: dict[int, list[int]] = {}
+
+    for lane, (w, v) in enumerate(faults, start=1):
+        stuck_at.setdefault(w, [0, 0])[v] |= 1 << lane
+
+    def var(w: int) -> str:
+        return ("0", str(mask))[w] if w < 2 else f"w{w}"
+
+    def force(w: int) -> list[str]:
+        if w not in stuck_at:
+            return []
+
+        zeros, ones = stuck_at[w]
+
+        return [f"    {var(w)} = {var(w)} & {mask ^ zeros} | {ones}"]
+
+    expressions = {
+        "AND": "{0} & {1}",
+        "OR": "{0} | {1}",
+        "NOT": "{0} ^ M",
+        "NAND": "{0} & {1} ^ M",
+        "XOR": "{0} ^ {1}",
+        "MUX": "{0} ^ ({0} ^ {1}) & {2}",
+    }
+    inputs = [w for ws in n.inputs.values() for w in ws]
+    lines = [
+        "def detect(inputs):",
+        f"    M = {mask}",
+        f"    {', '.join(map(var, inputs))}, = inputs",
+    ]
+
+    for w in inputs:
+        lines.extend(force(w))
+
+    for k, (op, ins) in enumerate(n.gates):
+        w = n.first_gate + k
+        lines.append(f"    {var(w)} = {expressions[op].format(*map(var, ins))}")
+        lines.extend(force(w))
+
+    lines.append("    out = 0")
+
+    for w in dict.fromkeys(w for ws in n.outputs.values() for w in ws if w >= 2):
+        lines.append(f"    out |= {var(w)} ^ -({var(w)} & 1)")  # lanes that differ from lane 0
+
+    lines.append("    return out & M")
+
+    return "\n".join(lines) + "\n"
+
+
+def _detect(n: Netlist, faults: Sequence[Fault], vectors: Sequence[Vector]) -> int:
+    """The lanes of `faults` that `vectors` detect."""
+    namespace: dict = {}
+    exec(compile(source(n, faults), f"<faults {n.name}>", "exec"), namespace)
+    detect = namespace["detect"]
+
+    mask = (1 << (len(faults) + 1)) - 1
+    widths = [len(ws) for ws in n.inputs.values()]
+    out = 0
+
+    for vector in vectors:
+        lanes = []
+
+        for value, width in zip(vector, widths):
+            lanes.extend(mask if (value >> (width - 1 - i)) & 1 else 0 for i in range(width))
+
+        out |= detect(lanes)
+
+    return out
+
+
+def simulate(
+    n: Netlist,
+    faults: Sequence[Fault],
+    vectors: Sequence[Vector],
+    workers: int | None = None,
+    chunk: int = 1_024,
+) -> list[Fault]:
+    """
+    Simulates `faults` in `n` over `vectors`.
+
+    Args:
+        n: the netlist
+        faults: the faults to simulate
+        vectors: the test vectors, one int per input port, most significant bit first
+        workers: the number of worker processes, all CPUs if `None`, none if 1
+        chunk: the number of vectors a worker simulates per round
+
+    Returns:
+        the faults that no vector detects
+    """
+    # pre-conditions
+    assert all(len(v) == len(n.inputs) for v in vectors), "every vector must cover every port"
+    assert chunk >= 1, "`chunk` must be positive"
+
+    # body
+    workers = workers or os.cpu_count() or 1
+    remaining = list(faults)
+    executor = ProcessPoolExecutor(workers) if workers > 1 else None
+    step = chunk * workers
+
+    try:
+        for start in range(0, len(vectors), step):
+            if not remaining:
+                break
+
+            parts = [vectors[i : i + chunk] for i in range(start, start + step, chunk)]
+            parts = [part for part in parts if part]
+
+            if executor is None:
+                detected = [_detect(n, remaining, part) for part in parts]
+            else:
+                count = len(parts)
+                detected = list(executor.map(_detect, [n] * count, [remaining] * count, parts))
+
+            lanes = 0
+
+            for d in detected:
+                lanes |= d
+
+            remaining = [f for lane, f in enumerate(remaining, start=1) if not (lanes >> lane) & 1]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # post-conditions
+    assert set(remaining) <= set(faults), "undetected faults must be simulated faults"
+
+    return remaining
+
+
+def coverage(
+    name: str,
+    n: Netlist,
+    vectors: Sequence[Vector],
+    wires: Iterable[int] | None = None,
+    workers: int | None = None,
+) -> Coverage:
+    """The coverage of the stuck-at faults on `wires` of `n`, every fault site if `None`, by `vectors`."""
+    names = sites(n)
+    simulated = tuple(faults(names if wires is None else wires))
+    undetected = simulate(n, simulated, vectors, workers)
+
+    return Coverage(name, len(vectors), simulated, tuple(undetected), names)
+
+
+def _int(value: Any) -> int:
+    """A bit, bit vector or `Word16` as an int."""
+    if type(value) is Word16:
+        return value.value
+
+    if isinstance(value, tuple):
+        return to_int(value)
+
+    return int(value)
+
+
+def _recording(component: str, f: Callable, vectors: dict[Vector, None]) -> Callable:
+    """`f`, recording the vector of every call into `vectors`."""
+    signature = inspect.signature(f)
+
+    def wrapper(*args, **kwargs):  # type: ignore
+        arguments = signature.bind(*args, **kwargs).arguments
+
+        if component == "CPU":
+            state: CPU = arguments.pop("self")
+            arguments |= {
+                "a": state.a_register.out,
+                "d": state.d_register.out,
+                "pc": state.pc.out,
+                "zr": state.zr,
+                "ng": state.ng,
+            }
+
+        vectors[tuple(_int(v) for v in arguments.values())] = None
+
+        return f(*args, **kwargs)
+
+    return wrapper
+
+
+def capture(
+    tests: Sequence[str], components: Sequence[str] = tuple(COMPONENTS)
+) -> dict[str, list[Vector]]:
+    """Runs the pytest `tests` and returns the distinct vectors applied to every one of `components`."""
+    import pytest
+
+    # pre-conditions
+    assert set(components) <= set(COMPONENTS), f"`components` must be in {list(COMPONENTS)}"
+
+    # body
+    vectors: dict[str, dict[Vector, None]] = {name: {} for name in components}
+    engine = {}
+
+    for name in components:
+        owner, attr = engines._owner(_CALLS[name])
+        engine[_CALLS[name]] = _recording(name, vars(owner)[attr], vectors[name])
+
+    with engines.using(engine), redirect_stdout(sys.stderr):
+        pytest.main(["-q", "-p", "no:cacheprovider", *tests])
+
+    return {name: list(vs) for name, vs in vectors.items()}
+
+
+def table(coverages: Sequence[Coverage], limit: int = 10) -> str:
+    """A text table of `coverages`, listing up to `limit` undetected faults of each."""
+    lines = [f"{'component':<14} {'vectors':>9} {'faults':>7} {'detected':>9} {'coverage':>9}"]
+
+    for c in coverages:
+        lines.append(
+            f"{c.name:<14} {c.vectors:>9,} {len(c.faults):>7,} {c.detected:>9,} {c.coverage:>8.1%}"
+        )
+
+    for c in coverages:
+        if c.undetected:
+            shown = ", ".join(f"{c.sites[w]}/{v}" for w, v in c.undetected[:limit])
+            more = f", ... {len(c.undetected) - limit} more" if len(c.undetected) > limit else ""
+            lines.append(f"\n# {c.name} undetected: {shown}{more}")
+
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Stuck-at output-observability coverage of a test suite."
+    )
+    parser.add_argument("names", nargs="*", choices=[[], *COMPONENTS], default=[])
+    parser.add_argument("--tests", nargs="+", default=TESTS, help="the pytest files to grade")
+    parser.add_argument("--workers", type=int, default=None, help="all CPUs by default")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    names = args.names or list(COMPONENTS)
+    vectors = capture(args.tests, names)
+    coverages = []
+
+    for name in names:
+        n = COMPONENTS[name]()
+        wires = control(n, DATA_PORTS[name]) if name in DATA_PORTS else None
+        label = f"{name} (control)" if name in DATA_PORTS else name
+        coverages.append(coverage(label, n, vectors[name], wires, args.workers))
+
+    if args.json:
+        print(json.dumps([{"metric": METRIC, **c.to_dict()} for c in coverages], indent=2))
+    else:
+        print(f"# {METRIC} coverage: faults that reach the outputs, asserted or not\n")
+        print(table(coverages))
+
+
+if __name__ == "__main__":
+    main()
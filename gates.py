@@ -1,87 +1,111 @@
-from utils import is_n_bit_vector
+from contracts import level
+from utils import Word16, as_word, is_n_bit_vector
 
 
 # elementary logic gates
 def AND(x: bool, y: bool) -> bool:
     """And gate."""
+    checks = level("gates.AND")
+
     # pre-conditions
-    assert isinstance(x, bool), "`x` must be of type `bool`"
-    assert isinstance(y, bool), "`y` must be of type `bool`"
+    if checks:
+        assert isinstance(x, bool), "`x` must be of type `bool`"
+        assert isinstance(y, bool), "`y` must be of type `bool`"
 
     # body
     out = x and y
 
     # post-conditions
-    assert isinstance(out, bool), "Output must be of type `bool`"
+    if checks:
+        assert isinstance(out, bool), "Output must be of type `bool`"
 
     return out
 
 
 def OR(x: bool, y: bool) -> bool:
     """Or gate."""
+    checks = level("gates.OR")
+
     # pre-conditions
-    assert isinstance(x, bool), "`x` must be of type `bool`"
-    assert isinstance(y, bool), "`y` must be of type `bool`"
+    if checks:
+        assert isinstance(x, bool), "`x` must be of type `bool`"
+        assert isinstance(y, bool), "`y` must be of type `bool`"
 
     # body
     out = x or y
 
     # post-conditions
-    assert isinstance(out, bool), "Output must be of type `bool`"
+    if checks:
+        assert isinstance(out, bool), "Output must be of type `bool`"
 
     return out
 
 
 def NOT(x: bool) -> bool:
     """Not gate."""
+    checks = level("gates.NOT")
+
     # pre-conditions
-    assert isinstance(x, bool), "`x` must be of type `bool`"
+    if checks:
+        assert isinstance(x, bool), "`x` must be of type `bool`"
 
     # body
     out = not x
 
     # post-conditions
-    assert isinstance(out, bool), "Output must be of type `bool`"
+    if checks:
+        assert isinstance(out, bool), "Output must be of type `bool`"
 
     return out
 
 
 def NAND(x: bool, y: bool) -> bool:
     """Nand gate."""
+    checks = level("gates.NAND")
+
     # pre-conditions
-    assert isinstance(x, bool), "`x` must be of type `bool`"
-    assert isinstance(y, bool), "`y` must be of type `bool`"
+    if checks:
+        assert isinstance(x, bool), "`x` must be of type `bool`"
+        assert isinstance(y, bool), "`y` must be of type `bool`"
 
     # body
     out = not (x and y)
 
     # post-conditions
-    assert isinstance(out, bool), "Output must be of type `bool`"
+    if checks:
+        assert isinstance(out, bool), "Output must be of type `bool`"
 
     return out
 
 
 def XOR(x: bool, y: bool) -> bool:
     """Xor gate."""
+    checks = level("gates.XOR")
+
     # pre-conditions
-    assert isinstance(x, bool), "`x` must be of type `bool`"
-    assert isinstance(y, bool), "`y` must be of type `bool`"
+    if checks:
+        assert isinstance(x, bool), "`x` must be of type `bool`"
+        assert isinstance(y, bool), "`y` must be of type `bool`"
 
     # body
     out = ((not x) and y) or (x and (not y))
 
     # post-conditions
-    assert isinstance(out, bool), "Output must be of type `bool`"
+    if checks:
+        assert isinstance(out, bool), "Output must be of type `bool`"
 
     return out
 
 
 def MUX(x: bool, y: bool, sel: bool) -> bool:
     """Selects between two inputs."""
+    checks = level("gates.MUX")
+
     # pre-conditions
-    assert isinstance(x, bool), "`x` must be of type `bool`"
-    assert isinstance(y, bool), "`y` must be of type `bool`"
-    assert isinstance(sel, bool), "`sel` must be of type `bool`"
+    if checks:
+        assert isinstance(x, bool), "`x` must be of type `bool`"
+        assert isinstance(y, bool), "`y` must be of type `bool`"
+        assert isinstance(sel, bool), "`sel` must be of type `bool`"
 
     # body
     out = (
@@ -92,26 +116,31 @@ def MUX(x: bool, y: bool, sel: bool) -> bool:
     )
 
     # post-conditions
-    assert isinstance(out, bool), "Output must be of type `bool`"
+    if checks:
+        assert isinstance(out, bool), "Output must be of type `bool`"
 
     return out
 
 
 def DMUX(x: bool, sel: bool) -> tuple[bool, bool]:
     """Channels the input to one out of two outputs."""
+    checks = level("gates.DMUX")
+
     # pre-conditions
-    assert isinstance(x, bool), "`x` must be of type `bool`"
-    assert isinstance(sel, bool), "`sel` must be of type `bool`"
+    if checks:
+        assert isinstance(x, bool), "`x` must be of type `bool`"
+        assert isinstance(sel, bool), "`sel` must be of type `bool`"
 
     # body
     out = (x and (not sel), x and sel)
 
     # post-conditions
-    assert (
-        isinstance(out, tuple)
-        and len(out) == 2
-        and all(isinstance(o, bool) for o in out)
-    ), "Output must be 2-tuple of `bool`s"
+    if checks:
+        assert (
+            isinstance(out, tuple)
+            and len(out) == 2
+            and all(isinstance(o, bool) for o in out)
+        ), "Output must be 2-tuple of `bool`s"
 
     return out
 
@@ -119,60 +148,88 @@ def DMUX(x: bool, sel: bool) -> tuple[bool, bool]:
 # 16-bit variants
 def NOT16(xs: tuple[bool, ...]) -> tuple[bool, ...]:
     """16-bit Not."""
+    checks = level("gates.NOT16")
+
     # pre-conditions
-    assert is_n_bit_vector(xs, n=16), "`xs` must be 16-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(xs, n=16), "`xs` must be 16-tuple of `bool`s"
 
     # body
-    out = tuple(not x for x in xs)
+    if type(xs) is Word16:
+        out = Word16(xs.value ^ 0xFFFF)
+    else:
+        out = tuple(not x for x in xs)
 
     # post-conditions
-    assert is_n_bit_vector(out, n=16), "Output must be 16-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(out, n=16), "Output must be 16-tuple of `bool`s"
 
     return out
 
 
 def AND16(xs: tuple[bool, ...], ys: tuple[bool, ...]) -> tuple[bool, ...]:
     """16-bit And."""
+    checks = level("gates.AND16")
+
     # pre-conditions
-    assert is_n_bit_vector(xs, n=16), "`xs` must be 16-tuple of `bool`s"
-    assert is_n_bit_vector(ys, n=16), "`ys` must be 16-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(xs, n=16), "`xs` must be 16-tuple of `bool`s"
+        assert is_n_bit_vector(ys, n=16), "`ys` must be 16-tuple of `bool`s"
 
     # body
-    out = tuple(x and y for x, y in zip(xs, ys))
+    if type(xs) is Word16 or type(ys) is Word16:
+        out = Word16(as_word(xs).value & as_word(ys).value)
+    else:
+        out = tuple(x and y for x, y in zip(xs, ys))
 
     # post-conditions
-    assert is_n_bit_vector(out, n=16), "Output must be 16-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(out, n=16), "Output must be 16-tuple of `bool`s"
 
     return out
 
 
 def OR16(xs: tuple[bool, ...], ys: tuple[bool, ...]) -> tuple[bool, ...]:
     """16-bit Or."""
+    checks = level("gates.OR16")
+
     # pre-conditions
-    assert is_n_bit_vector(xs, n=16), "`xs` must be 16-tuple of `bool`s"
-    assert is_n_bit_vector(ys, n=16), "`ys` must be 16-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(xs, n=16), "`xs` must be 16-tuple of `bool`s"
+        assert is_n_bit_vector(ys, n=16), "`ys` must be 16-tuple of `bool`s"
 
     # body
-    out = tuple(x or y for x, y in zip(xs, ys))
+    if type(xs) is Word16 or type(ys) is Word16:
+        out = Word16(as_word(xs).value | as_word(ys).value)
+    else:
+        out = tuple(x or y for x, y in zip(xs, ys))
 
     # post-conditions
-    assert is_n_bit_vector(out, n=16), "Output must be 16-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(out, n=16), "Output must be 16-tuple of `bool`s"
 
     return out
 
 
 def MUX16(xs: tuple[bool, ...], ys: tuple[bool, ...], sel: bool) -> tuple[bool, ...]:
     """Selects between two 16-bit inputs."""
+    checks = level("gates.MUX16")
+
     # pre-conditions
-    assert is_n_bit_vector(xs, n=16), "`xs` must be 16-tuple of `bool`s"
-    assert is_n_bit_vector(ys, n=16), "`ys` must be 16-tuple of `bool`s"
-    assert isinstance(sel, bool), "`sel` must be of type `bool`"
+    if checks:
+        assert is_n_bit_vector(xs, n=16), "`xs` must be 16-tuple of `bool`s"
+        assert is_n_bit_vector(ys, n=16), "`ys` must be 16-tuple of `bool`s"
+        assert isinstance(sel, bool), "`sel` must be of type `bool`"
 
     # body
-    out = tuple(MUX(x, y, sel) for x, y in zip(xs, ys))
+    if type(xs) is Word16 or type(ys) is Word16:
+        out = as_word(ys) if sel else as_word(xs)
+    else:
+        out = tuple(MUX(x, y, sel) for x, y in zip(xs, ys))
 
     # post-conditions
-    assert is_n_bit_vector(out, n=16), "Output must be 16-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(out, n=16), "Output must be 16-tuple of `bool`s"
 
     return out
 
@@ -180,8 +237,11 @@ def MUX16(xs: tuple[bool, ...], ys: tuple[bool, ...], sel: bool) -> tuple[bool,
 # multi-way variants
 def OR8WAY(xs: tuple[bool, ...]) -> bool:
     """8-way Or."""
+    checks = level("gates.OR8WAY")
+
     # pre-conditions
-    assert is_n_bit_vector(xs, n=8), "`xs` must be an 8-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(xs, n=8), "`xs` must be an 8-tuple of `bool`s"
 
     # body
     out = xs[0] or (
@@ -189,21 +249,29 @@ def OR8WAY(xs: tuple[bool, ...]) -> bool:
     )
 
     # post-conditions
-    assert isinstance(out, bool), "Output must be of type `bool`"
+    if checks:
+        assert isinstance(out, bool), "Output must be of type `bool`"
 
     return out
 
 
 def OR16WAY(xs: tuple[bool, ...]) -> bool:
     """16-way Or."""
+    checks = level("gates.OR16WAY")
+
     # pre-conditions
-    assert is_n_bit_vector(xs, n=16), "`xs` must be an 16-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(xs, n=16), "`xs` must be an 16-tuple of `bool`s"
 
     # body
-    out = OR(OR8WAY(xs[:8]), OR8WAY(xs[8:]))
+    if type(xs) is Word16:
+        out = xs.value != 0
+    else:
+        out = OR(OR8WAY(xs[:8]), OR8WAY(xs[8:]))
 
     # post-conditions
-    assert isinstance(out, bool), "Output must be of type `bool`"
+    if checks:
+        assert isinstance(out, bool), "Output must be of type `bool`"
 
     return out
 
@@ -216,12 +284,15 @@ def MUX4WAY16(
     sel: tuple[bool, ...],
 ) -> tuple[bool, ...]:
     """Selects between four 16-bit inputs."""
+    checks = level("gates.MUX4WAY16")
+
     # pre-conditions
-    assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
-    assert is_n_bit_vector(ys, n=16), "`ys` must be a 16-tuple of `bool`s"
-    assert is_n_bit_vector(zs, n=16), "`zs` must be a 16-tuple of `bool`s"
-    assert is_n_bit_vector(ws, n=16), "`ws` must be a 16-tuple of `bool`s"
-    assert is_n_bit_vector(sel, n=2), "`sel` must be a 2-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(ys, n=16), "`ys` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(zs, n=16), "`zs` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(ws, n=16), "`ws` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(sel, n=2), "`sel` must be a 2-tuple of `bool`s"
 
     # body
     out = MUX16(
@@ -239,7 +310,8 @@ def MUX4WAY16(
     )
 
     # post-conditions
-    assert is_n_bit_vector(out, n=16), "Output must be 16-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(out, n=16), "Output must be 16-tuple of `bool`s"
 
     return out
 
@@ -256,16 +328,19 @@ def MUX8WAY16(
     sel: tuple[bool, ...],
 ) -> tuple[bool, ...]:
     """Selects between eight 16-bit inputs."""
+    checks = level("gates.MUX8WAY16")
+
     # pre-conditions
-    assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
-    assert is_n_bit_vector(ys, n=16), "`ys` must be a 16-tuple of `bool`s"
-    assert is_n_bit_vector(zs, n=16), "`zs` must be a 16-tuple of `bool`s"
-    assert is_n_bit_vector(ws, n=16), "`ws` must be a 16-tuple of `bool`s"
-    assert is_n_bit_vector(us, n=16), "`us` must be a 16-tuple of `bool`s"
-    assert is_n_bit_vector(vs, n=16), "`vs` must be a 16-tuple of `bool`s"
-    assert is_n_bit_vector(ms, n=16), "`ms` must be a 16-tuple of `bool`s"
-    assert is_n_bit_vector(ns, n=16), "`ns` must be a 16-tuple of `bool`s"
-    assert is_n_bit_vector(sel, n=3), "`sel` must be a 3-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(ys, n=16), "`ys` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(zs, n=16), "`zs` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(ws, n=16), "`ws` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(us, n=16), "`us` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(vs, n=16), "`vs` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(ms, n=16), "`ms` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(ns, n=16), "`ns` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(sel, n=3), "`sel` must be a 3-tuple of `bool`s"
 
     # body
     out = MUX16(
@@ -275,16 +350,20 @@ def MUX8WAY16(
     )
 
     # post-conditions
-    assert is_n_bit_vector(out, n=16), "Output must be 16-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(out, n=16), "Output must be 16-tuple of `bool`s"
 
     return out
 
 
 def DMUX4WAY(x: bool, sel: tuple[bool, ...]) -> tuple[bool, bool, bool, bool]:
     """Channels the input to one out of four outputs."""
+    checks = level("gates.DMUX4WAY")
+
     # pre-conditions
-    assert isinstance(x, bool), "`x` must be of type `bool`"
-    assert is_n_bit_vector(sel, n=2), "`sel` must be a 2-tuple of `bool`s"
+    if checks:
+        assert isinstance(x, bool), "`x` must be of type `bool`"
+        assert is_n_bit_vector(sel, n=2), "`sel` must be a 2-tuple of `bool`s"
 
     # body
     x1, x2 = DMUX(x, sel[1])
@@ -297,7 +376,8 @@ def DMUX4WAY(x: bool, sel: tuple[bool, ...]) -> tuple[bool, bool, bool, bool]:
     )
 
     # post-conditions
-    assert is_n_bit_vector(out, n=4), "Output must be a 4-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(out, n=4), "Output must be a 4-tuple of `bool`s"
 
     return out
 
@@ -306,9 +386,12 @@ def DMUX8WAY(
     x: bool, sel: tuple[bool, ...]
 ) -> tuple[bool, bool, bool, bool, bool, bool, bool, bool]:
     """Channels the input to one out of eight outputs."""
+    checks = level("gates.DMUX8WAY")
+
     # pre-conditions
-    assert isinstance(x, bool), "`x` must be of type `bool`"
-    assert is_n_bit_vector(sel, n=3), "`sel` must be a 3-tuple of `bool`s"
+    if checks:
+        assert isinstance(x, bool), "`x` must be of type `bool`"
+        assert is_n_bit_vector(sel, n=3), "`sel` must be a 3-tuple of `bool`s"
 
     # body
     x1, x2, x3, x4 = DMUX4WAY(x, sel=(sel[1], sel[2]))
@@ -325,6 +408,7 @@ def DMUX8WAY(
     )
 
     # post-conditions
-    assert is_n_bit_vector(out, n=8), "Output must be a 8-tuple of `bool`s"
+    if checks:
+        assert is_n_bit_vector(out, n=8), "Output must be a 8-tuple of `bool`s"
 
     return out
@@ -0,0 +1,203 @@
+"""The 16-bit gate family evaluated on native ints.
+
+Drop-in replacements for the 16-bit gates in `gates`: they take the same arguments
+(16-tuples of bools or `Word16`s) but evaluate with bitwise operators on the underlying
+ints and select multiplexer inputs by indexing, instead of looping over the scalar
+gates. 16-bit outputs are returned as `Word16`s, which compare equal to the reference
+outputs. `test_intgates.py` checks them against `gates`.
+
+Import them directly to use them at a single call site, or install `ENGINE` to use
+them everywhere, e.g. `with engines.using(intgates.ENGINE): ...`.
+"""
+
+from contracts import level
+from typing import Callable
+from utils import Word16, as_word, is_n_bit_vector, to_int
+
+
+def NOT16(xs: tuple[bool, ...]) -> Word16:
+    """16-bit Not."""
+    checks = level("intgates.NOT16")
+
+    # pre-conditions
+    if checks:
+        assert is_n_bit_vector(xs, n=16), "`xs` must be 16-tuple of `bool`s"
+
+    # body
+    out = Word16(to_int(xs) ^ 0xFFFF)
+
+    # post-conditions
+    if checks:
+        assert is_n_bit_vector(out, n=16), "Output must be 16-tuple of `bool`s"
+
+    return out
+
+
+def AND16(xs: tuple[bool, ...], ys: tuple[bool, ...]) -> Word16:
+    """16-bit And."""
+    checks = level("intgates.AND16")
+
+    # pre-conditions
+    if checks:
+        assert is_n_bit_vector(xs, n=16), "`xs` must be 16-tuple of `bool`s"
+        assert is_n_bit_vector(ys, n=16), "`ys` must be 16-tuple of `bool`s"
+
+    # body
+    out = Word16(to_int(xs) & to_int(ys))
+
+    # post-conditions
+    if checks:
+        assert is_n_bit_vector(out, n=16), "Output must be 16-tuple of `bool`s"
+
+    return out
+
+
+def OR16(xs: tuple[bool, ...], ys: tuple[bool, ...]) -> Word16:
+    """16-bit Or."""
+    checks = level("intgates.OR16")
+
+    # pre-conditions
+    if checks:
+        assert is_n_bit_vector(xs, n=16), "`xs` must be 16-tuple of `bool`s"
+        assert is_n_bit_vector(ys, n=16), "`ys` must be 16-tuple of `bool`s"
+
+    # body
+    out = Word16(to_int(xs) | to_int(ys))
+
+    # post-conditions
+    if checks:
+        assert is_n_bit_vector(out, n=16), "Output must be 16-tuple of `bool`s"
+
+    return out
+
+
+def MUX16(xs: tuple[bool, ...], ys: tuple[bool, ...], sel: bool) -> Word16:
+    """Selects between two 16-bit inputs."""
+    checks = level("intgates.MUX16")
+
+    # pre-conditions
+    if checks:
+        assert is_n_bit_vector(xs, n=16), "`xs` must be 16-tuple of `bool`s"
+        assert is_n_bit_vector(ys, n=16), "`ys` must be 16-tuple of `bool`s"
+        assert isinstance(sel, bool), "`sel` must be of type `bool`"
+
+    # body
+    out = as_word(ys if sel else xs)
+
+    # post-conditions
+    if checks:
+        assert is_n_bit_vector(out, n=16), "Output must be 16-tuple of `bool`s"
+
+    return out
+
+
+def OR8WAY(xs: tuple[bool, ...]) -> bool:
+    """8-way Or."""
+    checks = level("intgates.OR8WAY")
+
+    # pre-conditions
+    if checks:
+        assert is_n_bit_vector(xs, n=8), "`xs` must be an 8-tuple of `bool`s"
+
+    # body
+    out = True in xs
+
+    # post-conditions
+    if checks:
+        assert isinstance(out, bool), "Output must be of type `bool`"
+
+    return out
+
+
+def OR16WAY(xs: tuple[bool, ...]) -> bool:
+    """16-way Or."""
+    checks = level("intgates.OR16WAY")
+
+    # pre-conditions
+    if checks:
+        assert is_n_bit_vector(xs, n=16), "`xs` must be an 16-tuple of `bool`s"
+
+    # body
+    out = to_int(xs) != 0
+
+    # post-conditions
+    if checks:
+        assert isinstance(out, bool), "Output must be of type `bool`"
+
+    return out
+
+
+def MUX4WAY16(
+    xs: tuple[bool, ...],
+    ys: tuple[bool, ...],
+    zs: tuple[bool, ...],
+    ws: tuple[bool, ...],
+    sel: tuple[bool, ...],
+) -> Word16:
+    """Selects between four 16-bit inputs."""
+    checks = level("intgates.MUX4WAY16")
+
+    # pre-conditions
+    if checks:
+        assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(ys, n=16), "`ys` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(zs, n=16), "`zs` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(ws, n=16), "`ws` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(sel, n=2), "`sel` must be a 2-tuple of `bool`s"
+
+    # body
+    out = as_word((xs, ys, zs, ws)[sel[0] << 1 | sel[1]])
+
+    # post-conditions
+    if checks:
+        assert is_n_bit_vector(out, n=16), "Output must be 16-tuple of `bool`s"
+
+    return out
+
+
+def MUX8WAY16(
+    xs: tuple[bool, ...],
+    ys: tuple[bool, ...],
+    zs: tuple[bool, ...],
+    ws: tuple[bool, ...],
+    us: tuple[bool, ...],
+    vs: tuple[bool, ...],
+    ms: tuple[bool, ...],
+    ns: tuple[bool, ...],
+    sel: tuple[bool, ...],
+) -> Word16:
+    """Selects between eight 16-bit inputs."""
+    checks = level("intgates.MUX8WAY16")
+
+    # pre-conditions
+    if checks:
+        assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(ys, n=16), "`ys` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(zs, n=16), "`zs` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(ws, n=16), "`ws` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(us, n=16), "`us` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(vs, n=16), "`vs` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(ms, n=16), "`ms` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(ns, n=16), "`ns` must be a 16-tuple of `bool`s"
+        assert is_n_bit_vector(sel, n=3), "`sel` must be a 3-tuple of `bool`s"
+
+    # body
+    out = as_word((xs, ys, zs, ws, us, vs, ms, ns)[sel[0] << 2 | sel[1] << 1 | sel[2]])
+
+    # post-conditions
+    if checks:
+        assert is_n_bit_vector(out, n=16), "Output must be 16-tuple of `bool`s"
+
+    return out
+
+
+ENGINE: dict[str, Callable] = {
+    "gates.NOT16": NOT16,
+    "gates.AND16": AND16,
+    "gates.OR16": OR16,
+    "gates.MUX16": MUX16,
+    "gates.OR8WAY": OR8WAY,
+    "gates.OR16WAY": OR16WAY,
+    "gates.MUX4WAY16": MUX4WAY16,
+    "gates.MUX8WAY16": MUX8WAY16,
+}
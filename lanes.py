@@ -0,0 +1,309 @@
+"""Bit-sliced simulation of many independent instances at once.
+
+In lane mode every wire carries a Python int whose bit `k` is the wire's value in
+instance `k`, and the primitive gates in `gates` become bitwise operators on those ints.
+Everything built from the primitives (the 16-bit gates, the adders, the ALU, the
+registers and the CPU) then runs unchanged on tuples of lane ints, so `count` instances
+cost about as much as one. The word-level shortcuts on `Word16` are never taken,
+because lane inputs are plain tuples.
+
+The constant `True` stands for "1 in every instance" and `False` for "0 in every
+instance", so constants inside the components, e.g. the one in `INC16`, keep their
+meaning. Contract checks are switched off in lane mode: they assume `bool`s.
+
+    with lanes.simulate(count):
+        out = arithmetic.ADD16(lanes.pack(xs), lanes.pack(ys))
+
+    words = lanes.unpack(out, count)
+
+`apply` wraps the round trip for any component on 16-bit words, and `add16`, `alu` and
+`cpu` wrap the common cases.
+
+A few reference components compute on `bool`s directly, with `not`, `and` and `or`, e.g.
+`gates.NOT16` and the carry of `arithmetic.FULLADDER`. `STRUCTURE` replaces them with the
+same circuits built from the primitive gates, so they run on lanes too; the reference
+implementations are left as they are. `netlist` traces through `STRUCTURE` as well.
+"""
+
+import arithmetic
+import contracts
+import engines
+import gates
+
+from arithmetic import ADD16, ALU
+from computer import CPU
+from contextlib import contextmanager
+from typing import Callable, Iterator, Sequence
+
+
+# All instances set, i.e. the lane value of the constant `True`
+_MASK = 0
+
+
+def AND(x: int, y: int) -> int:
+    """And gate over lanes."""
+    return (_MASK if x is True else x) & (_MASK if y is True else y)
+
+
+def OR(x: int, y: int) -> int:
+    """Or gate over lanes."""
+    return (_MASK if x is True else x) | (_MASK if y is True else y)
+
+
+def NOT(x: int) -> int:
+    """Not gate over lanes."""
+    return _MASK ^ (_MASK if x is True else x)
+
+
+def NAND(x: int, y: int) -> int:
+    """Nand gate over lanes."""
+    return _MASK ^ ((_MASK if x is True else x) & (_MASK if y is True else y))
+
+
+def XOR(x: int, y: int) -> int:
+    """Xor gate over lanes."""
+    return (_MASK if x is True else x) ^ (_MASK if y is True else y)
+
+
+def MUX(x: int, y: int, sel: int) -> int:
+    """Selects between two inputs in every lane."""
+    x = _MASK if x is True else x
+    y = _MASK if y is True else y
+    sel = _MASK if sel is True else sel
+
+    return x ^ ((x ^ y) & sel)
+
+
+def DMUX(x: int, sel: int) -> tuple[int, int]:
+    """Channels the input to one out of two outputs in every lane."""
+    x = _MASK if x is True else x
+    sel = _MASK if sel is True else sel
+
+    return x & (_MASK ^ sel), x & sel
+
+
+def _NOT16(xs: tuple) -> tuple:
+    return tuple(gates.NOT(x) for x in xs)
+
+
+def _AND16(xs: tuple, ys: tuple) -> tuple:
+    return tuple(gates.AND(x, y) for x, y in zip(xs, ys))
+
+
+def _OR16(xs: tuple, ys: tuple) -> tuple:
+    return tuple(gates.OR(x, y) for x, y in zip(xs, ys))
+
+
+def _OR8WAY(xs: tuple) -> object:
+    out = xs[7]
+
+    for x in xs[6::-1]:
+        out = gates.OR(x, out)
+
+    return out
+
+
+def _MUX4WAY16(xs: tuple, ys: tuple, zs: tuple, ws: tuple, sel: tuple) -> tuple:
+    return gates.MUX16(
+        gates.MUX16(
+            gates.MUX16(xs, ys, gates.AND(gates.NOT(sel[0]), sel[1])),
+            zs,
+            gates.AND(sel[0], gates.NOT(sel[1])),
+        ),
+        ws,
+        gates.AND(sel[0], sel[1]),
+    )
+
+
+def _DMUX4WAY(x: object, sel: tuple) -> tuple:
+    x1, x2 = gates.DMUX(x, sel[1])
+    x3, x4 = gates.DMUX(x, sel[1])
+    hi, lo = gates.NOT(sel[0]), gates.NOT(sel[1])
+
+    return (
+        gates.AND(gates.AND(hi, lo), x1),
+        gates.AND(gates.AND(hi, sel[1]), x2),
+        gates.AND(gates.AND(sel[0], lo), x3),
+        gates.AND(gates.AND(sel[0], sel[1]), x4),
+    )
+
+
+def _DMUX8WAY(x: object, sel: tuple) -> tuple:
+    lows = gates.DMUX4WAY(x, sel=(sel[1], sel[2]))
+    highs = gates.DMUX4WAY(x, sel=(sel[1], sel[2]))
+    hi = gates.NOT(sel[0])
+
+    return tuple(gates.AND(hi, x) for x in lows) + tuple(gates.AND(sel[0], x) for x in highs)
+
+
+def _FULLADDER(x: object, y: object, carry: object) -> tuple:
+    fst_sum, fst_carry = arithmetic.HALFADDER(x, y)
+    snd_sum, snd_carry = arithmetic.HALFADDER(fst_sum, carry)
+
+    return snd_sum, gates.OR(fst_carry, snd_carry)
+
+
+# The reference components that compute on `bool`s, as circuits of the primitive gates
+STRUCTURE: dict[str, Callable] = {
+    "gates.NOT16": _NOT16,
+    "gates.AND16": _AND16,
+    "gates.OR16": _OR16,
+    "gates.OR8WAY": _OR8WAY,
+    "gates.MUX4WAY16": _MUX4WAY16,
+    "gates.DMUX4WAY": _DMUX4WAY,
+    "gates.DMUX8WAY": _DMUX8WAY,
+    "arithmetic.FULLADDER": _FULLADDER,
+}
+
+ENGINE: dict[str, Callable] = {
+    **STRUCTURE,
+    "gates.AND": AND,
+    "gates.OR": OR,
+    "gates.NOT": NOT,
+    "gates.NAND": NAND,
+    "gates.XOR": XOR,
+    "gates.MUX": MUX,
+    "gates.DMUX": DMUX,
+}
+
+
+@contextmanager
+def simulate(count: int) -> Iterator[None]:
+    """Runs the components on `count` lanes: installs `ENGINE` and switches off the contract checks."""
+    global _MASK
+
+    # pre-conditions
+    assert isinstance(count, int) and count >= 1, "`count` must be a positive integer"
+
+    # body
+    saved = _MASK
+    _MASK = (1 << count) - 1
+
+    try:
+        with contracts.policy("off"), contracts.policy("off", *engines.MODULES):
+            with engines.using(ENGINE):
+                yield
+    finally:
+        _MASK = saved
+
+
+def pack(words: Sequence[int], n: int = 16) -> tuple[int, ...]:
+    """Transposes `n`-bit words, one per instance, into `n` lanes, most significant bit first."""
+    # pre-conditions
+    assert all(0 <= w < 2**n for w in words), f"`words` must be {n}-bit words"
+
+    # body
+    # transposed through binary strings, which is much faster than summing shifted ints for
+    # many lanes; instance 0 is the least significant bit of every lane
+    rows = [format(w, f"0{n}b") for w in reversed(words)]
+    out = tuple(int("".join(column), 2) for column in zip(*rows)) if rows else (0,) * n
+
+    # post-conditions
+    assert len(out) == n, f"output must have {n} lanes"
+
+    return out
+
+
+def pack_bits(bits: Sequence[bool]) -> int:
+    """Packs one bit per instance into a single lane."""
+    return sum(1 << k for k, b in enumerate(bits) if b)
+
+
+def unpack(lanes: Sequence[int], count: int) -> list[int]:
+    """Transposes `n` lanes, most significant bit first, back into `count` words."""
+    if not lanes:
+        return [0] * count
+
+    mask = (1 << count) - 1
+    columns = [format(mask if lane is True else int(lane) & mask, f"0{count}b") for lane in lanes]
+
+    return [int("".join(row), 2) for row in zip(*columns)][::-1]
+
+
+def unpack_bits(lane: int, count: int) -> list[bool]:
+    """Unpacks a single lane into one bit per instance."""
+    lane = (1 << count) - 1 if lane is True else int(lane)
+    return [bool((lane >> k) & 1) for k in range(count)]
+
+
+def apply(fn: Callable, *args: Sequence[int]) -> list[int]:
+    """Runs `fn`, from 16-bit words to a 16-bit word, on one row of `args` per instance."""
+    # pre-conditions
+    assert args and len(args[0]) >= 1, "`args` must be non-empty"
+    assert all(len(a) == len(args[0]) for a in args), "`args` must be of equal length"
+
+    # body
+    count = len(args[0])
+
+    with simulate(count):
+        out = unpack(fn(*map(pack, args)), count)
+
+    return out
+
+
+def add16(xs: Sequence[int], ys: Sequence[int]) -> list[int]:
+    """Adds up pairs of 16-bit words through `arithmetic.ADD16`, one instance per pair."""
+    # pre-conditions
+    assert len(xs) == len(ys) >= 1, "`xs` and `ys` must be non-empty and of equal length"
+
+    # body
+    return apply(ADD16, xs, ys)
+
+
+def alu(
+    xs: Sequence[int], ys: Sequence[int], controls: Sequence[int]
+) -> tuple[list[int], list[bool], list[bool]]:
+    """Runs `arithmetic.ALU` on one `(x, y, control)` triple per instance. Controls are the 6-bit words `zx nx zy ny f no`."""
+    # pre-conditions
+    assert len(xs) == len(ys) == len(controls) >= 1, "inputs must be non-empty and of equal length"
+
+    # body
+    count = len(xs)
+
+    with simulate(count):
+        out, zr, ng = ALU(pack(xs), pack(ys), *pack(controls, n=6))
+        out = unpack(out, count), unpack_bits(zr, count), unpack_bits(ng, count)
+
+    return out
+
+
+def cpu(
+    instructions: Sequence[Sequence[int]],
+    in_m: Sequence[Sequence[int]],
+    reset: Sequence[Sequence[bool]] | None = None,
+) -> list[dict[str, int | bool]]:
+    """
+    Clocks one `CPU` per instance through a sequence of cycles.
+
+    Args:
+        instructions: for every cycle, the instruction of each instance
+        in_m: for every cycle, the `in_m` word of each instance
+        reset: for every cycle, the reset bit of each instance; never set if omitted
+
+    Returns:
+        for every instance, its outputs and registers after the last cycle
+    """
+    # pre-conditions
+    assert len(instructions) == len(in_m) >= 1, "every cycle must have instructions and `in_m`"
+    assert all(
+        len(i) == len(m) == len(instructions[0]) for i, m in zip(instructions, in_m)
+    ), "every cycle must have the same number of instances"
+
+    # body
+    count = len(instructions[0])
+    resets = reset or [[False] * count] * len(instructions)
+    state = CPU.create()
+
+    with simulate(count):
+        for instruction, m, r in zip(instructions, in_m, resets):
+            state = state(pack(instruction), pack(m), pack_bits(r))
+
+        fields = {
+            "out_m": unpack(state.out_m, count),
+            "write_m": unpack_bits(state.write_m, count),
+            "a": unpack(state.a_register.out, count),
+            "d": unpack(state.d_register.out, count),
+            "pc": unpack(state.pc.out, count),
+        }
+
+    return [{name: values[k] for name, values in fields.items()} for k in range(count)]
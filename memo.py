@@ -0,0 +1,198 @@
+"""Memoisation of the combinational arithmetic components.
+
+Hack programs spend their time in tight loops, so the same inputs reach `ALU`, `ADD16`
+and `INC16` over and over: loop counters, pointer increments and comparisons against
+constants. While `memoising` is active, calls of these components go through a bounded
+least-recently-used cache per component, keyed on the inputs packed into one int, and
+only misses run the gates:
+
+    with memo.memoising(capacity=1_024) as caches:
+        for _ in range(cycles):
+            computer = computer(reset=False)
+
+    print(memo.table(caches))
+
+Memoising installs wrappers of the currently installed components as an engine (see
+`engines`), so it works on top of other engines and costs nothing outside `memoising`. The wrappers
+check the pre-conditions of the components before every lookup, so an invalid input fails
+as it does without a cache instead of hitting the entry of a valid one.
+The components are pure functions of their inputs, so a hit returns the output of the
+call that filled the entry, which is equal to the output the call would return. Inputs
+that are `Word16`s and tuples are cached apart, so outputs keep the types of the
+reference.
+
+With checks off (`python benchmarks.py memo`) a gate-level ALU call that hits is ~26x
+faster, one that misses ~20% slower, and a `CPU` cycle of a countdown loop ~1.6x faster.
+"""
+
+import argparse
+import arithmetic
+import computer
+import contracts
+import engines
+import json
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from contracts import level
+from dataclasses import dataclass, field
+from stimulus import Stimulus, to_bits
+from typing import Any, Callable, Iterator, Sequence
+from utils import Word16, is_n_bit_vector, to_int
+
+
+# The memoised components of `arithmetic`
+COMPONENTS = ["ALU", "ADD16", "INC16"]
+
+
+@dataclass
+class Cache:
+    """A bounded least-recently-used map from packed inputs to outputs, with counters."""
+
+    capacity: int
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: OrderedDict[int, Any] = field(default_factory=OrderedDict, repr=False)
+
+    def __post_init__(self) -> None:
+        assert isinstance(self.capacity, int) and self.capacity >= 1, "`capacity` must be positive"
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups that hit, 0 before the first lookup."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def lookup(self, key: int, compute: Callable[[], Any]) -> Any:
+        """The output cached under `key`, computed and cached first on a miss."""
+        entries = self.entries
+        out = entries.get(key)
+
+        if out is not None:  # outputs are never `None`
+            entries.move_to_end(key)
+            self.hits += 1
+            return out
+
+        self.misses += 1
+        out = entries[key] = compute()
+
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+        return out
+
+    def to_dict(self) -> dict[str, int | float]:
+        """The counters as a JSON-serialisable `dict`."""
+        return {
+            "capacity": self.capacity,
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+
+def _words(xs: tuple[bool, ...], ys: tuple[bool, ...]) -> int:
+    """`xs` and `ys` packed into one int, with a low bit that is set if either is a `Word16`."""
+    return (to_int(xs) << 16 | to_int(ys)) << 1 | (type(xs) is Word16 or type(ys) is Word16)
+
+
+def engine(caches: dict[str, Cache]) -> dict[str, Callable]:
+    """An engine that memoises the currently installed components named in `caches`."""
+    # pre-conditions
+    assert set(caches) <= set(COMPONENTS), f"`caches` must be keyed by some of {COMPONENTS}"
+
+    # body
+    alu, add16, inc16 = (getattr(arithmetic, name) for name in COMPONENTS)
+
+    def ALU(xs, ys, zx, nx, zy, ny, f, no):  # type: ignore
+        # pre-conditions
+        if level("memo.ALU"):
+            assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
+            assert is_n_bit_vector(ys, n=16), "`ys` must be a 16-tuple of `bool`s"
+            assert all(
+                isinstance(c, bool) for c in (zx, nx, zy, ny, f, no)
+            ), "the controls must be `bool`s"
+
+        # body
+        key = _words(xs, ys) << 6 | zx << 5 | nx << 4 | zy << 3 | ny << 2 | f << 1 | no
+        return caches["ALU"].lookup(key, lambda: alu(xs, ys, zx, nx, zy, ny, f, no))
+
+    def ADD16(xs, ys):  # type: ignore
+        # pre-conditions
+        if level("memo.ADD16"):
+            assert is_n_bit_vector(xs, n=16), "`x` must be a 16-tuple of `bool`s"
+            assert is_n_bit_vector(ys, n=16), "`y` must be a 16-tuple of `bool`s"
+
+        # body
+        return caches["ADD16"].lookup(_words(xs, ys), lambda: add16(xs, ys))
+
+    def INC16(xs):  # type: ignore
+        # pre-conditions
+        if level("memo.INC16"):
+            assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
+
+        # body
+        key = to_int(xs) << 1 | (type(xs) is Word16)
+        return caches["INC16"].lookup(key, lambda: inc16(xs))
+
+    wrappers = {"ALU": ALU, "ADD16": ADD16, "INC16": INC16}
+
+    return {f"arithmetic.{name}": wrappers[name] for name in caches}
+
+
+@contextmanager
+def memoising(
+    capacity: int = 4_096, components: Sequence[str] = COMPONENTS
+) -> Iterator[dict[str, Cache]]:
+    """Memoises `components` within the block, in caches of `capacity` entries that it yields."""
+    caches = {name: Cache(capacity) for name in components}
+
+    with engines.using(engine(caches)):
+        yield caches
+
+
+def table(caches: dict[str, Cache]) -> str:
+    """The counters of `caches` as a text table."""
+    lines = [
+        f"{'component':<10} {'capacity':>9} {'size':>9} {'hits':>10} {'misses':>10}"
+        f" {'evictions':>10} {'hit rate':>9}"
+    ]
+
+    for name, c in caches.items():
+        lines.append(
+            f"{name:<10} {c.capacity:>9,} {len(c.entries):>9,} {c.hits:>10,} {c.misses:>10,}"
+            f" {c.evictions:>10,} {c.hit_rate:>9.1%}"
+        )
+
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Cache hit rates over cycles of a `Computer` running a random program, with checks off."
+    )
+    parser.add_argument("--cycles", type=int, default=16)
+    parser.add_argument("--capacity", type=int, default=4_096)
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    program = tuple(to_bits(Stimulus(seed=0).instructions(64)))
+    state = computer.Computer.create(program)
+
+    # random programs address words past the memory map, which the checks reject
+    with contracts.policy("off"), memoising(args.capacity) as caches:
+        for cycle in range(args.cycles):
+            state = state(reset=cycle == 0)
+
+    if args.json:
+        print(json.dumps({name: c.to_dict() for name, c in caches.items()}, indent=2))
+    else:
+        print(table(caches))
+
+
+if __name__ == "__main__":
+    main()
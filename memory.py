@@ -1,62 +1,88 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from gates import MUX, MUX16, MUX4WAY16, MUX8WAY16, DMUX, DMUX4WAY, DMUX8WAY
 from arithmetic import INC16
-from utils import is_n_bit_vector, to_int
+from contracts import FULL, level, peek
+from utils import Word16, is_n_bit_vector, to_int
 
 ZERO16 = (False,) * 16
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DFF:
     """A data flip-flop gate that stores a single bit from the previous timestep. This should be called on the edge of each clock signal. This is a primitive component."""
 
     out: bool
 
     def __post_init__(self) -> None:
-        assert isinstance(self.out, bool), "`self.out` must be a `bool`"
+        if peek("memory.DFF"):
+            assert isinstance(self.out, bool), "`self.out` must be a `bool`"
 
     def __call__(self, x: bool) -> "DFF":
+        checks = level("memory.DFF")
+
         # pre-conditions
-        assert isinstance(x, bool), "`x` must be a `bool`"
+        if checks:
+            assert isinstance(x, bool), "`x` must be a `bool`"
 
         # body
-        new_dff = DFF(x)
+        new_dff = _interned_dff(x)
 
         # post-conditions
-        assert isinstance(new_dff, DFF), "`out` must be a `DFF`"
-        assert new_dff.out == x, "dff must store `x`"
+        if checks:
+            assert isinstance(new_dff, DFF), "`out` must be a `DFF`"
+            assert new_dff.out == x, "dff must store `x`"
 
         return new_dff
 
 
-@dataclass(frozen=True)
+_DFF_FALSE, _DFF_TRUE = DFF(False), DFF(True)
+
+
+def _interned_dff(x: bool) -> DFF:
+    """Returns the canonical `DFF` storing `x`. Identity checks keep non-`bool` values out of the cache."""
+    if x is True:
+        return _DFF_TRUE
+
+    if x is False:
+        return _DFF_FALSE
+
+    return DFF(x)
+
+
+@dataclass(frozen=True, slots=True)
 class BIT:
     """A 1-bit register."""
 
     dff: DFF
 
     def __post_init__(self) -> None:
-        assert isinstance(self.dff, DFF), "`dff` must be a `DFF`"
+        if peek("memory.BIT"):
+            assert isinstance(self.dff, DFF), "`dff` must be a `DFF`"
 
     def __call__(self, x: bool, load: bool) -> "BIT":
+        checks = level("memory.BIT")
+
         # pre-conditions
-        assert isinstance(x, bool), "`x` must be a `bool`"
-        assert isinstance(load, bool), "`load` must be a `bool`"
+        if checks:
+            assert isinstance(x, bool), "`x` must be a `bool`"
+            assert isinstance(load, bool), "`load` must be a `bool`"
 
         # body
         old_x = self.dff.out
         new_x = MUX(old_x, x, load)
         new_dff = self.dff(new_x)
-        new_bit = BIT(new_dff)
+        new_bit = _interned_bit(new_dff)
 
         # post-conditions
-        assert isinstance(new_bit, BIT), "`new_bit` must be a `BIT`"
+        if checks:
+            assert isinstance(new_bit, BIT), "`new_bit` must be a `BIT`"
 
-        if load:
-            assert new_bit.out == x, "new value must be stored when load=1"
+        if checks == FULL:
+            if load:
+                assert new_bit.out == x, "new value must be stored when load=1"
 
-        if not load:
-            assert new_bit.out == old_x, "old value must be kept when load=0"
+            if not load:
+                assert new_bit.out == old_x, "old value must be kept when load=0"
 
         return new_bit
 
@@ -65,37 +91,63 @@ class BIT:
         return self.dff.out
 
 
-@dataclass(frozen=True)
+_BIT_FALSE, _BIT_TRUE = BIT(_DFF_FALSE), BIT(_DFF_TRUE)
+
+
+def _interned_bit(dff: DFF) -> BIT:
+    """Returns the canonical `BIT` wrapping `dff` if `dff` is canonical."""
+    if dff is _DFF_TRUE:
+        return _BIT_TRUE
+
+    if dff is _DFF_FALSE:
+        return _BIT_FALSE
+
+    return BIT(dff)
+
+
+@dataclass(frozen=True, slots=True)
 class REGISTER16:
     """A 16-bit register."""
 
     bits: tuple[BIT, ...]
+    _word: Word16 | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
-        assert all(isinstance(b, BIT) for b in self.bits), "`bits` must be `BIT`s"
-        assert len(self.bits) == 16, "`bits` must be a 16-tuple of `BIT`s"
+        if peek("memory.REGISTER16"):
+            assert all(isinstance(b, BIT) for b in self.bits), "`bits` must be `BIT`s"
+            assert len(self.bits) == 16, "`bits` must be a 16-tuple of `BIT`s"
 
     def __call__(self, xs: tuple[bool, ...], load: bool) -> "REGISTER16":
+        checks = level("memory.REGISTER16")
+
         # pre-conditions
-        assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
-        assert isinstance(load, bool), "`load` must be a `bool`"
+        if checks:
+            assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
+            assert isinstance(load, bool), "`load` must be a `bool`"
 
         # body
-        new_bits = tuple(bit(x, load) for bit, x in zip(self.bits, xs))
-        new_register = REGISTER16(new_bits)
+        if type(xs) is Word16:
+            # the word-level fast path: no gates, and a kept value is the register itself
+            new_register = self if load is False else REGISTER16.from_word(xs)
+        else:
+            # every bit is clocked through its gates, loaded or not
+            new_bits = tuple(bit(x, load) for bit, x in zip(self.bits, xs))
+            new_register = self if load is False else _interned_register(new_bits)
 
         # post-conditions
-        assert isinstance(
-            new_register, REGISTER16
-        ), "`new_register` must be a `REGISTER16`"
+        if checks:
+            assert isinstance(
+                new_register, REGISTER16
+            ), "`new_register` must be a `REGISTER16`"
 
-        if load:
-            assert all(
-                b.out == v for b, v in zip(new_register.bits, xs)
-            ), "new value must be stored when load=1"
+        if checks == FULL:
+            if load:
+                assert all(
+                    b.out == v for b, v in zip(new_register.bits, xs)
+                ), "new value must be stored when load=1"
 
-        if not load:
-            assert self.out == new_register.out, "old value must be kept when load=0"
+            if not load:
+                assert new_register is self, "old value must be kept when load=0"
 
         return new_register
 
@@ -103,46 +155,97 @@ class REGISTER16:
     def out(self) -> tuple[bool, ...]:
         return tuple(b.out for b in self.bits)
 
+    @property
+    def digest(self) -> int:
+        """A hash of the stored value: the leaves of the RAM Merkle trees."""
+        return self.word.value
+
+    @property
+    def word(self) -> Word16:
+        """The stored value as a `Word16`."""
+        if self._word is None:
+            object.__setattr__(self, "_word", Word16.from_bits(self.out))
+
+        return self._word  # type: ignore
+
+    @staticmethod
+    def from_word(xs: Word16) -> "REGISTER16":
+        """Creates a new 16-bit register storing `xs`."""
+        checks = peek("memory.REGISTER16")
+
+        # pre-conditions
+        if checks:
+            assert type(xs) is Word16, "`xs` must be a `Word16`"
+
+        # body
+        register = _REGISTERS.get(xs.value)
+
+        if register is None:
+            register = REGISTER16(tuple(_BIT_TRUE if x else _BIT_FALSE for x in xs.bits))
+            object.__setattr__(register, "_word", xs)
+            _REGISTERS[xs.value] = register
+
+        # post-conditions
+        if checks:
+            assert register.out == xs, "`register` must store `xs`"
+
+        return register
+
     @staticmethod
     def create() -> "REGISTER16":
         """Creates a new 16-bit register with all bits set to 0."""
-        dffs = tuple(DFF(False) for _ in range(16))
-        bits = tuple(BIT(dff) for dff in dffs)
-        register = REGISTER16(bits)
+        checks = peek("memory.REGISTER16")
+
+        register = REGISTER16.from_word(Word16(0))
 
         # post-conditions
-        assert isinstance(register, REGISTER16), "`register` must be a `REGISTER16`"
-        assert all(
-            isinstance(b, BIT) for b in register.bits
-        ), "`register.bits` must be a 16-tuple of `BIT`s"
-        assert all(
-            isinstance(b.dff, DFF) for b in register.bits
-        ), "`register.bits` must be a 16-tuple of `BIT`s"
-        assert all(
-            isinstance(b.dff.out, bool) for b in register.bits
-        ), "`register.bits` must be a 16-tuple of `BIT`s"
-        assert all(
-            b.dff.out == False for b in register.bits
-        ), "`register.bits` must be a 16-tuple of `BIT`s"
+        if checks:
+            assert isinstance(register, REGISTER16), "`register` must be a `REGISTER16`"
+            assert all(
+                isinstance(b, BIT) for b in register.bits
+            ), "`register.bits` must be a 16-tuple of `BIT`s"
+            assert all(
+                isinstance(b.dff, DFF) for b in register.bits
+            ), "`register.bits` must be a 16-tuple of `BIT`s"
+            assert all(
+                isinstance(b.dff.out, bool) for b in register.bits
+            ), "`register.bits` must be a 16-tuple of `BIT`s"
+            assert all(
+                b.dff.out == False for b in register.bits
+            ), "`register.bits` must be a 16-tuple of `BIT`s"
 
         return register
 
 
-@dataclass(frozen=True)
+# Canonical registers by value, filled lazily and bounded by the 2^16 possible values
+_REGISTERS: dict[int, REGISTER16] = {}
+
+
+def _interned_register(bits: tuple[BIT, ...]) -> REGISTER16:
+    """Returns the canonical `REGISTER16` storing `bits` if every bit is canonical."""
+    if not all(b is _BIT_TRUE or b is _BIT_FALSE for b in bits):
+        return REGISTER16(bits)
+
+    return REGISTER16.from_word(Word16(to_int(tuple(b is _BIT_TRUE for b in bits))))
+
+
+@dataclass(frozen=True, slots=True)
 class RAM8:
     """8-register memory, each 16-bits."""
 
     registers: tuple[REGISTER16, ...]
     out: tuple[bool, ...]
+    _digest: int | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
-        assert all(
-            isinstance(r, REGISTER16) for r in self.registers
-        ), "`registers` must be a tuple of `REGISTER16`s"
-        assert (
-            len(self.registers) == 8
-        ), "`registers` must be a 8-tuple of `REGISTER16`s"
-        assert is_n_bit_vector(self.out, n=16), "`out` must be a 16-tuple of `bool`s"
+        if peek("memory.RAM8"):
+            assert all(
+                isinstance(r, REGISTER16) for r in self.registers
+            ), "`registers` must be a tuple of `REGISTER16`s"
+            assert (
+                len(self.registers) == 8
+            ), "`registers` must be a 8-tuple of `REGISTER16`s"
+            assert is_n_bit_vector(self.out, n=16), "`out` must be a 16-tuple of `bool`s"
 
     def __call__(
         self,
@@ -150,69 +253,106 @@ class RAM8:
         load: bool,
         address: tuple[bool, ...],
     ) -> "RAM8":
+        checks = level("memory.RAM8")
+
         # pre-conditions
-        assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
-        assert isinstance(load, bool), "`load` must be a `bool`"
-        assert is_n_bit_vector(address, n=3), "`address` must be a 3-tuple of `bool`s"
+        if checks:
+            assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
+            assert isinstance(load, bool), "`load` must be a `bool`"
+            assert is_n_bit_vector(address, n=3), "`address` must be a 3-tuple of `bool`s"
 
         # body
         load_bits = DMUX8WAY(load, address)
         new_registers = tuple(r(xs, load_bits[i]) for i, r in enumerate(self.registers))
-        new_out = MUX8WAY16(*[r.out for r in new_registers], sel=address)  # type: ignore
+
+        if type(xs) is Word16:
+            new_out = MUX8WAY16(*[r.word for r in new_registers], sel=address)  # type: ignore
+        else:
+            new_out = MUX8WAY16(*[r.out for r in new_registers], sel=address)  # type: ignore
         new_ram8 = RAM8(new_registers, new_out)
 
-        # post-conditions
-        assert isinstance(new_ram8, RAM8), "`new_ram8` must be a `RAM8`"
-        assert all(
-            isinstance(r, REGISTER16) for r in new_ram8.registers
-        ), "`new_ram8.registers` must be an 8-tuple of `REGISTER16`s"
+        if load is False:
+            # the contents are unchanged, so the cached digest carries over
+            object.__setattr__(new_ram8, "_digest", self._digest)
 
-        if load:
-            address_idx = to_int(address)
-            selected_register = new_ram8.registers[address_idx]
+        # post-conditions
+        if checks:
+            assert isinstance(new_ram8, RAM8), "`new_ram8` must be a `RAM8`"
             assert all(
-                v == x for v, x in zip(selected_register.out, xs)
-            ), "new value must be stored when load=1"
-
-        if not load:
-            assert new_ram8.state == self.state, "old value must be kept when load=0"
+                isinstance(r, REGISTER16) for r in new_ram8.registers
+            ), "`new_ram8.registers` must be an 8-tuple of `REGISTER16`s"
+
+        if checks == FULL:
+            if load:
+                address_idx = to_int(address)
+                selected_register = new_ram8.registers[address_idx]
+                assert all(
+                    v == x for v, x in zip(selected_register.out, xs)
+                ), "new value must be stored when load=1"
+
+            if not load:
+                assert (
+                    new_ram8._merkle_hash() == self.digest
+                ), "old value must be kept when load=0"
 
         return new_ram8
 
     @property
     def state(self) -> tuple[tuple[bool, ...], ...]:
-        return tuple(r.out for r in self.registers)
+        return tuple(r.word for r in self.registers)
+
+    @property
+    def digest(self) -> int:
+        """A Merkle hash of `state`, cached and computed from the digests of the children."""
+        if self._digest is None:
+            object.__setattr__(self, "_digest", self._merkle_hash())
+
+        return self._digest  # type: ignore
+
+    def _merkle_hash(self) -> int:
+        return hash((8, *(r.digest for r in self.registers)))
+
+    def read(self, address_idx: int) -> tuple[bool, ...]:
+        """Returns the register value at `address_idx` without materialising `state`."""
+        return self.registers[address_idx].word
 
     @staticmethod
     def create() -> "RAM8":
         """Creates a new 8-register memory with all bits set to 0."""
+        checks = peek("memory.RAM8")
+
         registers = tuple(REGISTER16.create() for _ in range(8))
         out = ZERO16
         ram8 = RAM8(registers, out)
 
         # post-conditions
-        assert isinstance(ram8, RAM8), "`ram8` must be a `RAM8`"
-        assert all(
-            s == ZERO16 for s in ram8.state
-        ), "`ram8.state` must be a 8-tuple of 16-tuples of `bool`s"
-        assert ram8.out == ZERO16, "`ram8.out` must be a 16-tuple of `bool`s"
+        if checks:
+            assert isinstance(ram8, RAM8), "`ram8` must be a `RAM8`"
+            assert ram8.out == ZERO16, "`ram8.out` must be a 16-tuple of `bool`s"
+
+        if checks == FULL:
+            assert all(
+                s == ZERO16 for s in ram8.state
+            ), "`ram8.state` must be a 8-tuple of 16-tuples of `bool`s"
 
         return ram8
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RAM64:
     """64-register memory, each 16-bits."""
 
     ram8s: tuple[RAM8, ...]
     out: tuple[bool, ...]
+    _digest: int | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
-        assert all(
-            isinstance(r, RAM8) for r in self.ram8s
-        ), "`ram8s` must be a tuple of `RAM8`s"
-        assert len(self.ram8s) == 8, "`ram8s` must be a 8-tuple of `RAM8`s"
-        assert is_n_bit_vector(self.out, n=16), "`out` must be a 16-tuple of `bool`s"
+        if peek("memory.RAM64"):
+            assert all(
+                isinstance(r, RAM8) for r in self.ram8s
+            ), "`ram8s` must be a tuple of `RAM8`s"
+            assert len(self.ram8s) == 8, "`ram8s` must be a 8-tuple of `RAM8`s"
+            assert is_n_bit_vector(self.out, n=16), "`out` must be a 16-tuple of `bool`s"
 
     def __call__(
         self,
@@ -220,10 +360,13 @@ class RAM64:
         load: bool,
         address: tuple[bool, ...],
     ) -> "RAM64":
+        checks = level("memory.RAM64")
+
         # pre-conditions
-        assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
-        assert isinstance(load, bool), "`load` must be a `bool`"
-        assert is_n_bit_vector(address, n=6), "`address` must be a 6-tuple of `bool`s"
+        if checks:
+            assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
+            assert isinstance(load, bool), "`load` must be a `bool`"
+            assert is_n_bit_vector(address, n=6), "`address` must be a 6-tuple of `bool`s"
 
         # body
         load_bits = DMUX8WAY(load, address[:3])
@@ -233,27 +376,35 @@ class RAM64:
         new_out = MUX8WAY16(*[r.out for r in new_ram8s], sel=address[:3])  # type: ignore
         new_ram64 = RAM64(new_ram8s, new_out)
 
-        # post-conditions
-        assert isinstance(new_ram64, RAM64), "`new_ram64` must be a `RAM64`"
-        assert all(
-            isinstance(r, RAM8) for r in new_ram64.ram8s
-        ), "`new_ram64.ram8s` must be an 8-tuple of `RAM8`s"
-
-        if load:
-            address_idx = to_int(address)
-            assert (
-                new_ram64.state[address_idx] == xs
-            ), "new value must be stored when load=1"
-            assert (
-                new_ram64.out == xs
-            ), "new value must be returned as `out` when load=1"
+        if load is False:
+            # the contents are unchanged, so the cached digest carries over
+            object.__setattr__(new_ram64, "_digest", self._digest)
 
-        if not load:
-            address_idx = to_int(address)
-            assert self.state == new_ram64.state, "old value must be kept when load=0"
-            assert (
-                new_ram64.out == self.state[address_idx]
-            ), "old value must be returned as `out` when load=0"
+        # post-conditions
+        if checks:
+            assert isinstance(new_ram64, RAM64), "`new_ram64` must be a `RAM64`"
+            assert all(
+                isinstance(r, RAM8) for r in new_ram64.ram8s
+            ), "`new_ram64.ram8s` must be an 8-tuple of `RAM8`s"
+
+        if checks == FULL:
+            if load:
+                address_idx = to_int(address)
+                assert (
+                    new_ram64.read(address_idx) == xs
+                ), "new value must be stored when load=1"
+                assert (
+                    new_ram64.out == xs
+                ), "new value must be returned as `out` when load=1"
+
+            if not load:
+                address_idx = to_int(address)
+                assert (
+                    new_ram64._merkle_hash() == self.digest
+                ), "old value must be kept when load=0"
+                assert (
+                    new_ram64.out == self.read(address_idx)
+                ), "old value must be returned as `out` when load=0"
 
         return new_ram64
 
@@ -266,36 +417,59 @@ class RAM64:
 
         return output
 
+    @property
+    def digest(self) -> int:
+        """A Merkle hash of `state`, cached and computed from the digests of the children."""
+        if self._digest is None:
+            object.__setattr__(self, "_digest", self._merkle_hash())
+
+        return self._digest  # type: ignore
+
+    def _merkle_hash(self) -> int:
+        return hash((64, *(r.digest for r in self.ram8s)))
+
+    def read(self, address_idx: int) -> tuple[bool, ...]:
+        """Returns the register value at `address_idx` without materialising `state`."""
+        child_idx, offset = divmod(address_idx, 8)
+        return self.ram8s[child_idx].read(offset)
+
     @staticmethod
     def create() -> "RAM64":
         """Creates a new 64-register memory with all bits set to 0."""
+        checks = peek("memory.RAM64")
+
         ram8s = tuple(RAM8.create() for _ in range(8))
         out = ZERO16
         ram64 = RAM64(ram8s, out)
 
         # post-conditions
-        assert isinstance(ram64, RAM64), "`ram64` must be a `RAM64`"
-        assert all(
-            s == ZERO16 for s in ram64.state
-        ), "`ram64.state` must be a 64-tuple of 16-tuples of `bool`s"
-        assert ram64.out == ZERO16, "`ram64.out` must be a 16-tuple of `bool`s"
+        if checks:
+            assert isinstance(ram64, RAM64), "`ram64` must be a `RAM64`"
+            assert ram64.out == ZERO16, "`ram64.out` must be a 16-tuple of `bool`s"
+
+        if checks == FULL:
+            assert all(
+                s == ZERO16 for s in ram64.state
+            ), "`ram64.state` must be a 64-tuple of 16-tuples of `bool`s"
 
         return ram64
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RAM512:
     """512-register memory, each 16-bits."""
 
     ram64s: tuple[RAM64, ...]
     out: tuple[bool, ...]
+    _digest: int | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
-        assert all(
-            isinstance(r, RAM64) for r in self.ram64s
-        ), "`ram64s` must be a tuple of `RAM64`s"
-        assert len(self.ram64s) == 8, "`ram64s` must be a 8-tuple of `RAM8`s"
-        assert is_n_bit_vector(self.out, n=16), "`out` must be a 16-tuple of `bool`s"
+        if peek("memory.RAM512"):
+            assert all(
+                isinstance(r, RAM64) for r in self.ram64s
+            ), "`ram64s` must be a tuple of `RAM64`s"
+            assert len(self.ram64s) == 8, "`ram64s` must be a 8-tuple of `RAM8`s"
+            assert is_n_bit_vector(self.out, n=16), "`out` must be a 16-tuple of `bool`s"
 
     def __call__(
         self,
@@ -303,10 +477,13 @@ class RAM512:
         load: bool,
         address: tuple[bool, ...],
     ) -> "RAM512":
+        checks = level("memory.RAM512")
+
         # pre-conditions
-        assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
-        assert isinstance(load, bool), "`load` must be a `bool`"
-        assert is_n_bit_vector(address, n=9), "`address` must be a 9-tuple of `bool`s"
+        if checks:
+            assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
+            assert isinstance(load, bool), "`load` must be a `bool`"
+            assert is_n_bit_vector(address, n=9), "`address` must be a 9-tuple of `bool`s"
 
         # body
         load_bits = DMUX8WAY(load, address[:3])
@@ -316,27 +493,35 @@ class RAM512:
         new_out = MUX8WAY16(*[r.out for r in new_ram64s], sel=address[:3])  # type: ignore
         new_ram512 = RAM512(new_ram64s, new_out)
 
-        # post-conditions
-        assert isinstance(new_ram512, RAM512), "`new_ram512` must be a `RAM512`"
-        assert all(
-            isinstance(r, RAM64) for r in new_ram512.ram64s
-        ), "`new_ram512.ram64s` must be an 8-tuple of `RAM64`s"
+        if load is False:
+            # the contents are unchanged, so the cached digest carries over
+            object.__setattr__(new_ram512, "_digest", self._digest)
 
-        address_idx = to_int(address)
+        # post-conditions
+        if checks:
+            assert isinstance(new_ram512, RAM512), "`new_ram512` must be a `RAM512`"
+            assert all(
+                isinstance(r, RAM64) for r in new_ram512.ram64s
+            ), "`new_ram512.ram64s` must be an 8-tuple of `RAM64`s"
 
-        if load:
-            assert (
-                new_ram512.state[address_idx] == xs
-            ), "new value must be stored when load=1"
-            assert (
-                new_ram512.out == xs
-            ), "new value must be returned as `out` when load=1"
+        if checks == FULL:
+            address_idx = to_int(address)
 
-        if not load:
-            assert new_ram512.state == self.state, "old value must be kept when load=0"
-            assert (
-                new_ram512.out == self.state[address_idx]
-            ), "out must be value of RAM at `address` when load=0"
+            if load:
+                assert (
+                    new_ram512.read(address_idx) == xs
+                ), "new value must be stored when load=1"
+                assert (
+                    new_ram512.out == xs
+                ), "new value must be returned as `out` when load=1"
+
+            if not load:
+                assert (
+                    new_ram512._merkle_hash() == self.digest
+                ), "old value must be kept when load=0"
+                assert (
+                    new_ram512.out == self.read(address_idx)
+                ), "out must be value of RAM at `address` when load=0"
 
         return new_ram512
 
@@ -349,36 +534,59 @@ class RAM512:
 
         return output
 
+    @property
+    def digest(self) -> int:
+        """A Merkle hash of `state`, cached and computed from the digests of the children."""
+        if self._digest is None:
+            object.__setattr__(self, "_digest", self._merkle_hash())
+
+        return self._digest  # type: ignore
+
+    def _merkle_hash(self) -> int:
+        return hash((512, *(r.digest for r in self.ram64s)))
+
+    def read(self, address_idx: int) -> tuple[bool, ...]:
+        """Returns the register value at `address_idx` without materialising `state`."""
+        child_idx, offset = divmod(address_idx, 64)
+        return self.ram64s[child_idx].read(offset)
+
     @staticmethod
     def create() -> "RAM512":
         """Creates a new 512-register memory with all bits set to 0."""
+        checks = peek("memory.RAM512")
+
         ram64s = tuple(RAM64.create() for _ in range(8))
         out = ZERO16
         ram512 = RAM512(ram64s, out)
 
         # post-conditions
-        assert isinstance(ram512, RAM512), "`ram512` must be a `RAM512`"
-        assert all(
-            s == ZERO16 for s in ram512.state
-        ), "`ram512.state` must be a 512-tuple of 16-tuples of `bool`s"
-        assert ram512.out == ZERO16, "`ram512.out` must be a 16-tuple of `bool`s"
+        if checks:
+            assert isinstance(ram512, RAM512), "`ram512` must be a `RAM512`"
+            assert ram512.out == ZERO16, "`ram512.out` must be a 16-tuple of `bool`s"
+
+        if checks == FULL:
+            assert all(
+                s == ZERO16 for s in ram512.state
+            ), "`ram512.state` must be a 512-tuple of 16-tuples of `bool`s"
 
         return ram512
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RAM4K:
     """4,096-register memory, each 16-bits."""
 
     ram512s: tuple[RAM512, ...]
     out: tuple[bool, ...]
+    _digest: int | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
-        assert all(
-            isinstance(r, RAM512) for r in self.ram512s
-        ), "`ram512s` must be a tuple of `RAM512`s"
-        assert len(self.ram512s) == 8, "`ram512s` must be a 8-tuple of `RAM8`s"
-        assert is_n_bit_vector(self.out, n=16), "`out` must be a 16-tuple of `bool`s"
+        if peek("memory.RAM4K"):
+            assert all(
+                isinstance(r, RAM512) for r in self.ram512s
+            ), "`ram512s` must be a tuple of `RAM512`s"
+            assert len(self.ram512s) == 8, "`ram512s` must be a 8-tuple of `RAM8`s"
+            assert is_n_bit_vector(self.out, n=16), "`out` must be a 16-tuple of `bool`s"
 
     def __call__(
         self,
@@ -386,10 +594,13 @@ class RAM4K:
         load: bool,
         address: tuple[bool, ...],
     ) -> "RAM4K":
+        checks = level("memory.RAM4K")
+
         # pre-conditions
-        assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
-        assert isinstance(load, bool), "`load` must be a `bool`"
-        assert is_n_bit_vector(address, n=12), "`address` must be a 12-tuple of `bool`s"
+        if checks:
+            assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
+            assert isinstance(load, bool), "`load` must be a `bool`"
+            assert is_n_bit_vector(address, n=12), "`address` must be a 12-tuple of `bool`s"
 
         # body
         load_bits = DMUX8WAY(load, address[:3])
@@ -399,27 +610,35 @@ class RAM4K:
         new_out = MUX8WAY16(*[r.out for r in new_ram512s], sel=address[:3])  # type: ignore
         new_ram4k = RAM4K(new_ram512s, new_out)
 
-        # post-conditions
-        assert isinstance(new_ram4k, RAM4K), "`new_ram4k` must be a `RAM4K`"
-        assert all(
-            isinstance(r, RAM512) for r in new_ram4k.ram512s
-        ), "`new_ram4k.ram512s` must be an 8-tuple of `RAM512`s"
+        if load is False:
+            # the contents are unchanged, so the cached digest carries over
+            object.__setattr__(new_ram4k, "_digest", self._digest)
 
-        address_idx = to_int(address)
+        # post-conditions
+        if checks:
+            assert isinstance(new_ram4k, RAM4K), "`new_ram4k` must be a `RAM4K`"
+            assert all(
+                isinstance(r, RAM512) for r in new_ram4k.ram512s
+            ), "`new_ram4k.ram512s` must be an 8-tuple of `RAM512`s"
 
-        if load:
-            assert (
-                new_ram4k.state[address_idx] == xs
-            ), "new value must be stored when load=1"
-            assert (
-                new_ram4k.out == xs
-            ), "new value must be returned as `out` when load=1"
+        if checks == FULL:
+            address_idx = to_int(address)
 
-        if not load:
-            assert self.state == new_ram4k.state, "old value must be kept when load=0"
-            assert (
-                new_ram4k.out == self.state[address_idx]
-            ), "out must be value of RAM at `address` when load=0"
+            if load:
+                assert (
+                    new_ram4k.read(address_idx) == xs
+                ), "new value must be stored when load=1"
+                assert (
+                    new_ram4k.out == xs
+                ), "new value must be returned as `out` when load=1"
+
+            if not load:
+                assert (
+                    new_ram4k._merkle_hash() == self.digest
+                ), "old value must be kept when load=0"
+                assert (
+                    new_ram4k.out == self.read(address_idx)
+                ), "out must be value of RAM at `address` when load=0"
 
         return new_ram4k
 
@@ -432,36 +651,59 @@ class RAM4K:
 
         return output
 
+    @property
+    def digest(self) -> int:
+        """A Merkle hash of `state`, cached and computed from the digests of the children."""
+        if self._digest is None:
+            object.__setattr__(self, "_digest", self._merkle_hash())
+
+        return self._digest  # type: ignore
+
+    def _merkle_hash(self) -> int:
+        return hash((4096, *(r.digest for r in self.ram512s)))
+
+    def read(self, address_idx: int) -> tuple[bool, ...]:
+        """Returns the register value at `address_idx` without materialising `state`."""
+        child_idx, offset = divmod(address_idx, 512)
+        return self.ram512s[child_idx].read(offset)
+
     @staticmethod
     def create() -> "RAM4K":
         """Creates a new 4,096-register memory with all bits set to 0."""
+        checks = peek("memory.RAM4K")
+
         ram512s = tuple(RAM512.create() for _ in range(8))
         out = ZERO16
         ram4k = RAM4K(ram512s, out)
 
         # post-conditions
-        assert isinstance(ram4k, RAM4K), "`ram4k` must be a `RAM4K`"
-        assert all(
-            s == ZERO16 for s in ram4k.state
-        ), "`ram4k.state` must be a 4,096-tuple of 16-tuples of `bool`s"
-        assert ram4k.out == ZERO16, "`ram4k.out` must be a 16-tuple of `bool`s"
+        if checks:
+            assert isinstance(ram4k, RAM4K), "`ram4k` must be a `RAM4K`"
+            assert ram4k.out == ZERO16, "`ram4k.out` must be a 16-tuple of `bool`s"
+
+        if checks == FULL:
+            assert all(
+                s == ZERO16 for s in ram4k.state
+            ), "`ram4k.state` must be a 4,096-tuple of 16-tuples of `bool`s"
 
         return ram4k
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RAM8K:
     """8,192-register memory, each 16-bits."""
 
     ram4ks: tuple[RAM4K, ...]
     out: tuple[bool, ...]
+    _digest: int | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
-        assert all(
-            isinstance(r, RAM4K) for r in self.ram4ks
-        ), "`ram4ks` must be a tuple of `RAM4K`s"
-        assert len(self.ram4ks) == 2, "`ram4ks` must be a 2-tuple of `RAM4K`s"
-        assert is_n_bit_vector(self.out, n=16), "`out` must be a 16-tuple of `bool`s"
+        if peek("memory.RAM8K"):
+            assert all(
+                isinstance(r, RAM4K) for r in self.ram4ks
+            ), "`ram4ks` must be a tuple of `RAM4K`s"
+            assert len(self.ram4ks) == 2, "`ram4ks` must be a 2-tuple of `RAM4K`s"
+            assert is_n_bit_vector(self.out, n=16), "`out` must be a 16-tuple of `bool`s"
 
     def __call__(
         self,
@@ -469,10 +711,13 @@ class RAM8K:
         load: bool,
         address: tuple[bool, ...],
     ) -> "RAM8K":
+        checks = level("memory.RAM8K")
+
         # pre-conditions
-        assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
-        assert isinstance(load, bool), "`load` must be a `bool`"
-        assert is_n_bit_vector(address, n=13), "`address` must be a 13-tuple of `bool`s"
+        if checks:
+            assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
+            assert isinstance(load, bool), "`load` must be a `bool`"
+            assert is_n_bit_vector(address, n=13), "`address` must be a 13-tuple of `bool`s"
 
         # body
         load_bits = DMUX(load, address[0])
@@ -486,27 +731,35 @@ class RAM8K:
         )
         new_ram8k = RAM8K(new_ram4ks, new_out)
 
-        # post-conditions
-        assert isinstance(new_ram8k, RAM8K), "`new_ram8k` must be a `RAM8K`"
-        assert all(
-            isinstance(r, RAM4K) for r in new_ram8k.ram4ks
-        ), "`new_ram8k.ram4ks` must be an 2-tuple of `RAM4K`s"
+        if load is False:
+            # the contents are unchanged, so the cached digest carries over
+            object.__setattr__(new_ram8k, "_digest", self._digest)
 
-        address_idx = to_int(address)
+        # post-conditions
+        if checks:
+            assert isinstance(new_ram8k, RAM8K), "`new_ram8k` must be a `RAM8K`"
+            assert all(
+                isinstance(r, RAM4K) for r in new_ram8k.ram4ks
+            ), "`new_ram8k.ram4ks` must be an 2-tuple of `RAM4K`s"
 
-        if load:
-            assert (
-                new_ram8k.state[address_idx] == xs
-            ), "new value must be stored when load=1"
-            assert (
-                new_ram8k.out == xs
-            ), "new value must be returned as `out` when load=1"
+        if checks == FULL:
+            address_idx = to_int(address)
 
-        if not load:
-            assert self.state == new_ram8k.state, "old value must be kept when load=0"
-            assert (
-                new_ram8k.out == self.state[address_idx]
-            ), "out must be value of RAM at `address` when load=0"
+            if load:
+                assert (
+                    new_ram8k.read(address_idx) == xs
+                ), "new value must be stored when load=1"
+                assert (
+                    new_ram8k.out == xs
+                ), "new value must be returned as `out` when load=1"
+
+            if not load:
+                assert (
+                    new_ram8k._merkle_hash() == self.digest
+                ), "old value must be kept when load=0"
+                assert (
+                    new_ram8k.out == self.read(address_idx)
+                ), "out must be value of RAM at `address` when load=0"
 
         return new_ram8k
 
@@ -519,36 +772,59 @@ class RAM8K:
 
         return output
     
+    @property
+    def digest(self) -> int:
+        """A Merkle hash of `state`, cached and computed from the digests of the children."""
+        if self._digest is None:
+            object.__setattr__(self, "_digest", self._merkle_hash())
+
+        return self._digest  # type: ignore
+
+    def _merkle_hash(self) -> int:
+        return hash((8192, *(r.digest for r in self.ram4ks)))
+
+    def read(self, address_idx: int) -> tuple[bool, ...]:
+        """Returns the register value at `address_idx` without materialising `state`."""
+        child_idx, offset = divmod(address_idx, 4096)
+        return self.ram4ks[child_idx].read(offset)
+
     @staticmethod
     def create() -> "RAM8K":
         """Creates a new 8,192-register memory with all bits set to 0."""
+        checks = peek("memory.RAM8K")
+
         ram4ks = tuple(RAM4K.create() for _ in range(2))
         out = ZERO16
         ram8k = RAM8K(ram4ks, out)
 
         # post-conditions
-        assert isinstance(ram8k, RAM8K), "`ram8k` must be a `RAM8K`"
-        assert all(
-            s == ZERO16 for s in ram8k.state
-        ), "`ram8k.state` must be a 8,192-tuple of 16-tuples of `bool`s"
-        assert ram8k.out == ZERO16, "`ram8k.out` must be a 16-tuple of `bool`s"
+        if checks:
+            assert isinstance(ram8k, RAM8K), "`ram8k` must be a `RAM8K`"
+            assert ram8k.out == ZERO16, "`ram8k.out` must be a 16-tuple of `bool`s"
+
+        if checks == FULL:
+            assert all(
+                s == ZERO16 for s in ram8k.state
+            ), "`ram8k.state` must be a 8,192-tuple of 16-tuples of `bool`s"
 
         return ram8k
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RAM16K:
     """16,384-register memory, each 16-bits."""
 
     ram4ks: tuple[RAM4K, ...]
     out: tuple[bool, ...]
+    _digest: int | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
-        assert all(
-            isinstance(r, RAM4K) for r in self.ram4ks
-        ), "`ram4ks` must be a tuple of `RAM4K`s"
-        assert len(self.ram4ks) == 4, "`ram4ks` must be a 4-tuple of `RAM4K`s"
-        assert is_n_bit_vector(self.out, n=16), "`out` must be a 16-tuple of `bool`s"
+        if peek("memory.RAM16K"):
+            assert all(
+                isinstance(r, RAM4K) for r in self.ram4ks
+            ), "`ram4ks` must be a tuple of `RAM4K`s"
+            assert len(self.ram4ks) == 4, "`ram4ks` must be a 4-tuple of `RAM4K`s"
+            assert is_n_bit_vector(self.out, n=16), "`out` must be a 16-tuple of `bool`s"
 
     def __call__(
         self,
@@ -556,10 +832,13 @@ class RAM16K:
         load: bool,
         address: tuple[bool, ...],
     ) -> "RAM16K":
+        checks = level("memory.RAM16K")
+
         # pre-conditions
-        assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
-        assert isinstance(load, bool), "`load` must be a `bool`"
-        assert is_n_bit_vector(address, n=14), "`address` must be a 14-tuple of `bool`s"
+        if checks:
+            assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
+            assert isinstance(load, bool), "`load` must be a `bool`"
+            assert is_n_bit_vector(address, n=14), "`address` must be a 14-tuple of `bool`s"
 
         # body
         load_bits = DMUX4WAY(load, address[:2])
@@ -572,27 +851,35 @@ class RAM16K:
         )
         new_ram16k = RAM16K(new_ram4ks, new_out)
 
+        if load is False:
+            # the contents are unchanged, so the cached digest carries over
+            object.__setattr__(new_ram16k, "_digest", self._digest)
+
         # post-conditions
-        assert isinstance(new_ram16k, RAM16K), "`new_ram16k` must be a `RAM16K`"
-        assert all(
-            isinstance(r, RAM4K) for r in new_ram16k.ram4ks
-        ), "`new_ram16k.ram4ks` must be an 4-tuple of `RAM4K`s"
+        if checks:
+            assert isinstance(new_ram16k, RAM16K), "`new_ram16k` must be a `RAM16K`"
+            assert all(
+                isinstance(r, RAM4K) for r in new_ram16k.ram4ks
+            ), "`new_ram16k.ram4ks` must be an 4-tuple of `RAM4K`s"
 
-        address_idx = to_int(address)
+        if checks == FULL:
+            address_idx = to_int(address)
 
-        if load:
-            assert (
-                new_ram16k.state[address_idx] == xs
-            ), "new value must be stored when load=1"
-            assert (
-                new_ram16k.out == xs
-            ), "new value must be returned as `out` when load=1"
-
-        if not load:
-            assert self.state == new_ram16k.state, "old value must be kept when load=0"
-            assert (
-                new_ram16k.out == self.state[address_idx]
-            ), "out must be value of RAM at `address` when load=0"
+            if load:
+                assert (
+                    new_ram16k.read(address_idx) == xs
+                ), "new value must be stored when load=1"
+                assert (
+                    new_ram16k.out == xs
+                ), "new value must be returned as `out` when load=1"
+
+            if not load:
+                assert (
+                    new_ram16k._merkle_hash() == self.digest
+                ), "old value must be kept when load=0"
+                assert (
+                    new_ram16k.out == self.read(address_idx)
+                ), "out must be value of RAM at `address` when load=0"
 
         return new_ram16k
 
@@ -605,32 +892,54 @@ class RAM16K:
 
         return output
 
+    @property
+    def digest(self) -> int:
+        """A Merkle hash of `state`, cached and computed from the digests of the children."""
+        if self._digest is None:
+            object.__setattr__(self, "_digest", self._merkle_hash())
+
+        return self._digest  # type: ignore
+
+    def _merkle_hash(self) -> int:
+        return hash((16384, *(r.digest for r in self.ram4ks)))
+
+    def read(self, address_idx: int) -> tuple[bool, ...]:
+        """Returns the register value at `address_idx` without materialising `state`."""
+        child_idx, offset = divmod(address_idx, 4096)
+        return self.ram4ks[child_idx].read(offset)
+
     @staticmethod
     def create() -> "RAM16K":
         """Creates a new 16,384-register memory with all bits set to 0."""
+        checks = peek("memory.RAM16K")
+
         ram4ks = tuple(RAM4K.create() for _ in range(4))
         ram16k = RAM16K(ram4ks, ZERO16)
 
         # post-conditions
-        assert isinstance(ram16k, RAM16K), "`ram16k` must be a `RAM16K`"
-        assert all(
-            s == ZERO16 for s in ram16k.state
-        ), "`ram16k.state` must be a 16,384-tuple of 16-tuples of `bool`s"
-        assert ram16k.out == ZERO16, "`ram16k.out` must be `ZERO16`"
+        if checks:
+            assert isinstance(ram16k, RAM16K), "`ram16k` must be a `RAM16K`"
+            assert ram16k.out == ZERO16, "`ram16k.out` must be `ZERO16`"
+
+        if checks == FULL:
+            assert all(
+                s == ZERO16 for s in ram16k.state
+            ), "`ram16k.state` must be a 16,384-tuple of 16-tuples of `bool`s"
 
         return ram16k
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PC:
     """A 16-bit program counter with load, inc and reset control bits."""
 
     register: REGISTER16
 
     def __post_init__(self) -> None:
-        assert isinstance(
-            self.register, REGISTER16
-        ), "`register` must be a `REGISTER16`"
+        if peek("memory.PC"):
+            assert isinstance(
+                self.register, REGISTER16
+            ), "`register` must be a `REGISTER16`"
 
     def __call__(
         self,
@@ -639,33 +948,39 @@ class PC:
         inc: bool,
         reset: bool,
     ) -> "PC":
+        checks = level("memory.PC")
+
         # pre-conditions
-        assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
-        assert isinstance(load, bool), "`load` must be a `bool`"
-        assert isinstance(inc, bool), "`inc` must be a `bool`"
-        assert isinstance(reset, bool), "`reset` must be a `bool`"
+        if checks:
+            assert is_n_bit_vector(xs, n=16), "`xs` must be a 16-tuple of `bool`s"
+            assert isinstance(load, bool), "`load` must be a `bool`"
+            assert isinstance(inc, bool), "`inc` must be a `bool`"
+            assert isinstance(reset, bool), "`reset` must be a `bool`"
 
         # body
-        a = MUX16(self.out, INC16(self.out), inc)
+        old = self.register.word if type(xs) is Word16 else self.out
+        a = MUX16(old, INC16(old), inc)
         b = MUX16(a, xs, load)
         c = MUX16(b, ZERO16, reset)
         new_register = self.register(c, True)
         new_pcounter = PC(new_register)
 
         # post-conditions
-        assert isinstance(new_pcounter, PC), "`new_pcounter` must be a `PCOUNTER`"
-        assert isinstance(
-            new_pcounter.register, REGISTER16
-        ), "`new_pcounter.register` must be a `REGISTER16`"
-
-        if reset:
-            assert new_pcounter.out == ZERO16, "counter must be reset when reset=1"
-        elif load:
-            assert new_pcounter.out == xs, "new value must be stored when load=1"
-        elif inc:
-            assert new_pcounter.out == INC16(self.out), "counter must be incremented"
-        else:
-            assert new_pcounter.out == self.out, "counter must be unchanged"
+        if checks:
+            assert isinstance(new_pcounter, PC), "`new_pcounter` must be a `PCOUNTER`"
+            assert isinstance(
+                new_pcounter.register, REGISTER16
+            ), "`new_pcounter.register` must be a `REGISTER16`"
+
+        if checks == FULL:
+            if reset:
+                assert new_pcounter.out == ZERO16, "counter must be reset when reset=1"
+            elif load:
+                assert new_pcounter.out == xs, "new value must be stored when load=1"
+            elif inc:
+                assert new_pcounter.out == INC16(self.out), "counter must be incremented"
+            else:
+                assert new_pcounter.out == self.out, "counter must be unchanged"
 
         return new_pcounter
 
@@ -676,50 +991,65 @@ class PC:
     @staticmethod
     def create() -> "PC":
         """Creates a new 16-bit program counter with all bits set to 0."""
+        checks = peek("memory.PC")
+
         pc = PC(REGISTER16.create())
 
         # post-conditions
-        assert isinstance(pc, PC), "`pc` must be a `PC`"
-        assert pc.out == ZERO16, "`pc.out` must be `ZERO16`"
+        if checks:
+            assert isinstance(pc, PC), "`pc` must be a `PC`"
+            assert pc.out == ZERO16, "`pc.out` must be `ZERO16`"
 
         return pc
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ROM32K:
     """32,768-register memory, each 16-bits. This is a primitive component."""
 
     registers: tuple[tuple[bool, ...], ...]
 
     def __post_init__(self) -> None:
-        assert all(
-            is_n_bit_vector(xs, n=16) for xs in self.registers
-        ), "`registers` must be a tuple of 16-tuples of `bool`s"
-        assert len(self.registers) == 2**15, "`registers` must be a 32,768-tuple"
+        checks = peek("memory.ROM32K")
+
+        if checks:
+            assert len(self.registers) == 2**15, "`registers` must be a 32,768-tuple"
+
+        if checks == FULL:
+            assert all(
+                is_n_bit_vector(xs, n=16) for xs in self.registers
+            ), "`registers` must be a tuple of 16-tuples of `bool`s"
     
     def __call__(self, address: tuple[bool, ...]) -> tuple[bool, ...]:
+        checks = level("memory.ROM32K")
+
         # pre-conditions
-        assert is_n_bit_vector(address, n=15), "`address` must be a 15-tuple of `bool`s"
+        if checks:
+            assert is_n_bit_vector(address, n=15), "`address` must be a 15-tuple of `bool`s"
         
         # body
         register_idx = to_int(address)
         out = self.registers[register_idx]
         
         # post-conditions
-        assert is_n_bit_vector(out, n=16), "`out` must be a 16-tuple of `bool`s"
+        if checks:
+            assert is_n_bit_vector(out, n=16), "`out` must be a 16-tuple of `bool`s"
         
         return out
 
     @staticmethod
     def create(instructions: tuple[tuple[bool, ...], ...] = tuple()) -> "ROM32K":
         """Creates a `ROM32K` from a tuple of 16-bit instructions. Pads with 0's to reach 32,768 instructions if necessary."""
+        checks = peek("memory.ROM32K")
+
         # pre-conditions
-        assert all(
-            is_n_bit_vector(xs, n=16) for xs in instructions
-        ), "`instructions` must be a tuple of 16-tuples of `bool`s"
-        assert (
-            len(instructions) <= 2**15
-        ), "`instructions` must be at most a 32,768-tuple"
+        if checks:
+            assert all(
+                is_n_bit_vector(xs, n=16) for xs in instructions
+            ), "`instructions` must be a tuple of 16-tuples of `bool`s"
+            assert (
+                len(instructions) <= 2**15
+            ), "`instructions` must be at most a 32,768-tuple"
 
         # body
         padding = ((False,) * 16,) * (2**15 - len(instructions))
@@ -727,6 +1057,7 @@ class ROM32K:
         rom32k = ROM32K(padded_instructions)
 
         # post-conditions
-        assert isinstance(rom32k, ROM32K), "`rom32k` must be a `ROM32K`"
+        if checks:
+            assert isinstance(rom32k, ROM32K), "`rom32k` must be a `ROM32K`"
 
         return rom32k
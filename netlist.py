@@ -0,0 +1,589 @@
+"""Gate netlists extracted by tracing the components.
+
+Tracing installs `TRACER`, which replaces the primitive gates in `gates` with functions
+that record a gate and return a symbolic `Wire`, and then runs a component on wires
+instead of `bool`s. Everything built from the primitives records itself, so the netlist
+has exactly the structure of the Python code; the few components that compute on `bool`s
+directly are traced as the circuits in `lanes.STRUCTURE`. While recording:
+
+- gates with a constant input are folded, e.g. `AND(x, True)` is `x`;
+- identical gates are shared, e.g. the two `DMUX`s in `DMUX4WAY` give one set of gates;
+- `DMUX` is recorded as the two `AND`s it is made of;
+- gates that drive no output are dropped.
+
+`Wire`s refuse to be used as `bool`s, numbers, indices or keys, raising `Untraceable`, so
+a component that branches or computes on a signal cannot be traced by accident. `add16`, `inc16`, `alu`, `cpu`, `ram8` and `computer` trace the
+combinational logic of `ADD16`, `INC16`, `ALU`, `CPU.__call__`, `RAM8.__call__` and
+`Computer.__call__`. Ports are named after the parameters of the component.
+State that a component keeps in registers becomes an input port, and its next value
+becomes an output port named `next_<port>`.
+
+Wire 0 is the constant `False`, wire 1 the constant `True`, the input wires follow in
+port order, and gate `k` drives wire `first_gate + k`. Gates only read lower-numbered
+wires, so their order is a valid evaluation order.
+"""
+
+import contracts
+import engines
+import hashlib
+import json
+import lanes
+import sys
+import zlib
+
+from array import array
+from arithmetic import ADD16, ALU, INC16
+from computer import CPU, Memory
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from memory import BIT, DFF, PC, RAM4K, RAM8, RAM8K, RAM16K, RAM64, RAM512, REGISTER16
+from typing import Any, Callable, Iterator
+
+
+OPS = ("AND", "OR", "NOT", "NAND", "XOR", "MUX")
+
+ARITY = {"AND": 2, "OR": 2, "NOT": 1, "NAND": 2, "XOR": 2, "MUX": 3}
+
+_MAGIC = b"HACKNET1"
+
+
+class Untraceable(TypeError):
+    """Raised when a component uses a traced signal as a value, i.e. not through the primitive gates."""
+
+
+def _untraceable(self: "Wire", *args: Any) -> Any:
+    raise Untraceable(f"a traced signal has no value: the component computes on {self!r}")
+
+
+class Wire:
+    """A symbolic signal in a netlist being traced."""
+
+    __slots__ = ("id",)
+
+    def __init__(self, id: int) -> None:
+        self.id = id
+
+    def __bool__(self) -> bool:
+        raise Untraceable("a traced signal has no value: the component branches on a signal")
+
+    # used as a number, an index or a key
+    __int__ = __index__ = __hash__ = __invert__ = _untraceable
+    __and__ = __rand__ = __or__ = __ror__ = __xor__ = __rxor__ = _untraceable
+    __lshift__ = __rlshift__ = __rshift__ = __rrshift__ = _untraceable
+    __add__ = __radd__ = __sub__ = __rsub__ = __mul__ = __rmul__ = _untraceable
+    __lt__ = __le__ = __gt__ = __ge__ = _untraceable
+
+    def __repr__(self) -> str:
+        return f"Wire({self.id})"
+
+
+@dataclass(frozen=True, slots=True)
+class Netlist:
+    """A combinational gate netlist with named input and output ports."""
+
+    name: str
+    inputs: dict[str, tuple[int, ...]]
+    outputs: dict[str, tuple[int, ...]]
+    gates: tuple[tuple[str, tuple[int, ...]], ...]
+
+    def __post_init__(self) -> None:
+        if contracts.peek("netlist.Netlist"):
+            first_gate, wires = self.first_gate, self.wires
+            assert all(op in OPS for op, _ in self.gates), f"ops must be in {OPS}"
+            assert all(
+                len(ins) == ARITY[op] and all(i < first_gate + k for i in ins)
+                for k, (op, ins) in enumerate(self.gates)
+            ), "gates must only read lower-numbered wires"
+            assert all(
+                w < wires for ws in self.outputs.values() for w in ws
+            ), "outputs must be driven by existing wires"
+
+    @property
+    def first_gate(self) -> int:
+        """The wire driven by the first gate."""
+        return 2 + sum(len(ws) for ws in self.inputs.values())
+
+    @property
+    def wires(self) -> int:
+        """The number of wires, including the two constants."""
+        return self.first_gate + len(self.gates)
+
+    def evaluate(self, inputs: dict[str, int]) -> dict[str, int]:
+        """Evaluates the netlist gate by gate. Ports carry ints, most significant bit first."""
+        # pre-conditions
+        assert inputs.keys() == self.inputs.keys(), "every input port must be driven"
+
+        # body
+        values = [False, True]
+
+        for name, ws in self.inputs.items():
+            values.extend(bool((inputs[name] >> (len(ws) - 1 - i)) & 1) for i in range(len(ws)))
+
+        for op, ins in self.gates:
+            a = values[ins[0]]
+
+            if op == "AND":
+                values.append(a and values[ins[1]])
+            elif op == "OR":
+                values.append(a or values[ins[1]])
+            elif op == "NOT":
+                values.append(not a)
+            elif op == "NAND":
+                values.append(not (a and values[ins[1]]))
+            elif op == "XOR":
+                values.append(a != values[ins[1]])
+            else:
+                values.append(values[ins[1]] if values[ins[2]] else a)
+
+        out = {
+            name: sum(values[w] << (len(ws) - 1 - i) for i, w in enumerate(ws))
+            for name, ws in self.outputs.items()
+        }
+
+        return out
+
+    def fingerprint(self) -> str:
+        """A hash of the structure and ports, stable across processes."""
+        return hashlib.sha256(self.to_bytes()).hexdigest()
+
+    def to_bytes(self) -> bytes:
+        """Serialises the netlist: a JSON header with the ports, then 4 `uint32`s per gate, compressed."""
+        header = json.dumps(
+            {"name": self.name, "inputs": self.inputs, "outputs": self.outputs},
+            separators=(",", ":"),
+        ).encode()
+        body = array("I")
+
+        for op, ins in self.gates:
+            body.extend((OPS.index(op), *ins, *(0,) * (3 - len(ins))))
+
+        if sys.byteorder != "little":
+            body.byteswap()  # the same bytes on every platform
+
+        return _MAGIC + zlib.compress(len(header).to_bytes(4, "little") + header + body.tobytes())
+
+    @staticmethod
+    def from_bytes(data: bytes) -> "Netlist":
+        """Inverse of `to_bytes`."""
+        # pre-conditions
+        assert data[: len(_MAGIC)] == _MAGIC, "data must be a serialised netlist"
+
+        # body
+        payload = zlib.decompress(data[len(_MAGIC) :])
+        size = int.from_bytes(payload[:4], "little")
+        header = json.loads(payload[4 : 4 + size])
+        body = array("I", payload[4 + size :])
+
+        if sys.byteorder != "little":
+            body.byteswap()
+
+        gates = tuple(
+            (OPS[body[i]], tuple(body[i + 1 : i + 1 + ARITY[OPS[body[i]]]]))
+            for i in range(0, len(body), 4)
+        )
+        netlist = Netlist(
+            name=header["name"],
+            inputs={k: tuple(v) for k, v in header["inputs"].items()},
+            outputs={k: tuple(v) for k, v in header["outputs"].items()},
+            gates=gates,
+        )
+
+        return netlist
+
+    def save(self, path: str) -> None:
+        """Writes the netlist to `path`."""
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @staticmethod
+    def load(path: str) -> "Netlist":
+        """Reads a netlist written by `save`."""
+        with open(path, "rb") as f:
+            return Netlist.from_bytes(f.read())
+
+
+class _Builder:
+    """Records gates while a component runs on wires."""
+
+    def __init__(self, first_wire: int) -> None:
+        self.gates: list[tuple[str, tuple[int, ...]]] = []
+        self.first_gate = first_wire
+        self.drivers: dict[tuple[str, tuple[int, ...]], Wire] = {}
+
+    def gate(self, op: str, *ins: Wire) -> Wire:
+        """Returns the wire driven by `op` on `ins`, recording the gate if it is new."""
+        ids = tuple(w.id for w in ins)
+
+        if op in ("AND", "OR", "NAND", "XOR"):
+            ids = tuple(sorted(ids))  # commutative
+
+        key = (op, ids)
+        out = self.drivers.get(key)
+
+        if out is None:
+            out = Wire(self.first_gate + len(self.gates))
+            self.gates.append(key)
+            self.drivers[key] = out
+
+        return out
+
+
+_BUILDER: _Builder | None = None
+
+
+def _AND(x: Any, y: Any) -> Any:
+    if x is False or y is False:
+        return False
+
+    if x is True or x is y:
+        return y
+
+    if y is True:
+        return x
+
+    return _BUILDER.gate("AND", x, y)  # type: ignore
+
+
+def _OR(x: Any, y: Any) -> Any:
+    if x is True or y is True:
+        return True
+
+    if x is False or x is y:
+        return y
+
+    if y is False:
+        return x
+
+    return _BUILDER.gate("OR", x, y)  # type: ignore
+
+
+def _NOT(x: Any) -> Any:
+    if type(x) is bool:
+        return not x
+
+    return _BUILDER.gate("NOT", x)  # type: ignore
+
+
+def _NAND(x: Any, y: Any) -> Any:
+    if x is False or y is False:
+        return True
+
+    if x is True or x is y:
+        return _NOT(y)
+
+    if y is True:
+        return _NOT(x)
+
+    return _BUILDER.gate("NAND", x, y)  # type: ignore
+
+
+def _XOR(x: Any, y: Any) -> Any:
+    if x is y:
+        return False
+
+    if type(x) is bool:
+        return _NOT(y) if x else y
+
+    if type(y) is bool:
+        return _NOT(x) if y else x
+
+    return _BUILDER.gate("XOR", x, y)  # type: ignore
+
+
+def _MUX(x: Any, y: Any, sel: Any) -> Any:
+    if type(sel) is bool:
+        return y if sel else x
+
+    if x is y:
+        return x
+
+    if type(x) is bool or type(y) is bool:
+        return _OR(_AND(x, _NOT(sel)), _AND(y, sel))
+
+    return _BUILDER.gate("MUX", x, y, sel)  # type: ignore
+
+
+def _DMUX(x: Any, sel: Any) -> tuple[Any, Any]:
+    return _AND(x, _NOT(sel)), _AND(x, sel)
+
+
+TRACER: dict[str, Callable] = {
+    **lanes.STRUCTURE,
+    "gates.AND": _AND,
+    "gates.OR": _OR,
+    "gates.NOT": _NOT,
+    "gates.NAND": _NAND,
+    "gates.XOR": _XOR,
+    "gates.MUX": _MUX,
+    "gates.DMUX": _DMUX,
+}
+
+
+@contextmanager
+def _tracing(first_wire: int) -> Iterator[_Builder]:
+    """Records the primitive gates called in the body. Contract checks are off: they assume `bool`s."""
+    global _BUILDER
+
+    # pre-conditions
+    assert _BUILDER is None, "traces cannot nest"
+
+    # body
+    _BUILDER = _Builder(first_wire)
+
+    try:
+        with contracts.policy("off"), contracts.policy("off", *engines.MODULES):
+            with engines.using(TRACER):
+                yield _BUILDER
+    finally:
+        _BUILDER = None
+
+
+def trace(name: str, fn: Callable[..., dict[str, Any]], inputs: dict[str, int]) -> Netlist:
+    """
+    Traces `fn` into a netlist.
+
+    Args:
+        name: the name of the netlist
+        fn: called with a wire (width 1) or a tuple of wires per input port, and returns a
+            wire, a constant or a tuple of them per output port
+        inputs: the width of every input port
+
+    Returns:
+        the netlist of the gates that drive the outputs of `fn`
+    """
+    # pre-conditions
+    assert all(isinstance(n, int) and n >= 1 for n in inputs.values()), "widths must be positive"
+
+    # body
+    ports, next_wire = {}, 2
+
+    for port, width in inputs.items():
+        ports[port] = tuple(range(next_wire, next_wire + width))
+        next_wire += width
+
+    with _tracing(next_wire) as builder:
+        args = {
+            port: Wire(ws[0]) if inputs[port] == 1 else tuple(Wire(w) for w in ws)
+            for port, ws in ports.items()
+        }
+        results = fn(**args)
+
+    outputs = {
+        port: tuple(_wire_id(v) for v in (value if isinstance(value, tuple) else (value,)))
+        for port, value in results.items()
+    }
+    netlist = _pruned(name, ports, outputs, builder.gates, next_wire)
+
+    return netlist
+
+
+def _wire_id(value: Any) -> int:
+    """The wire carrying `value`: 0 and 1 for the constants."""
+    if type(value) is bool:
+        return int(value)
+
+    assert isinstance(value, Wire), "outputs must be wires or constants"
+
+    return value.id
+
+
+def _pruned(
+    name: str,
+    inputs: dict[str, tuple[int, ...]],
+    outputs: dict[str, tuple[int, ...]],
+    gates: list[tuple[str, tuple[int, ...]]],
+    first_gate: int,
+) -> Netlist:
+    """The netlist without the gates that drive no output, renumbered densely."""
+    live = [False] * (first_gate + len(gates))
+
+    for ws in outputs.values():
+        for w in ws:
+            live[w] = True
+
+    for k in range(len(gates) - 1, -1, -1):
+        if live[first_gate + k]:
+            for i in gates[k][1]:
+                live[i] = True
+
+    renumber = list(range(first_gate)) + [0] * len(gates)
+    kept = []
+
+    for k, (op, ins) in enumerate(gates):
+        if live[first_gate + k]:
+            renumber[first_gate + k] = first_gate + len(kept)
+            kept.append((op, tuple(renumber[i] for i in ins)))
+
+    return Netlist(
+        name=name,
+        inputs=inputs,
+        outputs={port: tuple(renumber[w] for w in ws) for port, ws in outputs.items()},
+        gates=tuple(kept),
+    )
+
+
+def _register(wires: tuple[Wire, ...]) -> REGISTER16:
+    """A register holding the symbolic value `wires`."""
+    return REGISTER16(tuple(BIT(DFF(w)) for w in wires))  # type: ignore
+
+
+def add16() -> Netlist:
+    """The netlist of `arithmetic.ADD16`."""
+
+    def fn(xs, ys):  # type: ignore
+        return {"out": ADD16(xs, ys)}
+
+    return trace("ADD16", fn, {"xs": 16, "ys": 16})
+
+
+def inc16() -> Netlist:
+    """The netlist of `arithmetic.INC16`."""
+
+    def fn(xs):  # type: ignore
+        return {"out": INC16(xs)}
+
+    return trace("INC16", fn, {"xs": 16})
+
+
+def alu() -> Netlist:
+    """The netlist of `arithmetic.ALU`."""
+
+    def fn(xs, ys, zx, nx, zy, ny, f, no):  # type: ignore
+        out, zr, ng = ALU(xs, ys, zx, nx, zy, ny, f, no)
+        return {"out": out, "zr": zr, "ng": ng}
+
+    return trace(
+        "ALU", fn, {"xs": 16, "ys": 16, "zx": 1, "nx": 1, "zy": 1, "ny": 1, "f": 1, "no": 1}
+    )
+
+
+def cpu() -> Netlist:
+    """The netlist of one `CPU.__call__`: the registers and ALU flags are ports."""
+
+    def fn(instruction, in_m, reset, a, d, pc, zr, ng):  # type: ignore
+        state = CPU(_register(a), _register(d), PC(_register(pc)), zr, ng, (False,) * 16, False)
+        new = state(instruction, in_m, reset)
+        return {
+            "out_m": new.out_m,
+            "write_m": new.write_m,
+            "next_a": new.a_register.out,
+            "next_d": new.d_register.out,
+            "next_pc": new.pc.out,
+            "next_zr": new._zr,
+            "next_ng": new._ng,
+        }
+
+    return trace(
+        "CPU",
+        fn,
+        {
+            "instruction": 16,
+            "in_m": 16,
+            "reset": 1,
+            "a": 16,
+            "d": 16,
+            "pc": 16,
+            "zr": 1,
+            "ng": 1,
+        },
+    )
+
+
+def ram8() -> Netlist:
+    """The netlist of one `RAM8.__call__`: the 8 registers are ports `r0` to `r7`."""
+
+    def fn(xs, load, address, **registers):  # type: ignore
+        state = RAM8(tuple(_register(registers[f"r{i}"]) for i in range(8)), (False,) * 16)
+        new = state(xs, load, address)
+        return {
+            "out": new.out,
+            **{f"next_r{i}": r.out for i, r in enumerate(new.registers)},
+        }
+
+    return trace(
+        "RAM8", fn, {"xs": 16, "load": 1, "address": 3, **{f"r{i}": 16 for i in range(8)}}
+    )
+
+
+# The parts of every RAM, from which a RAM holding symbolic values is built
+_PARTS: dict[type, tuple[type, int]] = {
+    RAM64: (RAM8, 8),
+    RAM512: (RAM64, 8),
+    RAM4K: (RAM512, 8),
+    RAM8K: (RAM4K, 2),
+    RAM16K: (RAM4K, 4),
+}
+
+
+def _ram(cls: type, registers: Iterator[tuple[Wire, ...]]) -> Any:
+    """A `cls` RAM holding the symbolic values `registers`, in address order."""
+    if cls is RAM8:
+        return RAM8(tuple(_register(next(registers)) for _ in range(8)), (False,) * 16)
+
+    part, count = _PARTS[cls]
+
+    return cls(tuple(_ram(part, registers) for _ in range(count)), (False,) * 16)
+
+
+def _registers(ram: Any) -> Iterator[REGISTER16]:
+    """The registers of `ram`, in address order."""
+    if type(ram) is RAM8:
+        yield from ram.registers
+    else:
+        for part in getattr(ram, fields(ram)[0].name):
+            yield from _registers(part)
+
+
+def computer() -> Netlist:
+    """
+    The netlist of one `Computer.__call__` except the ROM, which is not made of gates.
+
+    The instruction read from the ROM is the port `instruction`. The state ports are the
+    CPU's `a`, `d`, `pc`, `zr` and `ng`, the memory's `ram0` to `ram16383`, `screen0` to
+    `screen8191`, `keyboard` and its output `memory_out`. This is a large netlist: tracing
+    it takes seconds.
+    """
+    ram_words, screen_words = 2**14, 2**13
+
+    def fn(instruction, reset, a, d, pc, zr, ng, memory_out, keyboard, **registers):  # type: ignore
+        cpu = CPU(_register(a), _register(d), PC(_register(pc)), zr, ng, (False,) * 16, False)
+        memory = Memory(
+            _ram(RAM16K, (registers[f"ram{i}"] for i in range(ram_words))),
+            _ram(RAM8K, (registers[f"screen{i}"] for i in range(screen_words))),
+            _register(keyboard),
+            memory_out,
+        )
+        new_cpu = cpu(instruction, memory.out, reset)
+        new_memory = memory(new_cpu.out_m, cpu.address_m, new_cpu.write_m)
+
+        return {
+            "out_m": new_cpu.out_m,
+            "write_m": new_cpu.write_m,
+            "next_a": new_cpu.a_register.out,
+            "next_d": new_cpu.d_register.out,
+            "next_pc": new_cpu.pc.out,
+            "next_zr": new_cpu._zr,
+            "next_ng": new_cpu._ng,
+            "next_memory_out": new_memory.out,
+            "next_keyboard": new_memory.keyboard.out,
+            **{f"next_ram{i}": r.out for i, r in enumerate(_registers(new_memory.ram))},
+            **{f"next_screen{i}": r.out for i, r in enumerate(_registers(new_memory.screen))},
+        }
+
+    return trace(
+        "Computer",
+        fn,
+        {
+            "instruction": 16,
+            "reset": 1,
+            "a": 16,
+            "d": 16,
+            "pc": 16,
+            "zr": 1,
+            "ng": 1,
+            "memory_out": 16,
+            "keyboard": 16,
+            **{f"ram{i}": 16 for i in range(ram_words)},
+            **{f"screen{i}": 16 for i in range(screen_words)},
+        },
+    )
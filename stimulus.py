@@ -0,0 +1,138 @@
+"""Seeded, batched random stimulus for tests and fuzzing.
+
+A `Stimulus` draws whole batches of 16-bit words, addresses and valid Hack instructions
+at once, either as packed `array("H")`s or, with `numpy=True`, as NumPy `uint16` arrays.
+Two generators with the same seed produce the same batches. Use `to_bits` or `to_words`
+to convert a batch to the tuple or `Word16` form taken by the components.
+"""
+
+import decoder
+import random
+import sys
+
+from array import array
+from itertools import compress
+from typing import Any, Iterable
+from utils import Word16, int_to_bit_vector
+
+
+_C_INSTRUCTIONS: array | None = None
+
+# The translation tables that mask every byte with each byte mask
+_MASKS = [bytes(b & mask for b in range(256)) for mask in range(256)]
+
+
+def _c_instructions() -> array:
+    """All valid C-instructions, in increasing order."""
+    global _C_INSTRUCTIONS
+
+    if _C_INSTRUCTIONS is None:
+        table = decoder.load()
+        _C_INSTRUCTIONS = array(
+            "H", (w for w in range(2**15, 2**16) if table[w] & decoder.VALID)
+        )
+
+    return _C_INSTRUCTIONS
+
+
+class Stimulus:
+    """A seeded source of batches of random stimulus."""
+
+    def __init__(self, seed: int | None = None, numpy: bool = False) -> None:
+        self.seed = seed
+        self.numpy = numpy
+        self._rng = random.Random(seed)
+        self._np_rng = None
+
+        if numpy:
+            import numpy as np
+
+            self._np_rng = np.random.default_rng(seed)
+
+    def words(self, count: int, width: int = 16) -> Any:
+        """Returns `count` random `width`-bit words."""
+        # pre-conditions
+        assert isinstance(count, int) and count >= 0, "`count` must be a non-negative integer"
+        assert isinstance(width, int) and 1 <= width <= 16, "`width` must be in [1, 16]"
+
+        # body
+        if self._np_rng is not None:
+            import numpy as np
+
+            out = self._np_rng.integers(0, 2**width, size=count, dtype=np.uint16)
+        else:
+            raw = bytearray(self._rng.randbytes(2 * count))
+
+            if width < 16:
+                # masked a byte at a time, low bytes first, without a pass over the words
+                mask = (1 << width) - 1
+                raw[0::2] = raw[0::2].translate(_MASKS[mask & 0xFF])
+                raw[1::2] = raw[1::2].translate(_MASKS[mask >> 8])
+
+            out = array("H", raw)
+
+            if sys.byteorder != "little":
+                out.byteswap()  # the same words on every platform
+
+        # post-conditions
+        assert len(out) == count, "output must have `count` words"
+
+        return out
+
+    def addresses(self, count: int, width: int) -> Any:
+        """Returns `count` random `width`-bit addresses, e.g. `width=14` for `RAM16K`."""
+        return self.words(count, width)
+
+    def instructions(self, count: int, c_fraction: float = 0.5) -> Any:
+        """Returns `count` random valid Hack instructions, of which about `c_fraction` are C-instructions."""
+        # pre-conditions
+        assert isinstance(count, int) and count >= 0, "`count` must be a non-negative integer"
+        assert 0.0 <= c_fraction <= 1.0, "`c_fraction` must be in [0, 1]"
+
+        # body
+        c_instructions = _c_instructions()
+
+        if self._np_rng is not None:
+            import numpy as np
+
+            is_c = self._np_rng.random(count) < c_fraction
+            cs = self._np_rng.choice(np.asarray(c_instructions, dtype=np.uint16), size=count)
+            as_ = self._np_rng.integers(0, 2**15, size=count, dtype=np.uint16)
+            out = np.where(is_c, cs, as_).astype(np.uint16)
+        else:
+            # a batch of A-instructions, with C-instructions written over a random subset of
+            # them, chosen a byte per instruction, i.e. `c_fraction` to the nearest 1/256
+            out = self.words(count, 15)
+            threshold = round(c_fraction * 256)
+            is_c = self._rng.randbytes(count).translate(bytes(b < threshold for b in range(256)))
+            cs = self._choose(c_instructions, is_c.count(1))
+
+            for i, c in zip(compress(range(count), is_c), cs):
+                out[i] = c
+
+        # post-conditions
+        assert len(out) == count, "output must have `count` instructions"
+
+        return out
+
+    def _choose(self, population: array, count: int) -> array:
+        """Returns `count` elements of `population`, at most 2^16 long, drawn with replacement."""
+        # indices past the last whole copy of `population` in 2^16 are drawn again
+        size = len(population)
+        usable = size * (2**16 // size)
+        out = array("H")
+
+        while len(out) < count:
+            out.extend(population[w % size] for w in self.words(count - len(out)) if w < usable)
+
+        return out
+
+
+def to_bits(words: Iterable[int], n: int = 16) -> list[tuple[bool, ...]]:
+    """Converts a batch of words to `n`-tuples of bools."""
+    return [int_to_bit_vector(int(w), n) for w in words]
+
+
+def to_words(words: Iterable[int]) -> list[Word16]:
+    """Converts a batch of 16-bit words to `Word16`s."""
+    return [Word16(int(w)) for w in words]
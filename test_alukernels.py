@@ -0,0 +1,68 @@
+import alukernels
+import arithmetic
+import engines
+
+from computer import CPU
+from decoder import COMP_SYMBOL_TO_INSTRUCTION
+from stimulus import Stimulus, to_bits
+from utils import Word16, int_to_bit_vector, sample_bits, to_int
+
+
+NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST = 1_024
+
+
+def test_every_comp_code_has_a_named_kernel():
+    for symbol, code in COMP_SYMBOL_TO_INSTRUCTION.items():
+        name, _ = alukernels.DISPATCH[int_to_bit_vector(code & 0b111111, n=6)]
+
+        assert name == symbol.replace("M", "A")
+
+    assert len(alukernels.DISPATCH) == 64
+
+
+def test_every_kernel_is_equivalent_to_the_gate_level_alu():
+    results = alukernels.verify(samples=256)
+
+    assert len(results) == 64
+    assert all(r.equivalent for r in results), alukernels.table(results)
+
+
+def test_verify_reports_a_wrong_kernel(monkeypatch):
+    control = alukernels.CONTROLS["D-A"]
+    monkeypatch.setitem(alukernels.DISPATCH, control, ("D-A", alukernels.KERNELS["A-D"]))
+
+    results = {r.control: r for r in alukernels.verify(samples=16)}
+
+    assert not results[control].equivalent
+    assert results[control].counterexample["x"] != results[control].counterexample["y"]
+    assert all(r.equivalent for c, r in results.items() if c != control)
+
+
+def test_outputs_are_equal_to_the_reference_outputs():
+    for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST):
+        xs, ys, controls = sample_bits(16), sample_bits(16), sample_bits(6)
+
+        for args in [(xs, ys), (Word16(to_int(xs)), ys), (xs, Word16(to_int(ys)))]:
+            out, zr, ng = alukernels.ALU(*args, *controls)
+            reference = arithmetic.ALU(*args, *controls)
+
+            assert type(out) is type(reference[0])
+            assert (out, zr, ng) == reference
+
+
+def test_cpu_is_equivalent_under_the_engine():
+    # Given
+    stimulus = Stimulus(seed=0)
+    cycles = NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST // 4
+    instructions = to_bits(stimulus.instructions(cycles))
+    in_ms = to_bits(stimulus.words(cycles))
+    reference = fast = CPU.create()
+
+    # When / Then
+    for cycle, (instruction, in_m) in enumerate(zip(instructions, in_ms)):
+        reference = reference(instruction, in_m, cycle == 0)
+
+        with engines.using(alukernels.ENGINE):
+            fast = fast(instruction, in_m, cycle == 0)
+
+        assert fast == reference
@@ -313,3 +313,20 @@ def test_alu_f_of_x_and_y_equals_x_or_y():
         assert out == gates.OR16(xs, ys)
         assert zr == all(o == False for o in out)
         assert ng == (out[0] == True)
+
+
+def test_alu_takes_the_int_path_for_word16_inputs():
+    for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST):
+        xs = utils.sample_bits(16)
+        ys = utils.sample_bits(16)
+        control = utils.sample_bits(6)
+
+        out, zr, ng = arithmetic.ALU(xs, ys, *control)
+        word_out, word_zr, word_ng = arithmetic.ALU(
+            utils.as_word(xs), utils.as_word(ys), *control
+        )
+
+        assert isinstance(word_out, utils.Word16)
+        assert word_out == out
+        assert word_zr == zr
+        assert word_ng == ng
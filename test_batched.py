@@ -0,0 +1,140 @@
+import arithmetic
+import gates
+import itertools
+import pytest
+
+from utils import int_to_bit_vector, to_int
+
+np = pytest.importorskip("numpy")
+batched = pytest.importorskip("batched")
+
+
+NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST = 1_024
+
+rng = np.random.default_rng(0)
+
+
+def _words(n: int = NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST):
+    return rng.integers(0, 2**16, size=n, dtype=np.uint16)
+
+
+def _tuples(words) -> list[tuple[bool, ...]]:
+    return [int_to_bit_vector(int(w), n=16) for w in words]
+
+
+def test_bits_round_trip_through_words():
+    words = _words()
+    bits = batched._bits(words)
+
+    assert bits.shape == (len(words), 16)
+    assert [tuple(map(bool, b)) for b in bits] == _tuples(words)
+    assert np.array_equal(batched._words(bits), words)
+
+
+@pytest.mark.parametrize("name", ["AND", "OR", "NAND", "XOR"])
+def test_binary_gates_are_equivalent_to_the_reference(name: str):
+    x, y = np.array(list(itertools.product([False, True], repeat=2))).T
+    out = getattr(batched, f"{name}_batch")(x, y)
+
+    assert list(out) == [getattr(gates, name)(bool(a), bool(b)) for a, b in zip(x, y)]
+
+
+def test_single_bit_selectors_are_equivalent_to_the_reference():
+    x, y, sel = np.array(list(itertools.product([False, True], repeat=3))).T
+
+    assert list(batched.NOT_batch(x)) == [gates.NOT(bool(a)) for a in x]
+    assert list(batched.MUX_batch(x, y, sel)) == [
+        gates.MUX(bool(a), bool(b), bool(s)) for a, b, s in zip(x, y, sel)
+    ]
+    assert [tuple(o) for o in batched.DMUX_batch(x, sel)] == [
+        gates.DMUX(bool(a), bool(s)) for a, s in zip(x, sel)
+    ]
+
+
+@pytest.mark.parametrize("name", ["AND16", "OR16"])
+def test_bitwise_16_bit_gates_are_equivalent_to_the_reference(name: str):
+    xs, ys = _words(), _words()
+    out = getattr(batched, f"{name}_batch")(xs, ys)
+
+    assert out.dtype == np.uint16
+    assert _tuples(out) == [
+        getattr(gates, name)(a, b) for a, b in zip(_tuples(xs), _tuples(ys))
+    ]
+
+
+def test_unary_16_bit_gates_are_equivalent_to_the_reference():
+    xs = _words()
+    xs[0] = 0
+
+    assert _tuples(batched.NOT16_batch(xs)) == [gates.NOT16(a) for a in _tuples(xs)]
+    assert list(batched.OR16WAY_batch(xs)) == [gates.OR16WAY(a) for a in _tuples(xs)]
+    assert list(batched.OR8WAY_batch(batched._bits(xs)[:, 8:])) == [
+        gates.OR8WAY(a[8:]) for a in _tuples(xs)
+    ]
+
+
+def test_multiplexers_are_equivalent_to_the_reference_for_every_selector():
+    inputs = [_words(64) for _ in range(8)]
+    tuples = [_tuples(xs) for xs in inputs]
+
+    for sel in (False, True):
+        out = batched.MUX16_batch(*inputs[:2], sel)
+        assert _tuples(out) == [gates.MUX16(*ts, sel) for ts in zip(*tuples[:2])]
+
+    for sel in itertools.product([False, True], repeat=2):
+        out = batched.MUX4WAY16_batch(*inputs[:4], np.array(sel))
+        assert _tuples(out) == [gates.MUX4WAY16(*ts, sel) for ts in zip(*tuples[:4])]
+
+    for sel in itertools.product([False, True], repeat=3):
+        out = batched.MUX8WAY16_batch(*inputs, np.uint8(to_int(sel)))
+        assert _tuples(out) == [gates.MUX8WAY16(*ts, sel) for ts in zip(*tuples)]
+
+
+def test_demultiplexers_are_equivalent_to_the_reference_for_every_selector():
+    for x in (False, True):
+        sels = np.array(list(itertools.product([False, True], repeat=2)))
+        assert [tuple(o) for o in batched.DMUX4WAY_batch(x, sels)] == [
+            gates.DMUX4WAY(x, tuple(map(bool, s))) for s in sels
+        ]
+
+        sels = np.array(list(itertools.product([False, True], repeat=3)))
+        assert [tuple(o) for o in batched.DMUX8WAY_batch(x, sels)] == [
+            gates.DMUX8WAY(x, tuple(map(bool, s))) for s in sels
+        ]
+
+
+def test_inputs_broadcast_and_bits_in_give_bits_out():
+    # Given
+    xs = _words(8)
+    sel = np.array([[False], [True]])  # (2, 1) against (8,)
+
+    # When
+    words = batched.MUX16_batch(xs, np.uint16(0xFFFF), sel)
+    bits = batched.MUX16_batch(batched._bits(xs), np.uint16(0xFFFF), sel)
+
+    # Then
+    assert words.shape == (2, 8)
+    assert np.array_equal(words[0], xs) and np.all(words[1] == 0xFFFF)
+    assert bits.dtype == np.bool_ and bits.shape == (2, 8, 16)
+    assert np.array_equal(batched._words(bits), words)
+
+
+def test_adders_are_equivalent_to_the_reference():
+    xs, ys = _words(), _words()
+
+    assert _tuples(batched.ADD16_batch(xs, ys)) == [
+        arithmetic.ADD16(a, b) for a, b in zip(_tuples(xs), _tuples(ys))
+    ]
+    assert _tuples(batched.INC16_batch(xs)) == [arithmetic.INC16(a) for a in _tuples(xs)]
+
+
+def test_alu_is_equivalent_to_the_reference_for_every_control_word():
+    xs, ys = _words(16), _words(16)
+
+    for controls in itertools.product([False, True], repeat=6):
+        out, zr, ng = batched.ALU_batch(xs, ys, *controls)
+
+        for i, (a, b) in enumerate(zip(_tuples(xs), _tuples(ys))):
+            assert (int_to_bit_vector(int(out[i]), n=16), zr[i], ng[i]) == arithmetic.ALU(
+                a, b, *controls
+            )
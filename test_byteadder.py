@@ -0,0 +1,79 @@
+import arithmetic
+import byteadder
+import engines
+import itertools
+import lanes
+
+from memory import PC
+from utils import Word16, sample_bits, to_int
+
+
+NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST = 1_024
+
+BYTES = list(itertools.product([False, True], repeat=8))
+
+
+def test_add16_is_equivalent_to_the_ripple_adder_for_every_input():
+    # the low byte is one table lookup with no carry in, and the high byte one lookup
+    # with the carry out of the low byte: rows with every pair of low bytes, and every
+    # pair of high bytes under either carry, reach every entry that an add can read
+    rows = [
+        (x << 8 | low_x, y << 8 | low_y)
+        for low_x, low_y in [(0, 0), (0xFF, 0x01)]
+        for x in range(256)
+        for y in range(256)
+    ]
+    rows += [(x, y) for x in range(256) for y in range(256)]
+    xs, ys = [x for x, _ in rows], [y for _, y in rows]
+
+    words = [BYTES[w >> 8] + BYTES[w & 0xFF] for w in range(2**16)]
+
+    for x, y, out in zip(xs, ys, lanes.apply(arithmetic.ADD16, xs, ys)):
+        assert byteadder.ADD16(words[x], words[y]) == words[out]
+
+
+def test_inc16_and_neg16_are_equivalent_to_the_ripple_adder_for_every_input():
+    values = list(range(2**16))
+    words = [BYTES[w >> 8] + BYTES[w & 0xFF] for w in values]
+    incremented = lanes.apply(arithmetic.INC16, values)
+    negated = lanes.apply(arithmetic.NEG16, values)
+
+    for x in values:
+        assert byteadder.INC16(words[x]) == words[incremented[x]]
+        assert byteadder.NEG16(words[x]) == words[negated[x]]
+
+
+def test_outputs_have_the_types_of_the_reference():
+    for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST):
+        xs, ys = tuple(sample_bits(16)), tuple(sample_bits(16))
+        x, y = Word16(to_int(xs)), Word16(to_int(ys))
+
+        for args in [(xs, ys), (x, ys), (xs, y), (x, y)]:
+            out, reference = byteadder.ADD16(*args), arithmetic.ADD16(*args)
+
+            assert type(out) is type(reference)
+            assert out == reference
+
+        for a in (xs, x):
+            assert type(byteadder.INC16(a)) is type(arithmetic.INC16(a))
+            assert type(byteadder.NEG16(a)) is type(arithmetic.NEG16(a))
+            assert byteadder.INC16(a) == arithmetic.INC16(a)
+            assert byteadder.NEG16(a) == arithmetic.NEG16(a)
+
+
+def test_engine_adds_inside_the_alu_and_the_pc():
+    # Given
+    reference = fast = PC.create()
+
+    # When / Then
+    for i in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST):
+        xs, ys, controls = sample_bits(16), sample_bits(16), sample_bits(6)
+        load, (inc,) = i % 64 == 0, sample_bits(1)
+        want = arithmetic.ALU(xs, ys, *controls)
+        reference = reference(xs, load, inc, False)
+
+        with engines.using(byteadder.ENGINE):
+            assert arithmetic.ALU(xs, ys, *controls) == want
+            fast = fast(xs, load, inc, False)
+
+        assert fast.out == reference.out
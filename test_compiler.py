@@ -0,0 +1,118 @@
+import arithmetic
+import compiler
+import contracts
+import engines
+import os
+import pytest
+
+from computer import CPU, Computer
+from memory import PC, RAM8, REGISTER16
+from stimulus import Stimulus, to_bits
+from utils import Word16, int_to_bit_vector, sample_bits, to_int
+
+
+NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST = 1_024
+
+
+@pytest.fixture
+def fresh_kernels(monkeypatch):
+    monkeypatch.setattr(compiler, "_KERNELS", {})
+
+
+def test_compiled_alu_is_equivalent_to_the_alu():
+    for i in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST):
+        xs, ys, controls = sample_bits(16), sample_bits(16), int_to_bit_vector(i % 64, n=6)
+
+        assert compiler.ALU(xs, ys, *controls) == arithmetic.ALU(xs, ys, *controls)
+
+
+def test_compiled_cpu_is_equivalent_to_one_cpu_cycle():
+    for instruction in Stimulus(seed=0).instructions(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST):
+        zr, ng, reset = sample_bits(3)
+        ng = ng and not zr
+        state = CPU(
+            REGISTER16.from_word(Word16(to_int(sample_bits(16)))),
+            REGISTER16.from_word(Word16(to_int(sample_bits(16)))),
+            PC(REGISTER16.from_word(Word16(to_int(sample_bits(16))))),
+            zr,
+            ng,
+            int_to_bit_vector(0 if zr else 0x8000 if ng else 1, n=16),
+            False,
+        )
+        args = int_to_bit_vector(instruction, n=16), sample_bits(16), reset
+
+        assert compiler.CPU__call__(state, *args) == state(*args)
+
+
+def test_compiled_cpu_rejects_invalid_instructions():
+    instruction = int_to_bit_vector(0x8040, n=16)  # a C-instruction with an unused comp
+
+    with pytest.raises(AssertionError, match="instruction must be a valid instruction"):
+        with contracts.policy("full", "compiler"):
+            compiler.CPU__call__(CPU.create(), instruction, sample_bits(16), False)
+
+
+def test_compiled_ram8_is_equivalent_to_one_ram8_cycle():
+    for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST // 8):
+        registers = tuple(REGISTER16.from_word(Word16(to_int(sample_bits(16)))) for _ in range(8))
+        state = RAM8(registers, sample_bits(16))
+        args = sample_bits(16), sample_bits(1)[0], sample_bits(3)
+        new = compiler.RAM8__call__(state, *args)
+
+        assert new == state(*args)
+        assert new.digest == state(*args).digest
+
+
+def test_compiled_computer_is_equivalent_to_the_interpreted_one(fresh_kernels):
+    # Given
+    program = tuple(to_bits(Stimulus(seed=0).instructions(32)))
+    interpreted = compiled = Computer.create(program)
+
+    # When / Then
+    with contracts.policy("off"):
+        for cycle in range(8):
+            interpreted = interpreted(reset=cycle == 0)
+
+            with engines.using(compiler.ENGINE):
+                compiled = compiled(reset=cycle == 0)
+
+            assert compiled == interpreted
+            assert compiled.digest == interpreted.digest
+
+
+def test_word_inputs_take_the_word_level_path():
+    state = CPU.create()
+
+    with engines.using(compiler.ENGINE):
+        new = state(Word16(0xEC10), Word16(7), False)  # D=A
+
+    assert type(new.out_m) is Word16
+
+
+def test_kernels_are_cached_on_disk(fresh_kernels, tmp_path):
+    # Given
+    cache_dir = str(tmp_path)
+
+    # When
+    compiler.load(cache_dir)
+    compiler._KERNELS.clear()
+    compiler.load(cache_dir)
+
+    # Then
+    assert sorted(os.listdir(cache_dir)) == sorted(
+        f"{name}-{compiler.fingerprint()[:16]}.bin" for name in compiler.NETLISTS
+    )
+    assert compiler.kernel("ALU").__code__.co_filename == "<compiled ALU>"
+
+
+def test_corrupt_caches_are_rebuilt(fresh_kernels, tmp_path):
+    # Given
+    cache_path = tmp_path / f"ALU-{compiler.fingerprint()[:16]}.bin"
+    cache_path.write_bytes(b"\x00corrupt")
+
+    # When
+    alu = compiler.kernel("ALU", str(tmp_path))
+
+    # Then
+    assert alu((False,) * 16, (True,) * 16, *int_to_bit_vector(0b000010, n=6))[0] == (True,) * 16
+    assert cache_path.read_bytes() != b"\x00corrupt"
@@ -1,3 +1,4 @@
+import dataclasses
 import pytest
 import random
 
@@ -13,6 +14,7 @@ from utils import (
     is_positive,
     make_one_hot,
     SymbolicInstruction,
+    Word16,
 )
 from arithmetic import INC16
 from memory import (
@@ -34,6 +36,7 @@ from computer import (
     CPU,
     Memory,
     Computer,
+    decode_fields,
     is_valid_instruction,
 )
 
@@ -937,3 +940,124 @@ def test_computer_can_draw_a_single_pixel_on_the_screen() -> None:
         new_computers[2].memory.screen.state[1:]
         == new_computers[0].memory.screen.state[1:]
     ), "all other screen pixels must be `0`"
+
+
+def test_computer_can_add_two_numbers_on_the_int_path() -> None:
+    # Given
+    instructions_int = (
+        0b0000000000000000,  # @0
+        0b1110111111001000,  # M=1
+        0b0000000000000001,  # @1
+        0b1110111111001000,  # M=1
+        0b0000000000000000,  # @0
+        0b1111110000010000,  # D=M
+        0b0000000000000001,  # @1
+        0b1111000010010000,  # D=D+M
+        0b0000000000000010,  # @2
+        0b1110001100001000,  # M=D
+    )
+
+    instructions = tuple(Word16(i) for i in instructions_int)
+    computer = Computer.create(instructions)
+
+    # When
+    new_computer = computer(reset=True)
+
+    for _ in range(len(instructions)):
+        new_computer = new_computer(reset=False)
+
+    # Then
+    assert isinstance(new_computer.cpu.out_m, Word16)
+    assert isinstance(new_computer.memory.out, Word16)
+    assert new_computer.memory.ram.state[0] == make_one_hot(n=16, i=15)
+    assert new_computer.memory.ram.state[1] == make_one_hot(n=16, i=15)
+    assert new_computer.memory.ram.state[2] == make_one_hot(n=16, i=14)
+    assert new_computer.cpu.d_register.out == make_one_hot(n=16, i=14)
+    assert all(
+        s == ZERO16 for s in new_computer.memory.ram.state[3:]
+    ), "all other RAM addresses must be `0`"
+
+
+def test_computer_digest_fingerprints_repeated_states() -> None:
+    # Given
+    instructions_int = (
+        0b0000000000000000,  # @0
+        0b1110101010000111,  # 0;JMP
+    )
+
+    instructions = tuple(Word16(i) for i in instructions_int)
+    computer = Computer.create(instructions)
+
+    # When
+    new_computers = [computer(reset=True)]
+
+    for _ in range(4):
+        new_computers.append(new_computers[-1](reset=False))
+
+    # Then
+    digests = [c.digest for c in new_computers]
+
+    assert digests[0] != digests[1], "advancing the PC must change the fingerprint"
+    assert digests[0] == digests[2] == digests[4]
+    assert digests[1] == digests[3]
+    assert len(set(digests)) == 2
+
+
+def test_computer_digest_covers_the_memory_output_and_the_flags() -> None:
+    # Given
+    computer = Computer.create((Word16(0),))
+    one = int_to_bit_vector(1, n=16)
+    negative = int_to_bit_vector(0x8000, n=16)
+
+    # When
+    other_memory_out = dataclasses.replace(
+        computer, memory=dataclasses.replace(computer.memory, out=one)
+    )
+    other_flags = dataclasses.replace(
+        computer, cpu=dataclasses.replace(computer.cpu, _zr=False, _ng=True, out_m=negative)
+    )
+    other_write_m = dataclasses.replace(
+        computer, cpu=dataclasses.replace(computer.cpu, write_m=True)
+    )
+
+    # Then
+    digests = {c.digest for c in (computer, other_memory_out, other_flags, other_write_m)}
+
+    assert len(digests) == 4
+    assert other_memory_out.memory.digest != computer.memory.digest
+
+
+def test_cpu_decodes_instructions_from_the_predecoded_table(monkeypatch) -> None:
+    import computer
+    import decoder
+
+    # Given
+    words = []
+    monkeypatch.setattr(computer, "entry", lambda word: words.append(word) or decoder.entry(word))
+    instruction = _build_c_instruction(
+        dest=DEST_SYMBOL_TO_INSTRUCTION["AM"],
+        comp=COMP_SYMBOL_TO_INSTRUCTION["D+M"],
+        jump=JUMP_SYMBOL_TO_INSTRUCTION["JLE"],
+    )
+    bits = int_to_bit_vector(instruction, n=16)
+
+    # When
+    CPU.create()(Word16(instruction), sample_bits(16), False)
+
+    # Then
+    assert words == [instruction]  # one lookup per cycle
+    assert decode_fields(bits) == (True, True, bits[4:10], bits[10:13], bits[13:])
+    assert decode_fields(int_to_bit_vector(_build_a_instruction(0x1234), n=16))[:2] == (
+        False,
+        False,
+    )
+
+
+def test_computer_components_are_slotted() -> None:
+    # Given
+    computer = Computer.create(())
+
+    # Then
+    for component in (computer, computer.cpu, computer.memory, computer.rom):
+        assert not hasattr(component, "__dict__")
+        assert not hasattr(component, "__weakref__")
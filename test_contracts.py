@@ -0,0 +1,138 @@
+import contracts
+import pytest
+import utils
+
+from gates import AND, MUX16
+from computer import CPU
+from memory import RAM8, RAM64
+
+
+@pytest.fixture(autouse=True)
+def _reset_policies():
+    yield
+    contracts.reset()
+
+
+def test_default_policy_is_full():
+    assert contracts.level("gates.AND") == contracts.FULL
+    assert contracts.level("memory.RAM16K") == contracts.FULL
+
+
+def test_component_policy_overrides_module_policy_which_overrides_default():
+    contracts.set_policy("boundary")
+    contracts.set_policy("off", "memory")
+    contracts.set_policy("full", "memory.RAM16K")
+
+    assert contracts.level("gates.AND") == contracts.BOUNDARY
+    assert contracts.level("memory.RAM8") == contracts.OFF
+    assert contracts.level("memory.RAM16K") == contracts.FULL
+
+
+def test_sampled_policy_runs_full_checks_every_n_calls():
+    contracts.set_policy("sampled", "memory.RAM8", every=4)
+
+    levels = [contracts.level("memory.RAM8") for _ in range(8)]
+
+    assert levels == [contracts.BOUNDARY] * 3 + [contracts.FULL] + [
+        contracts.BOUNDARY
+    ] * 3 + [contracts.FULL]
+
+
+def test_sampled_module_policy_counts_the_calls_of_every_component():
+    contracts.set_policy("sampled", "memory", every=3)
+
+    levels = [
+        (contracts.level("memory.RAM8"), contracts.level("memory.RAM64")) for _ in range(6)
+    ]
+
+    assert levels == [(contracts.BOUNDARY, contracts.BOUNDARY)] * 2 + [
+        (contracts.FULL, contracts.FULL)
+    ] + [(contracts.BOUNDARY, contracts.BOUNDARY)] * 2 + [(contracts.FULL, contracts.FULL)]
+    assert contracts.get_policy("memory.RAM8").calls == {"memory.RAM8": 6, "memory.RAM64": 6}
+
+
+def test_sampled_components_run_full_checks_every_n_of_their_own_calls(monkeypatch):
+    # Given
+    ram8, cpu = RAM8.create(), CPU.create()
+    _ = ram8.digest  # cached, so only the `load=0` check hashes the registers
+    hashes, post_init_levels = [], []
+    merkle_hash, post_init = RAM8._merkle_hash, CPU.__post_init__
+
+    def counting_merkle_hash(self):  # type: ignore
+        hashes.append(self)
+        return merkle_hash(self)
+
+    def recording_post_init(self):  # type: ignore
+        post_init_levels.append(contracts.peek("computer.CPU"))
+        post_init(self)
+
+    monkeypatch.setattr(RAM8, "_merkle_hash", counting_merkle_hash)
+    monkeypatch.setattr(CPU, "__post_init__", recording_post_init)
+
+    # When
+    with contracts.policy("sampled", every=2):
+        for _ in range(4):
+            ram8 = ram8(utils.Word16(7), False, (False, True, False))
+            cpu = cpu(utils.Word16(0xEC10), utils.Word16(3), False)  # D=A
+
+    # Then
+    assert len(hashes) == 2  # the FULL `load=0` post-condition, on every other call
+    assert post_init_levels == [contracts.BOUNDARY, contracts.FULL] * 2
+
+
+def test_policy_context_manager_restores_previous_policies():
+    contracts.set_policy("boundary", "gates")
+
+    with contracts.policy("off"):
+        assert contracts.level("gates.AND") == contracts.BOUNDARY
+        assert contracts.level("arithmetic.ALU") == contracts.OFF
+
+    assert contracts.level("gates.AND") == contracts.BOUNDARY
+    assert contracts.level("arithmetic.ALU") == contracts.FULL
+
+
+def test_invalid_policies_are_rejected():
+    with pytest.raises(AssertionError):
+        contracts.set_policy("sometimes")
+
+    with pytest.raises(AssertionError):
+        contracts.set_policy("full", every=2)
+
+
+def test_interface_checks_run_unless_checking_is_off():
+    with pytest.raises(AssertionError):
+        AND(1, 0)  # type: ignore
+
+    with contracts.policy("boundary", "gates.AND"):
+        with pytest.raises(AssertionError):
+            AND(1, 0)  # type: ignore
+
+    with contracts.policy("off", "gates.AND"):
+        assert not AND(1, 0)  # type: ignore
+
+    with contracts.policy("off", "gates"):
+        assert MUX16(utils.ZERO16, (1,) * 16, True) == (1,) * 16  # type: ignore
+
+
+def test_boundary_checks_skip_state_comparisons(monkeypatch):
+    # Given
+    ram64 = RAM64.create()
+    reads = []
+    merkle_hash = RAM64._merkle_hash
+
+    monkeypatch.setattr(
+        RAM64, "_merkle_hash", lambda self: reads.append(1) or merkle_hash(self)
+    )
+
+    # When
+    with contracts.policy("boundary", "memory"):
+        ram64(utils.sample_bits(16), False, utils.sample_bits(6))
+
+    # Then
+    assert reads == []
+
+    # When
+    ram64(utils.sample_bits(16), False, utils.sample_bits(6))
+
+    # Then
+    assert len(reads) > 0
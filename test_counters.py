@@ -0,0 +1,90 @@
+import arithmetic
+import counters
+import gates
+import json
+
+from computer import Computer
+from memory import RAM64
+from stimulus import Stimulus, to_bits
+from utils import sample_bits
+
+
+NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST = 1_024
+
+
+def test_nothing_is_wrapped_outside_counting():
+    before = gates.AND, arithmetic.AND, arithmetic.ALU, Computer.__call__
+
+    with counters.counting():
+        assert gates.AND is not before[0]
+
+    assert (gates.AND, arithmetic.AND, arithmetic.ALU, Computer.__call__) == before
+
+
+def test_primitives_cost_one_gate_each():
+    with counters.counting() as counts:
+        for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST):
+            gates.XOR(*sample_bits(2))
+            gates.DMUX(*sample_bits(2))
+
+    assert counts.calls == counts.gates == {
+        (counters.TOP, "XOR"): NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST,
+        (counters.TOP, "DMUX"): NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST,
+    }
+    assert counts.total == 2 * NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST
+
+
+def test_composite_gates_include_the_primitives_they_call():
+    with counters.counting() as counts:
+        gates.MUX16(sample_bits(16), sample_bits(16), True)
+
+    assert counts.calls == {(counters.TOP, "MUX16"): 1, (counters.TOP, "MUX"): 16}
+    assert counts.gates[counters.TOP, "MUX16"] == counts.total == 16
+
+
+def test_gates_are_attributed_to_the_enclosing_component():
+    # Given
+    ram = RAM64.create()
+
+    # When
+    with counters.counting() as counts:
+        ram(sample_bits(16), True, sample_bits(6))
+
+    # Then
+    assert counts.calls[counters.TOP, "RAM64"] == 1
+    assert counts.calls["RAM64", "RAM8"] == 8
+    assert counts.calls["RAM8", "DMUX8WAY"] == 8
+    assert counts.gates[counters.TOP, "RAM64"] == counts.total
+    assert counts.calls["REGISTER16", "BIT"] == 64 * 16  # every register is clocked
+    assert counts.calls["BIT", "MUX"] == 64 * 16
+
+
+def test_a_computer_cycle_is_broken_down_by_component():
+    # Given
+    computer = Computer.create(tuple(to_bits(Stimulus(seed=0).instructions(16))))
+
+    # When
+    with counters.counting() as counts:
+        computer(reset=True)
+
+    # Then
+    cycle = counts.gates[counters.TOP, "Computer"]
+    parts = counts.gates["Computer", "CPU"] + counts.gates["Computer", "Memory"]
+
+    assert cycle == counts.total == parts + counts.gates["Computer", "ROM32K"]
+    assert 0 < counts.gates["CPU", "ALU"] < counts.gates["Computer", "CPU"]
+    assert 0 < counts.gates["Memory", "RAM16K"] < counts.gates["Computer", "Memory"]
+
+
+def test_reports_list_every_row():
+    with counters.counting() as counts:
+        arithmetic.ADD16(sample_bits(16), sample_bits(16))
+
+    report = json.loads(counts.to_json())
+    table = counts.table().splitlines()
+
+    assert report["total"] == counts.total
+    assert {(row["component"], row["callee"]) for row in report["rows"]} == set(counts.calls)
+    assert report["rows"][0]["callee"] == "ADD16"
+    assert len(table) == len(counts.calls) + 2
+    assert table[1].split()[:3] == [counters.TOP, "ADD16", "1"]
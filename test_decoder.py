@@ -0,0 +1,81 @@
+import decoder
+import pytest
+
+from decoder import (
+    DEST_SYMBOL_TO_INSTRUCTION,
+    COMP_SYMBOL_TO_INSTRUCTION,
+    JUMP_SYMBOL_TO_INSTRUCTION,
+    decode,
+    is_valid,
+)
+from utils import int_to_bit_vector, to_int
+
+
+def _is_valid_instruction_by_slicing(word: int) -> bool:
+    """The validity check from before the decode table, kept as the reference."""
+    instruction = int_to_bit_vector(word, n=16)
+
+    if instruction[0] == False:
+        return True
+
+    return (
+        to_int(instruction[3:10]) in COMP_SYMBOL_TO_INSTRUCTION.values()
+        and to_int(instruction[10:13]) in DEST_SYMBOL_TO_INSTRUCTION.values()
+        and to_int(instruction[13:16]) in JUMP_SYMBOL_TO_INSTRUCTION.values()
+    )
+
+
+def test_validity_bitmap_is_correct_for_every_word():
+    for word in range(2**16):
+        assert is_valid(word) == _is_valid_instruction_by_slicing(word)
+
+
+def test_decoded_fields_match_the_bits_of_every_word():
+    for word in range(2**16):
+        instruction = decode(word)
+        bits = int_to_bit_vector(word, n=16)
+
+        assert instruction.valid == is_valid(word)
+        assert instruction.is_c_instruction == bits[0]
+
+        if instruction.is_c_instruction and instruction.valid:
+            assert instruction.a == bits[3]
+            assert instruction.alu_controls == bits[4:10]
+            assert instruction.dest == to_int(bits[10:13])
+            assert instruction.jump == to_int(bits[13:16])
+        else:
+            assert (instruction.a, instruction.alu, instruction.dest, instruction.jump) == (
+                False,
+                0,
+                0,
+                0,
+            )
+
+
+def test_tables_round_trip_through_the_disk_cache(tmp_path):
+    # Given
+    cache_path = str(tmp_path / "decoder.bin")
+    table = decoder.load()
+
+    # When
+    built = decoder.load(cache_path)
+    loaded = decoder.load(cache_path)
+
+    # Then
+    assert built == table
+    assert loaded == table
+    assert all(is_valid(w) == _is_valid_instruction_by_slicing(w) for w in range(0, 2**16, 7))
+
+
+@pytest.mark.parametrize("contents", [b"", b"HACKDEC0" + bytes(2**17 + 2**13 + 8)])
+def test_stale_caches_are_rebuilt(tmp_path, contents: bytes):
+    # Given
+    cache_path = tmp_path / "decoder.bin"
+    cache_path.write_bytes(contents)
+
+    # When
+    table = decoder.load(str(cache_path))
+
+    # Then
+    assert table == decoder._build()[0]
+    assert cache_path.read_bytes() != contents
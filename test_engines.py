@@ -0,0 +1,81 @@
+import arithmetic
+import engines
+import gates
+import intgates
+import memory
+import pytest
+
+from computer import CPU
+from memory import PC, REGISTER16
+from stimulus import Stimulus, to_bits
+from utils import ZERO16, Word16, as_word, sample_bits
+
+
+def test_installing_an_engine_rebinds_every_reference_until_uninstalled():
+    # Given
+    reference = gates.MUX16
+
+    # When
+    with engines.using(intgates.ENGINE):
+        # Then
+        assert gates.MUX16 is intgates.MUX16
+        assert arithmetic.MUX16 is intgates.MUX16
+        assert memory.MUX16 is intgates.MUX16
+        assert type(arithmetic.ALU(sample_bits(16), sample_bits(16), *[False] * 6)[0]) is Word16
+
+    assert gates.MUX16 is reference
+    assert arithmetic.MUX16 is reference
+    assert memory.MUX16 is reference
+
+
+def test_engines_nest():
+    # Given
+    reference = gates.NOT16
+    inner = lambda xs: intgates.NOT16(xs)
+
+    # When / Then
+    with engines.using(intgates.ENGINE):
+        with engines.using({"gates.NOT16": inner}):
+            assert arithmetic.NOT16 is inner
+
+        assert arithmetic.NOT16 is intgates.NOT16
+
+    assert arithmetic.NOT16 is reference
+
+
+def test_unknown_components_are_rejected():
+    with pytest.raises(AssertionError):
+        engines.install({"gates.NOT32": intgates.NOT16})
+
+
+def test_the_cpu_is_unchanged_by_the_int_gates():
+    # Given
+    stimulus = Stimulus(seed=0)
+    instructions = to_bits(stimulus.instructions(32))
+    words = to_bits(stimulus.words(3 * 32))
+    cpus = [
+        CPU(
+            a_register=REGISTER16.from_word(as_word(words[3 * i])),
+            d_register=REGISTER16.from_word(as_word(words[3 * i + 1])),
+            pc=PC.create(),
+            _zr=True,
+            _ng=False,
+            out_m=ZERO16,
+            write_m=False,
+        )
+        for i in range(32)
+    ]
+
+    for cpu, instruction, in_m in zip(cpus, instructions, words[2::3]):
+        # When
+        reference = cpu(instruction, in_m, reset=False)
+
+        with engines.using(intgates.ENGINE):
+            new_cpu = cpu(instruction, in_m, reset=False)
+
+        # Then
+        assert new_cpu.out_m == reference.out_m
+        assert new_cpu.write_m == reference.write_m
+        assert new_cpu.a_register is reference.a_register
+        assert new_cpu.d_register is reference.d_register
+        assert new_cpu.pc_out == reference.pc_out
@@ -0,0 +1,89 @@
+import equivalence
+import gates
+import intgates
+import pytest
+
+from utils import Word16
+
+
+def test_the_gates_are_proved_equivalent():
+    for gate in equivalence.GATES:
+        result = equivalence.check(gate, getattr(gates, gate))
+
+        assert result.equivalent
+        assert result.proved
+        assert not result.black_box
+        assert result.rows == equivalence.rows(gate)
+
+
+def test_fast_paths_are_equivalent_on_every_bit_slice():
+    results = equivalence.check_engine(intgates.ENGINE)
+
+    assert {r.gate for r in results} == {"MUX4WAY16", "MUX8WAY16"}
+    assert all(r.equivalent and not r.proved and r.black_box for r in results)
+    assert "(black box)" in equivalence.table(results)
+
+
+def test_bugs_in_an_implementation_are_raised_not_black_boxed():
+    def MUX4WAY16(xs, ys, zs, ws, sel):  # type: ignore
+        raise ValueError("a bug")
+
+    def DMUX4WAY(x, sel):  # type: ignore
+        assert False, "a broken post-condition"
+
+    with pytest.raises(ValueError, match="a bug"):
+        equivalence.check("MUX4WAY16", MUX4WAY16)
+
+    with pytest.raises(AssertionError, match="a broken post-condition"):
+        equivalence.check("DMUX4WAY", DMUX4WAY)
+
+
+def test_batched_fast_paths_are_equivalent():
+    pytest.importorskip("numpy")
+    batched = pytest.importorskip("batched")
+
+    for gate in equivalence.GATES:
+        assert equivalence.check(gate, getattr(batched, f"{gate}_batch"), batched=True).equivalent
+
+
+def test_swapped_selector_bits_are_caught():
+    def MUX4WAY16(xs, ys, zs, ws, sel):  # type: ignore
+        return Word16.from_bits((xs, ys, zs, ws)[sel[1] << 1 | sel[0]])
+
+    result = equivalence.check("MUX4WAY16", MUX4WAY16)
+
+    assert not result.equivalent
+    assert result.counterexample is not None
+    assert result.counterexample["inputs"][-1] in [(False, True), (True, False)]
+
+
+def test_bits_leaking_into_other_positions_are_caught():
+    def MUX8WAY16(*args):  # type: ignore
+        out = gates.MUX8WAY16(*args)
+        return (out[1],) + tuple(out[1:])
+
+    result = equivalence.check("MUX8WAY16", MUX8WAY16)
+
+    assert 0 < result.mismatches < result.rows
+
+
+def test_wrong_demultiplexers_are_caught():
+    def DMUX8WAY(x, sel):  # type: ignore
+        return gates.DMUX8WAY(x, sel)[:7] + (x,)
+
+    result = equivalence.check("DMUX8WAY", DMUX8WAY)
+
+    assert result.mismatches == 7
+    assert result.proved
+
+
+def test_traced_gates_reading_other_slices_are_not_proved():
+    def MUX4WAY16(xs, ys, zs, ws, sel):  # type: ignore
+        out = gates.MUX4WAY16(xs, ys, zs, ws, sel)
+        zero = gates.AND(xs[0], gates.NOT(xs[0]))  # always `False`, but reads bit 0
+        return (out[0],) + tuple(gates.OR(b, zero) for b in out[1:])
+
+    result = equivalence.check("MUX4WAY16", MUX4WAY16)
+
+    assert result.equivalent
+    assert not result.proved
@@ -0,0 +1,118 @@
+import contracts
+import events
+import netlist
+import pytest
+
+from computer import Computer
+from decoder import COMP_SYMBOL_TO_INSTRUCTION, DEST_SYMBOL_TO_INSTRUCTION, JUMP_SYMBOL_TO_INSTRUCTION
+from memory import RAM8
+from utils import int_to_bit_vector, sample_bits, to_int
+
+
+NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST = 1_024
+
+
+def _c(comp: str, dest: str = "null", jump: str = "null") -> int:
+    return (
+        0b111 << 13
+        | COMP_SYMBOL_TO_INSTRUCTION[comp] << 6
+        | DEST_SYMBOL_TO_INSTRUCTION[dest] << 3
+        | JUMP_SYMBOL_TO_INSTRUCTION[jump]
+    )
+
+
+COUNTDOWN = [
+    10,  # @10
+    _c("A", "D"),  # D=A
+    0,  # @0
+    _c("D", "M"),  # M=D
+    0,  # (LOOP) @0
+    _c("M-1", "M"),  # M=M-1
+    _c("M", "D"),  # D=M
+    4,  # @LOOP
+    _c("D", jump="JGT"),  # D;JGT
+    9,  # (END) @END
+    _c("0", jump="JMP"),  # 0;JMP
+]
+
+
+def test_steps_agree_with_full_evaluation():
+    # Given
+    n = netlist.alu()
+    simulator = events.EventSimulator(n)
+
+    # When / Then
+    for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST):
+        inputs = {
+            port: to_int(sample_bits(len(ws))) if len(ws) > 1 else sample_bits(1)[0]
+            for port, ws in n.inputs.items()
+        }
+        simulator.step(inputs)
+
+        assert {port: simulator.read(port) for port in n.outputs} == n.evaluate(inputs)
+
+
+def test_unchanged_inputs_evaluate_no_gates():
+    simulator = events.EventSimulator(netlist.alu())
+
+    first = simulator.step({"xs": 0x1234, "ys": 0x00FF, "f": 1})
+    second = simulator.step({"xs": 0x1234, "ys": 0x00FF, "f": 1})
+    third = simulator.step({"ys": 0x00FE})
+
+    assert 0 < first <= len(simulator.netlist.gates)
+    assert second == 0
+    assert 0 < third < len(simulator.netlist.gates)
+    assert simulator.evaluated == [first, second, third]
+
+
+def test_state_is_latched_between_steps():
+    # Given
+    simulator = events.EventSimulator(netlist.ram8())
+    reference = RAM8.create()
+
+    # When / Then
+    for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST // 8):
+        xs, (load,), address = sample_bits(16), sample_bits(1), sample_bits(3)
+        simulator.step({"xs": to_int(xs), "load": load, "address": to_int(address)})
+        reference = reference(xs, load, address)
+
+        assert simulator.read("out") == to_int(reference.out)
+        assert [simulator.read(f"r{i}") for i in range(8)] == [
+            reference.read(i).value for i in range(8)
+        ]
+
+
+@pytest.fixture(scope="module")
+def countdown() -> tuple[events.Computer, list[Computer]]:
+    simulated = events.Computer(COUNTDOWN)
+    interpreted = [Computer.create(tuple(int_to_bit_vector(i, n=16) for i in COUNTDOWN))]
+
+    with contracts.policy("off"):
+        for cycle in range(48):
+            simulated(reset=cycle == 0)
+            interpreted.append(interpreted[-1](reset=cycle == 0))
+
+    return simulated, interpreted
+
+
+def test_computer_is_equivalent_to_the_interpreted_computer(countdown):
+    simulated, interpreted = countdown
+    final = interpreted[-1]
+
+    assert simulated.read("a") == to_int(final.cpu.a_register.out)
+    assert simulated.read("d") == to_int(final.cpu.d_register.out)
+    assert simulated.read("pc") == to_int(final.cpu.pc.out)
+    assert simulated.read("memory_out") == to_int(final.memory.out)
+    assert all(simulated.read(f"ram{i}") == final.memory.ram.read(i).value for i in range(2**14))
+    assert all(
+        simulated.read(f"screen{i}") == final.memory.screen.read(i).value for i in range(2**13)
+    )
+
+
+def test_computer_evaluates_a_fraction_of_the_netlist_per_cycle(countdown):
+    simulated, _ = countdown
+    gates = len(simulated.simulator.netlist.gates)
+
+    assert len(simulated.evaluated) == 48
+    assert all(0 <= e < gates for e in simulated.evaluated)
+    assert sum(simulated.evaluated) < 0.1 * gates * len(simulated.evaluated)
@@ -0,0 +1,89 @@
+import arithmetic
+import pytest
+
+from utils import int_to_bit_vector, sample_bits, to_int
+
+np = pytest.importorskip("numpy")
+exhaustive = pytest.importorskip("exhaustive")
+
+
+NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST = 1_024
+
+
+def test_there_is_a_control_word_per_comp_code_without_m():
+    assert len(exhaustive.CONTROLS) == 18
+    assert exhaustive.CONTROLS["D+A"] == 0b000010
+    assert exhaustive.CONTROLS["D|A"] == 0b010101
+
+
+def test_spec_is_the_gate_level_alu():
+    for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST):
+        xs, ys, controls = sample_bits(16), sample_bits(16), sample_bits(6)
+        out, zr, ng = exhaustive.spec(np.array([to_int(xs)], dtype=np.uint16), to_int(controls))
+        y = to_int(ys)
+
+        assert (int_to_bit_vector(int(out[0, y]), n=16), zr[0, y], ng[0, y]) == arithmetic.ALU(
+            xs, ys, *controls
+        )
+
+
+def test_implementations_are_equivalent_around_the_sign_boundary():
+    results = exhaustive.verify(xs=range(0x7FF8, 0x8008), block=8, workers=1)
+
+    assert [r.symbol for r in results] == list(exhaustive.CONTROLS)
+    assert all(r.equivalent and not r.exhaustive for r in results)
+    assert all(r.vectors == 16 << 16 for r in results)
+    assert all(set(r.mismatches) == set(exhaustive.IMPLEMENTATIONS) for r in results)
+    assert set(exhaustive.report(results)["netlists"]) == {"gates", "kogge-stone", "brent-kung"}
+
+
+def test_a_wrong_implementation_is_caught_at_its_first_counterexample(monkeypatch):
+    def wrong(xs, control):  # type: ignore
+        out, zr, ng = exhaustive.spec(xs, control)
+        out = out.copy()
+        out[xs >= 3, 0x1234] ^= 1  # from `x` = 3 on, with `y` = 0x1234
+
+        return out, zr, ng
+
+    monkeypatch.setitem(exhaustive.IMPLEMENTATIONS, "wrong", wrong)
+
+    (result,) = exhaustive.verify(["D&A"], ["gates", "wrong"], range(8), block=4, workers=1)
+
+    assert result.mismatches == {"gates": 0, "wrong": 5}
+    assert result.counterexamples["gates"] is None
+    assert result.counterexamples["wrong"] == {
+        "x": 3,
+        "y": 0x1234,
+        "out": 1,
+        "zr": True,  # the flags of `spec`, for 0x1234 & 3
+        "ng": False,
+        "spec": 0,
+    }
+    assert not result.equivalent
+    assert "counterexample (wrong)" in exhaustive.table([result])
+
+
+def test_a_run_resumes_from_its_checkpoint(tmp_path, monkeypatch):
+    # Given
+    path = str(tmp_path / "alu.jsonl")
+    symbols, implementations = ["D-A", "!D"], ["alukernels"]
+    first = exhaustive.verify(symbols, implementations, range(4), 2, 1, path)
+
+    # When
+    monkeypatch.setattr(exhaustive, "check", None)  # every chunk is in the checkpoint
+    resumed = exhaustive.verify(symbols, implementations, range(4), 2, 1, path)
+
+    # Then
+    assert resumed == first
+    assert len(open(path).read().splitlines()) == 1 + 2 * 2
+
+    with pytest.raises(AssertionError):
+        exhaustive.verify(symbols, implementations, range(6), 2, 1, path)
+
+
+def test_a_pool_gives_the_same_report():
+    args = (["D+1", "A-D"], ["gates", "batched"], range(0xFFF8, 0x10000), 4)
+
+    assert exhaustive.report(exhaustive.verify(*args, workers=2)) == exhaustive.report(
+        exhaustive.verify(*args, workers=1)
+    )
@@ -0,0 +1,148 @@
+import faults
+import gates
+import json
+import netlist
+import random
+
+from netlist import Netlist
+
+
+NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST = 1_024
+
+
+def _injected(n: Netlist, fault: faults.Fault, vector: faults.Vector) -> dict[str, int]:
+    """The outputs of `n` with `fault` for `vector`, by rewriting the netlist."""
+    w, v = fault
+    inputs = dict(zip(n.inputs, vector))
+
+    if w < n.first_gate:
+        port, i = next((p, ws.index(w)) for p, ws in n.inputs.items() if w in ws)
+        bit = 1 << (len(n.inputs[port]) - 1 - i)
+        inputs[port] = inputs[port] | bit if v else inputs[port] & ~bit
+    else:
+        constant = ("OR", (1, 1)) if v else ("AND", (0, 0))
+        gates_ = list(n.gates)
+        gates_[w - n.first_gate] = constant
+        n = Netlist(n.name, n.inputs, n.outputs, tuple(gates_))
+
+    return n.evaluate(inputs)
+
+
+def test_parallel_faults_agree_with_one_fault_at_a_time():
+    # Given
+    n = netlist.alu()
+    rng = random.Random(0)
+    vectors = [tuple(rng.getrandbits(len(ws)) for ws in n.inputs.values()) for _ in range(4)]
+    simulated = faults.faults(faults.sites(n))
+
+    # When
+    undetected = faults.simulate(n, simulated, vectors, workers=1, chunk=3)
+
+    # Then
+    expected = [
+        f
+        for f in simulated
+        if all(_injected(n, f, v) == n.evaluate(dict(zip(n.inputs, v))) for v in vectors)
+    ]
+
+    assert 0 < len(undetected) < len(simulated)
+    assert undetected == expected
+
+
+def test_redundant_logic_is_undetectable():
+    # Given
+    def fn(x, y):  # type: ignore
+        return {"out": gates.OR(x, gates.AND(x, y))}
+
+    n = netlist.trace("redundant", fn, {"x": 1, "y": 1})
+    and_wire = n.first_gate
+
+    # When
+    coverage = faults.coverage("redundant", n, [(0, 0), (0, 1), (1, 0), (1, 1)], workers=1)
+
+    # Then
+    assert set(coverage.undetected) == {(n.inputs["y"][0], 0), (n.inputs["y"][0], 1), (and_wire, 0)}
+    assert coverage.coverage == 5 / 8
+
+
+def test_worker_processes_agree_with_one_process():
+    n = netlist.add16()
+    rng = random.Random(0)
+    vectors = [(rng.getrandbits(16), 0) for _ in range(8)]
+    simulated = faults.faults(faults.sites(n))
+
+    assert faults.simulate(n, simulated, vectors, workers=2, chunk=2) == faults.simulate(
+        n, simulated, vectors, workers=1
+    )
+
+
+def test_random_vectors_detect_every_adder_fault():
+    n = netlist.add16()
+    rng = random.Random(0)
+    vectors = [
+        (rng.getrandbits(16), rng.getrandbits(16)) for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST)
+    ]
+
+    assert faults.coverage("ADD16", n, vectors, workers=1).coverage == 1.0
+
+
+def test_control_logic_excludes_the_datapath():
+    n = netlist.cpu()
+    wires = faults.control(n, faults.DATA_PORTS["CPU"])
+    data = {w for port in faults.DATA_PORTS["CPU"] for w in n.inputs[port]}
+
+    assert set(n.inputs["instruction"]) <= set(wires)
+    assert not data & set(wires)
+    assert set(n.outputs["write_m"]) <= set(wires)
+    assert not set(n.outputs["out_m"]) & set(wires)
+
+
+def test_vectors_are_captured_from_tests(tmp_path):
+    # Given
+    path = tmp_path / "test_captured.py"
+    path.write_text(
+        "from arithmetic import ADD16\n"
+        "from utils import int_to_bit_vector\n"
+        "\n"
+        "def test_add():\n"
+        "    for x, y in [(1, 2), (3, 4), (1, 2)]:\n"
+        "        ADD16(int_to_bit_vector(x, n=16), int_to_bit_vector(y, n=16))\n"
+    )
+
+    # When
+    vectors = faults.capture([str(path)], ["ADD16"])
+
+    # Then
+    assert vectors == {"ADD16": [(1, 2), (3, 4)]}
+
+
+def test_reports_list_undetected_faults():
+    n = netlist.add16()
+    coverage = faults.coverage("ADD16", n, [(0, 0)], workers=1)
+    report = json.loads(json.dumps(coverage.to_dict()))
+
+    assert report["faults"] == 2 * (32 + len(n.gates))
+    assert report["detected"] + len(report["undetected"]) == report["faults"]
+    assert "# ADD16 undetected: " in faults.table([coverage])
+
+
+def test_reports_on_a_test_suite_measure_output_observability(tmp_path, capsys):
+    # Given
+    path = tmp_path / "test_unasserted.py"
+    path.write_text(
+        "from arithmetic import ADD16\n"
+        "from utils import int_to_bit_vector\n"
+        "\n"
+        "def test_add():\n"
+        "    ADD16(int_to_bit_vector(1, n=16), int_to_bit_vector(2, n=16))  # never asserted\n"
+    )
+
+    # When
+    faults.main(["ADD16", "--tests", str(path), "--workers", "1", "--json"])
+
+    # Then
+    (report,) = json.loads(capsys.readouterr().out)
+
+    assert report["metric"] == faults.METRIC
+    assert report["vectors"] == 1
+    assert report["detected"] > 0  # observed at the outputs, although no test asserts on them
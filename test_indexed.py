@@ -0,0 +1,123 @@
+import contracts
+import counters
+import engines
+import equivalence
+import gates
+import indexed
+import pytest
+
+from computer import Computer, Memory
+from memory import RAM4K, RAM8, RAM8K, RAM16K, RAM64, RAM512
+from stimulus import Stimulus, to_bits
+from utils import Word16, sample_bits, to_int
+
+
+NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST = 1_024
+
+RAMS = [(RAM8, 3), (RAM64, 6), (RAM512, 9), (RAM4K, 12), (RAM8K, 13), (RAM16K, 14)]
+
+
+def test_gates_are_equivalent_to_the_cascades():
+    for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST):
+        words = [sample_bits(16) for _ in range(8)]
+        x, sel = sample_bits(1)[0], sample_bits(3)
+
+        assert indexed.MUX8WAY16(*words, sel) == gates.MUX8WAY16(*words, sel)
+        assert indexed.MUX4WAY16(*words[:4], sel[1:]) == gates.MUX4WAY16(*words[:4], sel[1:])
+        assert indexed.DMUX8WAY(x, sel) == gates.DMUX8WAY(x, sel)
+        assert indexed.DMUX4WAY(x, sel[1:]) == gates.DMUX4WAY(x, sel[1:])
+
+    assert all(r.equivalent for r in equivalence.check_engine(indexed.ENGINE))
+
+
+@pytest.mark.parametrize("cls, width", RAMS)
+def test_rams_are_equivalent_to_the_reference(cls, width):
+    # Given
+    reference = fast = cls.create()
+    cycles = NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST // 64 if width > 6 else 64
+
+    # When / Then
+    with contracts.policy("off", "memory"):
+        for _ in range(cycles):
+            xs, (load,), address = sample_bits(16), sample_bits(1), sample_bits(width)
+            reference = reference(xs, load, address)
+
+            with engines.using(indexed.ENGINE):
+                fast = fast(xs, load, address)
+
+            assert fast == reference
+            assert fast.out == reference.read(to_int(address))
+            assert fast.digest == reference.digest
+
+
+def test_word_inputs_give_word_outputs():
+    ram8 = RAM8.create()(Word16(7), True, (False, True, False))
+
+    with engines.using(indexed.ENGINE):
+        out = ram8(Word16(9), False, (False, True, False)).out
+
+    assert type(out) is Word16
+    assert out == Word16(7)
+
+
+def test_load_false_post_conditions_catch_a_write():
+    def writing_ram8(self, xs, load, address):  # type: ignore
+        return indexed.RAM8__call__(self, xs, True, address)
+
+    def writing_ram64(self, xs, load, address):  # type: ignore
+        return indexed.RAM64__call__(self, xs, True, address)
+
+    for ram, width, child in [
+        (RAM64.create(), 6, {"memory.RAM8.__call__": writing_ram8}),
+        (RAM512.create(), 9, {"memory.RAM64.__call__": writing_ram64}),
+    ]:
+        address = (False,) * width
+
+        with engines.using(indexed.ENGINE):
+            assert ram(Word16(5), False, address) == ram
+
+        # a child that writes although `load` is false
+        with pytest.raises(AssertionError, match="old value must be kept when load=0"):
+            with engines.using({**indexed.ENGINE, **child}):
+                ram(Word16(5), False, address)
+
+
+def test_memory_routes_ram_screen_and_keyboard():
+    # Given
+    reference = fast = Memory.create()
+    keyboard = (True, True) + (False,) * 13  # outside the range that `Memory` checks
+    addresses = [(False,) + sample_bits(14), (True, False) + sample_bits(13), keyboard]
+
+    # When / Then
+    with contracts.policy("off", "memory"), contracts.policy("off", "computer", "indexed"):
+        for i in range(3 * 4):
+            xs, (load,), address = sample_bits(16), sample_bits(1), addresses[i % 3]
+            reference = reference(xs, address, load)
+
+            with engines.using(indexed.ENGINE):
+                fast = fast(xs, address, load)
+
+            assert fast == reference
+            assert fast.digest == reference.digest
+
+
+def test_computer_is_equivalent_and_evaluates_no_memory_gates():
+    # Given
+    program = tuple(to_bits(Stimulus(seed=0).instructions(32)))
+    reference = fast = Computer.create(program)
+
+    # When / Then
+    with contracts.policy("off"):
+        for cycle in range(8):
+            reference = reference(reset=cycle == 0)
+
+            with engines.using(indexed.ENGINE), counters.counting() as counts:
+                fast = fast(reset=cycle == 0)
+
+            assert fast == reference
+            assert counts.gates["Computer", "Memory"] <= 16  # writing one register
+            assert {
+                callee
+                for component, callee in counts.calls
+                if component.startswith(("RAM", "Memory"))
+            } <= {cls.__name__ for cls, _ in RAMS} | {"REGISTER16"}
@@ -0,0 +1,68 @@
+import gates
+import intgates
+import itertools
+import pytest
+
+from utils import Word16, int_to_bit_vector, sample_bits
+
+
+NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST = 1_024
+
+ALL_WORDS = [int_to_bit_vector(i, n=16) for i in range(2**16)]
+
+
+def test_not16_is_equivalent_to_the_reference_for_every_input():
+    for xs in ALL_WORDS:
+        assert intgates.NOT16(xs) == gates.NOT16(xs)
+
+
+def test_or16way_is_equivalent_to_the_reference_for_every_input():
+    for xs in ALL_WORDS:
+        assert intgates.OR16WAY(xs) == gates.OR16WAY(xs)
+
+
+def test_or8way_is_equivalent_to_the_reference_for_every_input():
+    for xs in itertools.product([False, True], repeat=8):
+        assert intgates.OR8WAY(xs) == gates.OR8WAY(xs)
+
+
+@pytest.mark.parametrize("name", ["AND16", "OR16"])
+def test_bitwise_gates_are_equivalent_to_the_reference_for_every_bit_pair(name: str):
+    # every bit is computed independently, so all 4 input pairs at every position suffice
+    int_gate, reference = getattr(intgates, name), getattr(gates, name)
+
+    for i in range(16):
+        for x, y in itertools.product([False, True], repeat=2):
+            xs = (False,) * i + (x,) + (False,) * (15 - i)
+            ys = (True,) * i + (y,) + (True,) * (15 - i)
+
+            assert int_gate(xs, ys) == reference(xs, ys)
+
+    for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST):
+        xs, ys = sample_bits(16), sample_bits(16)
+        assert int_gate(xs, ys) == reference(xs, ys)
+
+
+def test_muxes_are_equivalent_to_the_reference_for_every_selector():
+    for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST // 16):
+        inputs = [sample_bits(16) for _ in range(8)]
+
+        for sel in (False, True):
+            assert intgates.MUX16(*inputs[:2], sel) == gates.MUX16(*inputs[:2], sel)
+
+        for sel in itertools.product([False, True], repeat=2):
+            assert intgates.MUX4WAY16(*inputs[:4], sel) == gates.MUX4WAY16(
+                *inputs[:4], sel
+            )
+
+        for sel in itertools.product([False, True], repeat=3):
+            assert intgates.MUX8WAY16(*inputs, sel) == gates.MUX8WAY16(*inputs, sel)
+
+
+def test_outputs_are_words_for_tuple_and_word_inputs():
+    xs, ys = sample_bits(16), Word16(0xBEEF)
+
+    assert type(intgates.NOT16(xs)) is Word16
+    assert type(intgates.AND16(xs, ys)) is Word16
+    assert type(intgates.MUX16(xs, ys, False)) is Word16
+    assert intgates.MUX16(xs, ys, True) is ys
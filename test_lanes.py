@@ -0,0 +1,136 @@
+import arithmetic
+import contracts
+import engines
+import gates
+import itertools
+import lanes
+import pytest
+
+from computer import CPU
+from stimulus import Stimulus
+from utils import int_to_bit_vector, sample_bits, to_int
+
+
+NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST = 1_024
+
+
+def test_pack_round_trips_through_unpack():
+    words = list(Stimulus(seed=0).words(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST))
+
+    assert lanes.unpack(lanes.pack(words), len(words)) == words
+    assert lanes.unpack_bits(lanes.pack_bits([True, False, True]), 3) == [True, False, True]
+    assert lanes.pack([0x8001, 0x0001]) == (0b01,) + (0,) * 14 + (0b11,)
+    assert lanes.unpack((True,) + (0,) * 15, 2) == [0x8000, 0x8000]
+
+
+def test_apply_runs_a_component_on_every_row():
+    xs = list(Stimulus(seed=1).words(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST))
+
+    assert lanes.apply(arithmetic.NEG16, xs) == [-x & 0xFFFF for x in xs]
+    assert lanes.apply(arithmetic.ADD16, xs, xs[::-1]) == lanes.add16(xs, xs[::-1])
+
+
+@pytest.mark.parametrize("component", lanes.STRUCTURE)
+def test_structure_agrees_with_the_reference_on_bools(component: str):
+    owner, name = engines._owner(component)
+    reference, circuit = getattr(owner, name), lanes.STRUCTURE[component]
+    widths = {
+        "NOT16": [16],
+        "AND16": [16, 16],
+        "OR16": [16, 16],
+        "OR8WAY": [8],
+        "MUX4WAY16": [16] * 4 + [2],
+        "DMUX4WAY": [1, 2],
+        "DMUX8WAY": [1, 3],
+        "FULLADDER": [1, 1, 1],
+    }[name]
+
+    for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST // 8):
+        args = [tuple(sample_bits(n)) if n > 1 else sample_bits(1)[0] for n in widths]
+
+        with contracts.policy("off"):
+            assert circuit(*args) == reference(*args)
+
+
+@pytest.mark.parametrize("name", ["AND", "OR", "NOT", "NAND", "XOR", "MUX", "DMUX"])
+def test_primitives_agree_with_the_reference_in_every_lane(name: str):
+    arity = {"MUX": 3}.get(name, 1 if name == "NOT" else 2)
+    inputs = list(itertools.product([False, True], repeat=arity))
+
+    with lanes.simulate(len(inputs)):
+        out = getattr(gates, name)(*[lanes.pack_bits(column) for column in zip(*inputs)])
+
+    with lanes.simulate(len(inputs)):
+        constants = [getattr(gates, name)(*xs) for xs in inputs]
+
+    expected = [getattr(gates, name)(*xs) for xs in inputs]
+
+    if name == "DMUX":
+        assert list(zip(*(lanes.unpack_bits(o, len(inputs)) for o in out))) == expected
+        assert [tuple(lanes.unpack_bits(o, 1)[0] for o in c) for c in constants] == expected
+    else:
+        assert lanes.unpack_bits(out, len(inputs)) == expected
+        assert [lanes.unpack_bits(c, 1)[0] for c in constants] == expected
+
+
+@pytest.mark.parametrize("count", [1, 64, 4_096])
+def test_add16_agrees_with_the_reference_in_every_lane(count: int):
+    stimulus = Stimulus(seed=count)
+    xs, ys = list(stimulus.words(count)), list(stimulus.words(count))
+
+    assert lanes.add16(xs, ys) == [(x + y) & 0xFFFF for x, y in zip(xs, ys)]
+
+
+def test_alu_agrees_with_the_reference_for_every_control_word():
+    stimulus = Stimulus(seed=0)
+    xs, ys = list(stimulus.words(64 * 16)), list(stimulus.words(64 * 16))
+    controls = [c for c in range(64) for _ in range(16)]
+
+    out, zr, ng = lanes.alu(xs, ys, controls)
+
+    for k, (x, y, c) in enumerate(zip(xs, ys, controls)):
+        expected_out, expected_zr, expected_ng = arithmetic.ALU(
+            int_to_bit_vector(x, n=16), int_to_bit_vector(y, n=16), *int_to_bit_vector(c, n=6)
+        )
+        assert (out[k], zr[k], ng[k]) == (to_int(expected_out), expected_zr, expected_ng)
+
+
+def test_cpu_agrees_with_the_reference_in_every_lane():
+    # Given
+    count, cycles = 64, 8
+    stimulus = Stimulus(seed=0)
+    instructions = [list(stimulus.instructions(count)) for _ in range(cycles)]
+    in_m = [list(stimulus.words(count)) for _ in range(cycles)]
+    reset = [[k % 7 == cycle for k in range(count)] for cycle in range(cycles)]
+
+    # When
+    states = lanes.cpu(instructions, in_m, reset)
+
+    # Then
+    for k, state in enumerate(states):
+        cpu = CPU.create()
+
+        for cycle in range(cycles):
+            cpu = cpu(
+                int_to_bit_vector(instructions[cycle][k], n=16),
+                int_to_bit_vector(in_m[cycle][k], n=16),
+                reset[cycle][k],
+            )
+
+        assert state == {
+            "out_m": to_int(cpu.out_m),
+            "write_m": cpu.write_m,
+            "a": to_int(cpu.a_register.out),
+            "d": to_int(cpu.d_register.out),
+            "pc": to_int(cpu.pc.out),
+        }
+
+
+def test_simulate_restores_the_gates_and_the_contract_checks():
+    before = gates.AND, contracts.level("gates.AND")
+
+    with lanes.simulate(8):
+        assert gates.AND is lanes.AND
+        assert contracts.level("gates.AND") == contracts.OFF
+
+    assert (gates.AND, contracts.level("gates.AND")) == before
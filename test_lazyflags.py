@@ -0,0 +1,120 @@
+import arithmetic
+import contracts
+import counters
+import engines
+import indexed
+import lazyflags
+
+from computer import CPU, Computer
+from decoder import COMP_SYMBOL_TO_INSTRUCTION, DEST_SYMBOL_TO_INSTRUCTION, JUMP_SYMBOL_TO_INSTRUCTION
+from stimulus import Stimulus, to_bits, to_words
+from utils import int_to_bit_vector, sample_bits
+
+
+NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST = 1_024
+
+
+def _c(comp: str, dest: str = "null", jump: str = "null") -> int:
+    return (
+        0b111 << 13
+        | COMP_SYMBOL_TO_INSTRUCTION[comp] << 6
+        | DEST_SYMBOL_TO_INSTRUCTION[dest] << 3
+        | JUMP_SYMBOL_TO_INSTRUCTION[jump]
+    )
+
+
+COUNTDOWN = [
+    10,  # @10
+    _c("A", "D"),  # D=A
+    0,  # @0
+    _c("D", "M"),  # M=D
+    0,  # (LOOP) @0
+    _c("M-1", "M"),  # M=M-1
+    _c("M", "D"),  # D=M
+    4,  # @LOOP
+    _c("D", jump="JGT"),  # D;JGT
+    9,  # (END) @END
+    _c("0", jump="JMP"),  # 0;JMP
+]
+
+
+def _cycles(count: int, seed: int = 0) -> list[tuple]:
+    stimulus = Stimulus(seed)
+    instructions = stimulus.instructions(count, c_fraction=0.75)
+    return list(zip(instructions, stimulus.words(count), (c == 0 for c in range(count))))
+
+
+def test_alu16_is_the_alu_output():
+    for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST):
+        xs, ys, controls = sample_bits(16), sample_bits(16), sample_bits(6)
+
+        assert lazyflags.ALU16(xs, ys, *controls) == arithmetic.ALU(xs, ys, *controls)[0]
+
+
+def test_cpu_is_equivalent_to_the_gate_level_cpu():
+    # Given
+    reference = lazy = CPU.create()
+
+    # When / Then
+    for instruction, in_m, reset in _cycles(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST // 4):
+        instruction, in_m = to_bits([instruction, in_m])
+        reference = reference(instruction, in_m, reset)
+
+        with engines.using(lazyflags.ENGINE):
+            lazy = lazy(instruction, in_m, reset)
+
+        assert lazy._zr is None and lazy._ng is None
+        assert (lazy.zr, lazy.ng) == (reference._zr, reference._ng)
+        assert lazy == reference
+        assert lazy.pc_out == reference.pc_out
+
+
+def test_lazy_and_gate_level_states_can_be_mixed():
+    # Given
+    reference = mixed = CPU.create()
+
+    # When / Then
+    for cycle, (instruction, in_m, reset) in enumerate(_cycles(256, seed=1)):
+        instruction, in_m = to_words([instruction, in_m])
+        reference = reference(instruction, in_m, reset)
+
+        with engines.using(lazyflags.ENGINE if cycle % 2 else {}):
+            mixed = mixed(instruction, in_m, reset)
+
+        assert mixed == reference
+
+
+def test_flags_are_derived_only_for_jumps():
+    # Given
+    cycles = _cycles(64, seed=2)
+    state = CPU.create()  # whose flags are stored, not derived
+
+    # C-instructions with a jump field after the first cycle
+    jumps = sum(bool(i >> 15 & 1 and i & 0b111) for i, _, _ in cycles[1:])
+
+    # When
+    with engines.using(lazyflags.ENGINE), counters.counting() as counts:
+        for instruction, in_m, reset in cycles:
+            state = state(*to_words([instruction, in_m]), reset)
+
+    # Then
+    assert jumps > 0
+    assert counts.calls.get(("CPU", "OR16WAY"), 0) == jumps
+
+
+def test_countdown_runs_as_on_the_gate_level_cpu():
+    # Given
+    program = tuple(int_to_bit_vector(i, n=16) for i in COUNTDOWN)
+    reference = lazy = Computer.create(program)
+
+    # When / Then
+    with contracts.policy("off"), engines.using(indexed.ENGINE):
+        for cycle in range(48):
+            reference = reference(reset=cycle == 0)
+
+            with engines.using(lazyflags.ENGINE):
+                lazy = lazy(reset=cycle == 0)
+
+            assert lazy == reference
+
+    assert lazy.memory.ram.read(0).value < 10  # the loop has counted down
@@ -0,0 +1,147 @@
+import arithmetic
+import byteadder
+import contracts
+import engines
+import indexed
+import memo
+import pytest
+
+from computer import Computer
+from decoder import COMP_SYMBOL_TO_INSTRUCTION, DEST_SYMBOL_TO_INSTRUCTION, JUMP_SYMBOL_TO_INSTRUCTION
+from utils import Word16, int_to_bit_vector, sample_bits, to_int
+
+
+NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST = 1_024
+
+
+def _c(comp: str, dest: str = "null", jump: str = "null") -> int:
+    return (
+        0b111 << 13
+        | COMP_SYMBOL_TO_INSTRUCTION[comp] << 6
+        | DEST_SYMBOL_TO_INSTRUCTION[dest] << 3
+        | JUMP_SYMBOL_TO_INSTRUCTION[jump]
+    )
+
+
+COUNTDOWN = [
+    10,  # @10
+    _c("A", "D"),  # D=A
+    0,  # @0
+    _c("D", "M"),  # M=D
+    0,  # (LOOP) @0
+    _c("M-1", "M"),  # M=M-1
+    _c("M", "D"),  # D=M
+    4,  # @LOOP
+    _c("D", jump="JGT"),  # D;JGT
+    9,  # (END) @END
+    _c("0", jump="JMP"),  # 0;JMP
+]
+
+
+def _samples(words: int) -> list[tuple]:
+    """Random `(xs, ys, controls)` triples drawn from `words` words, as tuples or `Word16`s."""
+    pool = [sample_bits(16) for _ in range(words)]
+    out = []
+
+    for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST):
+        xs, ys = (pool[to_int(sample_bits(4)) % words] for _ in "xy")
+        x_word, y_word = sample_bits(2)
+        out.append(
+            (
+                Word16(to_int(xs)) if x_word else xs,
+                Word16(to_int(ys)) if y_word else ys,
+                sample_bits(6),
+            )
+        )
+
+    return out
+
+
+def test_cache_evicts_the_least_recently_used_entry():
+    # Given
+    cache = memo.Cache(capacity=2)
+
+    # When
+    outs = [cache.lookup(key, lambda key=key: f"out{key}") for key in (1, 2, 1, 3, 2, 1)]
+
+    # Then
+    assert outs == ["out1", "out2", "out1", "out3", "out2", "out1"]
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 5, 3)
+    assert list(cache.entries) == [2, 1]
+    assert cache.hit_rate == 1 / 6
+
+
+def test_cache_capacity_must_be_positive():
+    with pytest.raises(AssertionError):
+        memo.Cache(capacity=0)
+
+
+def test_outputs_are_equal_to_the_reference_outputs():
+    # Given
+    references = {name: getattr(arithmetic, name) for name in memo.COMPONENTS}
+    samples = _samples(words=16)
+
+    # When / Then
+    with memo.memoising(capacity=64) as caches:
+        for xs, ys, controls in samples + samples[-32:]:  # the last 32 are still cached
+            calls = {"ALU": (xs, ys, *controls), "ADD16": (xs, ys), "INC16": (xs,)}
+
+            for name, args in calls.items():
+                out, reference = getattr(arithmetic, name)(*args), references[name](*args)
+
+                assert out == reference
+                assert type(out) is type(reference)
+
+    assert all(c.hits and c.misses for c in caches.values())
+    assert caches["ALU"].evictions and caches["ADD16"].evictions
+    assert all(len(c.entries) <= 64 for c in caches.values())
+
+
+def test_memoises_on_top_of_other_engines():
+    samples = _samples(words=4)
+
+    with engines.using(byteadder.ENGINE), memo.memoising(components=["ADD16"]) as caches:
+        outs = [arithmetic.ADD16(xs, ys) for xs, ys, _ in samples]
+
+    assert outs == [byteadder.ADD16(xs, ys) for xs, ys, _ in samples]
+    assert caches["ADD16"].misses <= 4 * 4 * 4
+    assert arithmetic.ADD16 is not byteadder.ADD16
+
+
+def test_countdown_loop_hits_the_caches():
+    # Given
+    program = tuple(int_to_bit_vector(i, n=16) for i in COUNTDOWN)
+    reference = fast = Computer.create(program)
+
+    # When
+    with contracts.policy("off"), engines.using(indexed.ENGINE):
+        for cycle in range(24):
+            reference = reference(reset=cycle == 0)
+
+        with memo.memoising() as caches:
+            for cycle in range(24):
+                fast = fast(reset=cycle == 0)
+
+    # Then
+    assert fast == reference
+    assert caches["ALU"].hit_rate > 0.25
+    assert caches["INC16"].hit_rate > 0.5
+    assert "hit rate" in memo.table(caches)
+
+
+def test_invalid_inputs_raise_after_a_warm_cache():
+    xs, ys = (False, *sample_bits(15)), tuple(sample_bits(16))  # `xs[1:]` packs to `xs`
+
+    with memo.memoising():
+        arithmetic.ADD16(xs, ys)
+        arithmetic.INC16(xs)
+        arithmetic.ALU(xs, ys, *[False] * 6)
+
+        with pytest.raises(AssertionError, match="must be a 16-tuple"):
+            arithmetic.ADD16(xs[1:], ys)
+
+        with pytest.raises(AssertionError, match="must be a 16-tuple"):
+            arithmetic.INC16(xs[1:])
+
+        with pytest.raises(AssertionError, match="must be `bool`s"):
+            arithmetic.ALU(xs, ys, *[0] * 6)
@@ -1,3 +1,4 @@
+import pickle
 import pytest
 import random
 import utils
@@ -428,3 +429,145 @@ def test_pc() -> None:
     assert pc(xs, True, False, True).out == ZERO16
     assert pc(xs, True, True, False).out == xs
     assert pc(xs, True, True, True).out == ZERO16
+
+
+@pytest.mark.parametrize(
+    "ram64, xs, load, address",
+    [
+        (
+            _create_random_ram64(),
+            utils.sample_bits(16),
+            random.choice([True, False]),
+            utils.sample_bits(6),
+        )
+        for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST)
+    ],
+)
+def test_ram64_takes_the_int_path_for_word16_inputs(
+    ram64: RAM64,
+    xs: tuple[bool, ...],
+    load: bool,
+    address: tuple[bool, ...],
+) -> None:
+    # When
+    new_ram64 = ram64(xs, load, address)
+    new_word_ram64 = ram64(utils.as_word(xs), load, address)
+
+    # Then
+    assert isinstance(new_word_ram64.out, utils.Word16)
+    assert new_word_ram64.out == new_ram64.out
+    assert new_word_ram64.state == new_ram64.state
+
+
+def test_register_keeps_itself_when_load_is_false_on_the_int_path() -> None:
+    # Given
+    register = _create_random_register()
+    xs = utils.as_word(utils.sample_bits(16))
+
+    # When / Then
+    assert register(xs, False) is register
+    assert register(xs, True).out == xs
+    assert register(xs, True).word == xs
+    assert register(xs, True) is REGISTER16.from_word(xs)  # registers are interned by value
+
+
+@pytest.mark.parametrize(
+    "ram64, xs, load, address",
+    [
+        (
+            _create_random_ram64(),
+            utils.sample_bits(16),
+            random.choice([True, False]),
+            utils.sample_bits(6),
+        )
+        for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST)
+    ],
+)
+def test_ram64_digest_is_a_hash_of_its_state(
+    ram64: RAM64,
+    xs: tuple[bool, ...],
+    load: bool,
+    address: tuple[bool, ...],
+) -> None:
+    # Given
+    digest = ram64.digest
+
+    # When
+    new_ram64 = ram64(xs, load, address)
+    rebuilt_ram64 = RAM64(
+        tuple(
+            RAM8(tuple(REGISTER16.from_word(utils.as_word(s)) for s in ram8.state), ZERO16)
+            for ram8 in new_ram64.ram8s
+        ),
+        ZERO16,
+    )
+
+    # Then
+    assert new_ram64.digest == rebuilt_ram64.digest
+    assert (new_ram64.digest == digest) == (new_ram64.state == ram64.state)
+    assert all(
+        new_ram64.read(i) == s for i, s in enumerate(new_ram64.state)
+    ), "`read` must agree with `state`"
+
+
+def test_ram16k_digest_changes_only_when_a_value_changes() -> None:
+    # Given
+    ram16k = RAM16K.create()
+    xs = utils.make_one_hot(n=16, i=3)
+    address = utils.int_to_bit_vector(12_345, n=14)
+
+    # When
+    unchanged = ram16k(xs, False, address)
+    changed = unchanged(xs, True, address)
+    restored = changed(ZERO16, True, address)
+
+    # Then
+    assert unchanged.digest == ram16k.digest
+    assert changed.digest != ram16k.digest
+    assert changed.read(12_345) == xs
+    assert restored.digest == ram16k.digest
+
+
+@pytest.mark.parametrize(
+    "component",
+    [
+        DFF(True),
+        _create_random_bit(),
+        _create_random_register(),
+        _create_random_ram8(),
+        _create_random_ram64(),
+        RAM16K.create(),
+        PC(_create_random_register()),
+    ],
+)
+def test_components_are_slotted(component) -> None:
+    # Then
+    assert not hasattr(component, "__dict__")
+    assert not hasattr(component, "__weakref__")
+    assert pickle.loads(pickle.dumps(component)) == component
+
+
+def test_dffs_and_bits_are_interned() -> None:
+    for x in (False, True):
+        for load in (False, True):
+            assert DFF(x)(x) is DFF(not x)(x)
+            assert BIT(DFF(x))(x, load) is BIT(DFF(not x))(x, True)
+
+
+@pytest.mark.parametrize(
+    "register, xs",
+    [
+        (_create_random_register(), utils.sample_bits(16))
+        for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST)
+    ],
+)
+def test_registers_are_interned_by_value(register: REGISTER16, xs: tuple[bool, ...]) -> None:
+    # When
+    new_register = register(xs, True)
+
+    # Then
+    assert new_register is REGISTER16.from_word(utils.as_word(xs))
+    assert new_register is register(utils.as_word(xs), True)
+    assert new_register(xs, False) is new_register
+    assert REGISTER16.create() is REGISTER16.create()
+    assert all(r is REGISTER16.create() for r in RAM8.create().registers)
@@ -0,0 +1,150 @@
+import gates
+import netlist
+import pytest
+
+from arithmetic import ADD16, ALU, INC16
+from computer import CPU
+from memory import PC, RAM8, REGISTER16
+from stimulus import Stimulus
+from utils import Word16, int_to_bit_vector, sample_bits, to_int
+
+
+NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST = 1_024
+
+ALU_CONTROLS = ["zx", "nx", "zy", "ny", "f", "no"]
+
+
+@pytest.fixture(scope="module")
+def netlists() -> dict[str, netlist.Netlist]:
+    return {
+        "ADD16": netlist.add16(),
+        "INC16": netlist.inc16(),
+        "ALU": netlist.alu(),
+        "CPU": netlist.cpu(),
+        "RAM8": netlist.ram8(),
+    }
+
+
+def test_adder_netlists_are_equivalent_to_the_adders(netlists):
+    for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST):
+        xs, ys = sample_bits(16), sample_bits(16)
+
+        assert netlists["ADD16"].evaluate({"xs": to_int(xs), "ys": to_int(ys)}) == {
+            "out": to_int(ADD16(xs, ys))
+        }
+        assert netlists["INC16"].evaluate({"xs": to_int(xs)}) == {"out": to_int(INC16(xs))}
+
+
+def test_alu_netlist_is_equivalent_to_the_alu(netlists):
+    stimulus = Stimulus(seed=0)
+    xs, ys = stimulus.words(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST), stimulus.words(64)
+
+    for i, x in enumerate(xs):
+        controls = int_to_bit_vector(i % 64, n=6)
+        y = ys[i % 64]
+        out, zr, ng = ALU(int_to_bit_vector(x, n=16), int_to_bit_vector(y, n=16), *controls)
+
+        assert netlists["ALU"].evaluate(
+            {"xs": x, "ys": y, **{c: int(v) for c, v in zip(ALU_CONTROLS, controls)}}
+        ) == {"out": to_int(out), "zr": zr, "ng": ng}
+
+
+def test_cpu_netlist_is_equivalent_to_one_cpu_cycle(netlists):
+    stimulus = Stimulus(seed=0)
+    instructions = stimulus.instructions(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST)
+
+    for instruction in instructions:
+        a, d, pc, in_m = (to_int(sample_bits(16)) for _ in range(4))
+        zr, ng, reset = sample_bits(3)
+        ng = ng and not zr
+        old_out_m = 0 if zr else 0x8000 if ng else 1  # consistent with the flags
+        state = CPU(
+            REGISTER16.from_word(Word16(a)),
+            REGISTER16.from_word(Word16(d)),
+            PC(REGISTER16.from_word(Word16(pc))),
+            zr,
+            ng,
+            int_to_bit_vector(old_out_m, n=16),
+            False,
+        )
+        new = state(int_to_bit_vector(instruction, n=16), int_to_bit_vector(in_m, n=16), reset)
+
+        assert netlists["CPU"].evaluate(
+            {
+                "instruction": instruction,
+                "in_m": in_m,
+                "reset": reset,
+                "a": a,
+                "d": d,
+                "pc": pc,
+                "zr": zr,
+                "ng": ng,
+            }
+        ) == {
+            "out_m": to_int(new.out_m),
+            "write_m": new.write_m,
+            "next_a": to_int(new.a_register.out),
+            "next_d": to_int(new.d_register.out),
+            "next_pc": to_int(new.pc.out),
+            "next_zr": new._zr,
+            "next_ng": new._ng,
+        }
+
+
+def test_ram8_netlist_is_equivalent_to_one_ram8_cycle(netlists):
+    for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST // 8):
+        registers = [to_int(sample_bits(16)) for _ in range(8)]
+        x, address, (load,) = to_int(sample_bits(16)), to_int(sample_bits(3)), sample_bits(1)
+        state = RAM8(tuple(REGISTER16.from_word(Word16(r)) for r in registers), (False,) * 16)
+        new = state(int_to_bit_vector(x, n=16), load, int_to_bit_vector(address, n=3))
+
+        assert netlists["RAM8"].evaluate(
+            {"xs": x, "load": load, "address": address}
+            | {f"r{i}": r for i, r in enumerate(registers)}
+        ) == {"out": to_int(new.out)} | {
+            f"next_r{i}": to_int(r.out) for i, r in enumerate(new.registers)
+        }
+
+
+def test_netlists_are_deduplicated_and_have_no_dead_gates(netlists):
+    for n in netlists.values():
+        read = {i for _, ins in n.gates for i in ins}
+        driven = {w for ws in n.outputs.values() for w in ws}
+
+        assert len(set(n.gates)) == len(n.gates)
+        assert all(n.first_gate + k in read | driven for k in range(len(n.gates)))
+
+
+def test_netlists_round_trip_through_files(netlists, tmp_path):
+    for name, n in netlists.items():
+        path = str(tmp_path / f"{name}.net")
+        n.save(path)
+
+        assert netlist.Netlist.load(path) == n
+        assert netlist.Netlist.load(path).fingerprint() == n.fingerprint()
+
+
+def test_tracing_restores_the_gates():
+    before = gates.AND
+
+    netlist.alu()
+
+    assert gates.AND is before
+
+
+def test_branching_on_a_traced_signal_is_rejected():
+    def fn(x, y):  # type: ignore
+        return {"out": x if gates.AND(x, y) else y}
+
+    with pytest.raises(netlist.Untraceable):
+        netlist.trace("branch", fn, {"x": 1, "y": 1})
+
+
+def test_indexing_or_shifting_by_a_traced_signal_is_rejected():
+    for fn in [
+        lambda x, y: {"out": (x, y)[x]},
+        lambda x, y: {"out": {(False,): y}.get((x,), y)},
+        lambda x, y: {"out": y << x},
+    ]:
+        with pytest.raises(netlist.Untraceable):
+            netlist.trace("values", fn, {"x": 1, "y": 1})
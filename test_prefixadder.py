@@ -0,0 +1,122 @@
+import arithmetic
+import engines
+import itertools
+import lanes
+import prefixadder
+import pytest
+
+from functools import partial
+from memory import PC
+from utils import Word16, sample_bits, to_int
+
+
+NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST = 1_024
+
+
+def test_networks_have_the_textbook_shapes():
+    assert [len(level) for level in prefixadder.KOGGE_STONE] == [15, 14, 12, 8]
+    assert [len(level) for level in prefixadder.BRENT_KUNG] == [8, 4, 2, 1, 1, 3, 7]
+
+
+def test_a_network_must_combine_adjacent_spans():
+    with pytest.raises(AssertionError):
+        prefixadder._spans((((2, 0),),))
+
+
+@pytest.mark.parametrize("network", prefixadder.NETWORKS)
+def test_add16_is_equivalent_to_the_ripple_adder_on_every_pair_of_bytes(network):
+    # every pair of low bytes, and every pair of high bytes with and without a carry out
+    # of the low byte, as in `test_byteadder.py`
+    rows = [
+        (x << 8 | low_x, y << 8 | low_y)
+        for low_x, low_y in [(0, 0), (0xFF, 0x01)]
+        for x in range(256)
+        for y in range(256)
+    ]
+    rows += [(x, y) for x in range(256) for y in range(256)]
+    xs, ys = [x for x, _ in rows], [y for _, y in rows]
+    add16 = partial(prefixadder.ADD16, network=prefixadder.NETWORKS[network])
+
+    assert lanes.apply(add16, xs, ys) == lanes.apply(arithmetic.ADD16, xs, ys)
+
+
+@pytest.mark.parametrize("network", prefixadder.NETWORKS)
+def test_inc16_and_neg16_are_equivalent_to_the_ripple_adder_for_every_input(network):
+    values = list(range(2**16))
+
+    with engines.using(prefixadder.engine(network)):
+        incremented = lanes.apply(arithmetic.INC16, values)
+        negated = lanes.apply(arithmetic.NEG16, values)
+
+    assert incremented == lanes.apply(arithmetic.INC16, values)
+    assert negated == lanes.apply(arithmetic.NEG16, values)
+
+
+def test_outputs_have_the_types_of_the_reference():
+    for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST // 4):
+        xs, ys = tuple(sample_bits(16)), tuple(sample_bits(16))
+        x, y = Word16(to_int(xs)), Word16(to_int(ys))
+
+        for network in prefixadder.NETWORKS.values():
+            for args in [(xs, ys), (x, ys), (xs, y), (x, y)]:
+                out, reference = prefixadder.ADD16(*args, network), arithmetic.ADD16(*args)
+
+                assert type(out) is type(reference)
+                assert out == reference
+
+            for a in (xs, x):
+                out, reference = prefixadder.INC16(a, network), arithmetic.INC16(a)
+
+                assert type(out) is type(reference)
+                assert out == reference
+
+
+@pytest.mark.parametrize("network", prefixadder.NETWORKS)
+def test_engine_adds_inside_the_alu_and_the_pc(network):
+    # Given
+    reference = fast = PC.create()
+
+    # When / Then
+    for i in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST // 4):
+        xs, ys, controls = sample_bits(16), sample_bits(16), sample_bits(6)
+        load, (inc,) = i % 64 == 0, sample_bits(1)
+        want = arithmetic.ALU(xs, ys, *controls)
+        reference = reference(xs, load, inc, False)
+
+        with engines.using(prefixadder.engine(network)):
+            assert arithmetic.ALU(xs, ys, *controls) == want
+            fast = fast(xs, load, inc, False)
+
+        assert fast.out == reference.out
+
+
+def test_prefix_adders_are_shallower_and_larger_than_the_ripple_adder():
+    # When
+    comparisons = prefixadder.compare(samples=4, min_seconds=0.001)
+    timings = {(c.adder, c.component): c.timing for c in comparisons}
+
+    # Then
+    assert len(comparisons) == len(prefixadder.ADDERS) * len(prefixadder.COMPONENTS)
+    assert all(c.rate > 0 for c in comparisons)
+
+    for component in prefixadder.COMPONENTS:
+        ripple, kogge_stone, brent_kung = (
+            timings[adder, component] for adder in ("ripple", "kogge-stone", "brent-kung")
+        )
+
+        assert kogge_stone.critical_delay <= brent_kung.critical_delay < ripple.critical_delay
+        assert kogge_stone.gates > brent_kung.gates > ripple.gates
+
+    assert timings["kogge-stone", "ADD16"].depth < timings["ripple", "ADD16"].depth // 3
+    assert "kogge-stone" in prefixadder.table(comparisons)
+
+
+def test_the_netlists_of_a_prefix_adder_trace_its_gates():
+    reference, fast = prefixadder.netlists("ripple"), prefixadder.netlists("brent-kung")
+    rows = list(itertools.product([0, 1, 0x7FFF, 0x8000, 0xFFFF], repeat=2))
+
+    for x, y in rows:
+        inputs = {"xs": x, "ys": y}
+
+        assert fast["ADD16"].evaluate(inputs) == reference["ADD16"].evaluate(inputs)
+        assert fast["INC16"].evaluate({"xs": x}) == reference["INC16"].evaluate({"xs": x})
@@ -0,0 +1,76 @@
+import pytest
+
+from decoder import is_valid
+from stimulus import Stimulus, to_bits, to_words
+from utils import Word16, int_to_bit_vector, is_n_bit_vector
+
+
+NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST = 4_096
+
+
+@pytest.mark.parametrize("numpy", [False, True])
+def test_stimulus_is_reproducible_from_its_seed(numpy: bool):
+    if numpy:
+        pytest.importorskip("numpy")
+
+    # Given
+    fst, snd = Stimulus(seed=42, numpy=numpy), Stimulus(seed=42, numpy=numpy)
+
+    # When / Then
+    for _ in range(3):
+        assert list(fst.words(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST)) == list(
+            snd.words(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST)
+        )
+        assert list(fst.instructions(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST)) == list(
+            snd.instructions(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST)
+        )
+
+    assert list(Stimulus(seed=1).words(64)) != list(Stimulus(seed=2).words(64))
+
+
+@pytest.mark.parametrize("numpy", [False, True])
+@pytest.mark.parametrize("width", [1, 3, 13, 14, 15, 16])
+def test_addresses_fit_in_their_width(numpy: bool, width: int):
+    if numpy:
+        pytest.importorskip("numpy")
+
+    addresses = Stimulus(seed=0, numpy=numpy).addresses(
+        NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST, width
+    )
+
+    assert len(addresses) == NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST
+    assert all(0 <= a < 2**width for a in addresses)
+    assert max(addresses) >= 2 ** (width - 1), "high addresses must be drawn"
+
+
+@pytest.mark.parametrize("numpy", [False, True])
+@pytest.mark.parametrize("c_fraction", [0.0, 0.5, 1.0])
+def test_instructions_are_valid(numpy: bool, c_fraction: float):
+    if numpy:
+        pytest.importorskip("numpy")
+
+    instructions = Stimulus(seed=0, numpy=numpy).instructions(
+        NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST, c_fraction
+    )
+    c_instructions = sum(int(i) >> 15 for i in instructions)
+
+    assert all(is_valid(int(i)) for i in instructions)
+    assert c_instructions == pytest.approx(
+        c_fraction * NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST, abs=256
+    )
+
+
+def test_converters_agree_with_the_tuple_form():
+    words = Stimulus(seed=0).words(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST)
+
+    bits = to_bits(words)
+    word16s = to_words(words)
+
+    assert all(is_n_bit_vector(xs, n=16) for xs in bits)
+    assert all(type(w) is Word16 for w in word16s)
+    assert bits == [int_to_bit_vector(w, n=16) for w in words]
+    assert bits == word16s
+
+    addresses = Stimulus(seed=0).addresses(8, width=3)
+
+    assert to_bits(addresses, n=3) == [int_to_bit_vector(a, n=3) for a in addresses]
@@ -0,0 +1,90 @@
+import gates
+import json
+import netlist
+import pytest
+import timing
+
+
+@pytest.fixture(scope="module")
+def timings() -> dict[str, timing.Timing]:
+    return {name: timing.analyse(fn()) for name, fn in timing.NETLISTS.items()}
+
+
+def test_small_netlist_is_timed_gate_by_gate():
+    # Given
+    def fn(x, y, z):  # type: ignore
+        return {"out": gates.XOR(gates.AND(x, y), z), "copy": z}
+
+    n = netlist.trace("small", fn, {"x": 1, "y": 1, "z": 1})
+
+    # When
+    t = timing.analyse(n)
+
+    # Then
+    assert t.gates == 2
+    assert t.nand_gates == 2 + 4
+    assert t.depths == {"out": (2,), "copy": (0,)}
+    assert t.delays == {"out": (2 + 3,), "copy": (0,)}
+    assert t.critical_path == ("x", "AND", "XOR", "out")
+    assert t.port_delays == {
+        ("x", "out"): 5,
+        ("y", "out"): 5,
+        ("z", "out"): 3,
+        ("z", "copy"): 0,
+    }
+
+
+def test_ripple_carry_gets_deeper_with_significance(timings):
+    delays = timings["ADD16"].delays["out"]
+
+    assert all(msb >= lsb for msb, lsb in zip(delays, delays[1:]))
+    assert delays[0] == timings["ADD16"].critical_delay
+    assert timings["ADD16"].critical_path[-1] == "out[0]"
+    assert timings["INC16"].critical_delay < timings["ADD16"].critical_delay
+
+
+def test_the_critical_path_crosses_the_deepest_gates(timings):
+    for t in timings.values():
+        ops = t.critical_path[1:-1]
+
+        assert sum(timing.NAND_DELAYS[op] for op in ops) == t.critical_delay
+        assert len(ops) <= t.depth
+        assert max(t.port_delays.values()) == t.critical_delay
+
+
+def test_post_conditions_catch_wrong_arrival_times(monkeypatch):
+    arrivals = timing.arrivals
+
+    def late(n, delays, sources=None):  # type: ignore
+        time, latest = arrivals(n, delays, sources)
+        return [t + 1 for t in time], latest
+
+    monkeypatch.setattr(timing, "arrivals", late)
+
+    with pytest.raises(AssertionError, match="must add up to the critical delay"):
+        timing.analyse(netlist.alu())
+
+
+def test_gate_delays_are_configurable():
+    n = netlist.alu()
+
+    unit = timing.analyse(n, dict.fromkeys(netlist.OPS, 1))
+
+    assert unit.critical_delay == unit.depth == timing.analyse(n).depth
+
+
+def test_the_cpu_clock_is_bounded_by_its_slowest_path(timings):
+    cpu = timings["CPU"]
+
+    assert cpu.max_clock_rate(gate_delay=1e-9) == pytest.approx(1e9 / cpu.critical_delay)
+    assert cpu.critical_delay >= timings["ALU"].critical_delay
+    assert 0 < cpu.port_delays["zr", "next_pc"] < cpu.critical_delay  # the jump logic
+    assert ("reset", "write_m") not in cpu.port_delays
+
+
+def test_reports_cover_every_netlist(timings):
+    report = json.loads(json.dumps([t.to_dict(gate_delay=1e-11) for t in timings.values()]))
+    text = timing.table(list(timings.values()), gate_delay=1e-11)
+
+    assert [r["name"] for r in report] == list(timing.NETLISTS)
+    assert all(f"# {name}: " in text for name in timing.NETLISTS)
@@ -0,0 +1,80 @@
+import pickle
+import pytest
+import random
+
+from utils import Word16, as_word, int_to_bit_vector, is_n_bit_vector, to_int
+
+
+NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST = 1_024
+
+
+def test_word16_behaves_like_a_16_tuple_of_bools():
+    for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST):
+        value = random.randint(0, 2**16 - 1)
+        xs = int_to_bit_vector(value, n=16)
+        word = Word16(value)
+
+        assert len(word) == 16
+        assert word == xs
+        assert xs == word
+        assert tuple(word) == xs
+        assert word.bits == xs
+        assert word[1:] == xs[1:]
+        assert word[3:10] == xs[3:10]
+        assert all(word[i] == xs[i] for i in range(-16, 16))
+        assert hash(word) == hash(xs)
+        assert is_n_bit_vector(word, n=16)
+        assert to_int(word) == value
+        assert as_word(xs) == word
+
+
+def test_word16_is_immutable():
+    word = Word16(42)
+
+    with pytest.raises(AttributeError):
+        word.value = 43  # type: ignore
+
+    assert word.value == 42
+
+
+def test_word16_can_be_pickled():
+    word = Word16(0xBEEF)
+    assert pickle.loads(pickle.dumps(word)) == word
+
+
+def test_word16_rejects_out_of_range_values():
+    with pytest.raises(AssertionError):
+        Word16(2**16)
+
+    with pytest.raises(AssertionError):
+        Word16(-1)
+
+
+def test_word16_is_not_an_n_bit_vector_for_other_widths():
+    assert not is_n_bit_vector(Word16(0), n=15)
+    assert not is_n_bit_vector(Word16(0), n=8)
+
+
+@pytest.mark.parametrize("n", [1, 3, 7, 8, 9, 12, 13, 14, 15, 16, 17, 24, 32])
+def test_conversions_round_trip_for_every_width(n: int):
+    for _ in range(NUMBER_OF_SAMPLES_TO_DRAW_PER_TEST):
+        i = random.randint(0, 2**n - 1)
+        xs = int_to_bit_vector(i, n)
+
+        assert xs == tuple(b == "1" for b in bin(i)[2:].zfill(n))
+        assert to_int(xs) == i
+
+
+def test_conversions_are_exhaustive_for_16_bit_words():
+    for i in range(2**16):
+        assert to_int(int_to_bit_vector(i, n=16)) == i
+
+
+def test_int_to_bit_vector_raises_when_input_does_not_fit():
+    with pytest.raises(ValueError):
+        int_to_bit_vector(2**15, n=15)
+
+
+def test_to_int_rejects_an_empty_tuple():
+    with pytest.raises(AssertionError):
+        to_int(())
@@ -0,0 +1,236 @@
+"""Static timing analysis of gate netlists.
+
+Every gate of a netlist (see `netlist`) is costed as its implementation in NAND gates, as
+the chips are built in the Hack course:
+
+- `NAND` and `NOT` (a `NAND` with tied inputs) are one NAND, one NAND delay deep;
+- `AND` is a `NAND` and a `NOT`: two NANDs, two delays;
+- `OR` is a `NAND` of two `NOT`s: three NANDs, two delays;
+- `XOR` and `MUX` are four NANDs, three delays.
+
+`analyse` reports the depth in gates and the delay in NAND delays of every output bit,
+the critical path, i.e. the slowest path from an input to an output, the delay between
+every pair of ports, and the size in NAND gates. For a component that is clocked, e.g.
+the `CPU`, whose registers are ports, the critical path bounds the clock period:
+
+    timing = timing.analyse(netlist.cpu())
+
+    print(timing.critical_delay, timing.max_clock_rate(gate_delay=10e-12))
+    print(timing.port_delays["zr", "next_pc"])  # through the jump logic
+
+The per-gate delays are configurable, e.g. to model a library with a native `XOR`. Run
+`python timing.py` for a report on the components in `NETLISTS`.
+"""
+
+import argparse
+import json
+import netlist
+
+from dataclasses import dataclass
+from netlist import OPS, Netlist
+from typing import Callable, Sequence
+
+
+# The size of every gate in NAND gates
+NAND_GATES: dict[str, int] = {"NAND": 1, "NOT": 1, "AND": 2, "OR": 3, "XOR": 4, "MUX": 4}
+
+# The delay of every gate in NAND delays
+NAND_DELAYS: dict[str, float] = {"NAND": 1, "NOT": 1, "AND": 2, "OR": 2, "XOR": 3, "MUX": 3}
+
+NETLISTS: dict[str, Callable[[], Netlist]] = {
+    "ADD16": netlist.add16,
+    "INC16": netlist.inc16,
+    "ALU": netlist.alu,
+    "CPU": netlist.cpu,
+    "RAM8": netlist.ram8,
+}
+
+_UNREACHED = float("-inf")
+
+
+@dataclass(frozen=True, slots=True)
+class Timing:
+    """The result of a static timing analysis of a netlist."""
+
+    name: str
+    gates: int
+    nand_gates: int
+    depths: dict[str, tuple[int, ...]]
+    delays: dict[str, tuple[float, ...]]
+    port_delays: dict[tuple[str, str], float]
+    critical_path: tuple[str, ...]
+    critical_delay: float
+
+    @property
+    def depth(self) -> int:
+        """The depth in gates of the deepest output bit."""
+        return max((d for ds in self.depths.values() for d in ds), default=0)
+
+    def max_clock_rate(self, gate_delay: float) -> float:
+        """The highest clock rate in Hz at which the critical path settles, given the delay of a NAND gate in seconds."""
+        # pre-conditions
+        assert gate_delay > 0, "`gate_delay` must be positive"
+
+        # body
+        return 1 / (self.critical_delay * gate_delay) if self.critical_delay else float("inf")
+
+    def to_dict(self, gate_delay: float) -> dict:
+        """The analysis as a JSON-serialisable `dict`, with the clock rate for `gate_delay`."""
+        return {
+            "name": self.name,
+            "gates": self.gates,
+            "nand_gates": self.nand_gates,
+            "depth": self.depth,
+            "critical_delay": self.critical_delay,
+            "max_clock_rate": self.max_clock_rate(gate_delay),
+            "critical_path": list(self.critical_path),
+            "depths": {port: list(ds) for port, ds in self.depths.items()},
+            "delays": {port: list(ds) for port, ds in self.delays.items()},
+            "port_delays": [
+                {"from": i, "to": o, "delay": d} for (i, o), d in self.port_delays.items()
+            ],
+        }
+
+
+def arrivals(
+    n: Netlist, delays: dict[str, float], sources: Sequence[int] | None = None
+) -> tuple[list[float], list[int]]:
+    """
+    Computes when every wire of `n` settles.
+
+    Args:
+        n: the netlist
+        delays: the delay of every gate
+        sources: the wires that change at time 0, or every input and constant if `None`
+
+    Returns:
+        the arrival time of every wire, `-inf` if no source reaches it, and the input of
+        every gate's wire that arrives last, or -1 for wires that are not driven by a gate
+    """
+    time = [0.0 if sources is None else _UNREACHED] * n.wires
+    latest = [-1] * n.wires
+
+    for w in sources or ():
+        time[w] = 0.0
+
+    first_gate = n.first_gate
+
+    for k, (op, ins) in enumerate(n.gates):
+        last = max(ins, key=time.__getitem__)
+
+        if time[last] != _UNREACHED:
+            time[first_gate + k] = time[last] + delays[op]
+            latest[first_gate + k] = last
+
+    return time, latest
+
+
+def analyse(
+    n: Netlist,
+    delays: dict[str, float] = NAND_DELAYS,
+    gates: dict[str, int] = NAND_GATES,
+) -> Timing:
+    """Analyses the timing of `n` with the gate `delays` and sizes `gates`."""
+    # pre-conditions
+    assert set(delays) >= set(OPS), f"`delays` must cover {OPS}"
+    assert set(gates) >= set(OPS), f"`gates` must cover {OPS}"
+
+    # body
+    depth, _ = arrivals(n, dict.fromkeys(OPS, 1))
+    time, latest = arrivals(n, delays)
+
+    def bit(port: str, ws: tuple[int, ...], i: int) -> str:
+        return f"{port}[{i}]" if len(ws) > 1 else port
+
+    names = {w: bit(port, ws, i) for port, ws in n.inputs.items() for i, w in enumerate(ws)}
+    names |= {0: "False", 1: "True"}
+    ends = [(bit(port, ws, i), w) for port, ws in n.outputs.items() for i, w in enumerate(ws)]
+    end, w = max(ends, key=lambda end: time[end[1]], default=("", 0))
+
+    path = [end] if ends else []
+
+    while latest[w] != -1:
+        path.append(n.gates[w - n.first_gate][0])
+        w = latest[w]
+
+    if ends:
+        path.append(names[w])
+
+    port_delays = {}
+
+    for source, ws in n.inputs.items():
+        reached, _ = arrivals(n, delays, ws)
+
+        for sink, os in n.outputs.items():
+            delay = max(reached[o] for o in os)
+
+            if delay != _UNREACHED:
+                port_delays[source, sink] = delay
+
+    timing = Timing(
+        name=n.name,
+        gates=len(n.gates),
+        nand_gates=sum(gates[op] for op, _ in n.gates),
+        depths={port: tuple(int(depth[w]) for w in ws) for port, ws in n.outputs.items()},
+        delays={port: tuple(time[w] for w in ws) for port, ws in n.outputs.items()},
+        port_delays=port_delays,
+        critical_path=tuple(reversed(path)),
+        critical_delay=max((time[w] for _, w in ends), default=0.0),
+    )
+
+    # post-conditions
+    assert timing.depth <= timing.gates, "no output can be deeper than the number of gates"
+    assert timing.critical_delay == sum(
+        delays[op] for op in timing.critical_path[1:-1]
+    ), "the gates on the critical path must add up to the critical delay"
+
+    return timing
+
+
+def table(timings: Sequence[Timing], gate_delay: float) -> str:
+    """A text table of `timings`, with clock rates for a NAND delay of `gate_delay` seconds."""
+    lines = [
+        f"{'component':<10} {'gates':>7} {'NANDs':>7} {'depth':>6} {'delay':>7} {'max clock':>12}"
+    ]
+
+    for t in timings:
+        lines.append(
+            f"{t.name:<10} {t.gates:>7,} {t.nand_gates:>7,} {t.depth:>6}"
+            f" {t.critical_delay:>7g} {t.max_clock_rate(gate_delay) / 1e6:>8,.0f} MHz"
+        )
+
+    for t in timings:
+        lines.append("")
+        lines.append(f"# {t.name}: {' -> '.join(t.critical_path)}")
+        lines.append(f"{'output':<10} {'depth':>6} {'delay':>7}   slowest input")
+
+        for port in t.delays:
+            sources = [(d, i) for (i, o), d in t.port_delays.items() if o == port]
+            slowest = max(sources)[1] if sources else "-"
+            lines.append(
+                f"{port:<10} {max(t.depths[port]):>6} {max(t.delays[port]):>7g}   {slowest}"
+            )
+
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Static timing analysis of the components.")
+    parser.add_argument("names", nargs="*", choices=[[], *NETLISTS], default=[])
+    parser.add_argument(
+        "--gate-delay", type=float, default=10.0, help="the delay of a NAND gate in picoseconds"
+    )
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    timings = [analyse(NETLISTS[name]()) for name in args.names or NETLISTS]
+    gate_delay = args.gate_delay * 1e-12
+
+    if args.json:
+        print(json.dumps([t.to_dict(gate_delay) for t in timings], indent=2))
+    else:
+        print(table(timings, gate_delay))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,96 @@ from typing import Any
 ZERO16 = (False,) * 16
 
 
+class Word16:
+    """An immutable 16-bit word backed by a native `int`.
+
+    Behaves like a 16-tuple of bools (most significant bit first): supports indexing,
+    slicing, iteration, `len` and equality with the equivalent tuple. Components take
+    their integer fast path when given a `Word16` and return `Word16`s in turn.
+    """
+
+    __slots__ = ("value",)
+
+    value: int
+
+    def __init__(self, value: int) -> None:
+        # pre-conditions
+        assert isinstance(value, int), "`value` must be an integer"
+        assert 0 <= value < 2**16, "`value` must be an integer in [0, 2^16)"
+
+        # body
+        object.__setattr__(self, "value", value)
+
+    @staticmethod
+    def from_bits(bs: tuple[bool, ...]) -> "Word16":
+        """Returns the `Word16` whose bits are `bs`."""
+        # pre-conditions
+        assert is_n_bit_vector(bs, n=16), "`bs` must be a 16-tuple of `bool`s"
+
+        # body
+        out = bs if type(bs) is Word16 else Word16(to_int(bs))
+
+        # post-conditions
+        assert out == bs, "output must have the same bits as the input"
+
+        return out
+
+    @property
+    def bits(self) -> tuple[bool, ...]:
+        """The word as a 16-tuple of bools."""
+        if not _BITS16:
+            _conversion_tables()
+
+        return _BITS16[self.value]
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("`Word16` is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("`Word16` is immutable")
+
+    def __len__(self) -> int:
+        return 16
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, slice):
+            return self.bits[key]
+
+        if not -16 <= key < 16:
+            raise IndexError("`Word16` index out of range")
+
+        return bool((self.value >> (15 - key % 16)) & 1)
+
+    def __iter__(self) -> Any:
+        return iter(self.bits)
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is Word16:
+            return self.value == other.value
+
+        if isinstance(other, tuple):
+            return self.bits == other
+
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.bits)  # consistent with equality against tuples
+
+    def __int__(self) -> int:
+        return self.value
+
+    def __repr__(self) -> str:
+        return f"Word16(0b{self.value:016b})"
+
+    def __reduce__(self) -> Any:
+        return (Word16, (self.value,))
+
+
+def as_word(xs: tuple[bool, ...]) -> Word16:
+    """Returns `xs` as a `Word16`, converting 16-tuples of bools if necessary."""
+    return xs if type(xs) is Word16 else Word16.from_bits(xs)
+
+
 @dataclass(frozen=True)
 class SymbolicInstruction:
     dest: str
@@ -23,7 +113,7 @@ def sample_bits(n: int) -> tuple:
     assert n >= 0 and isinstance(n, int), "`n` must be a non-negative integer"
 
     # body
-    out = tuple(random.choice([True, False]) for _ in range(n))
+    out = int_to_bit_vector(random.getrandbits(n), n)
 
     # post-conditions
     assert is_n_bit_vector(out, n), "output must be an `n`-bit tuple of bools"
@@ -47,7 +137,10 @@ def make_one_hot(n: int, i: int) -> tuple:
 
 
 def is_n_bit_vector(xs: Any, n: int) -> bool:
-    """Returns `True` iff `xs` is a tuple of bools of length `n`."""
+    """Returns `True` iff `xs` is a tuple of bools of length `n`. A `Word16` counts as a 16-tuple of bools."""
+    if type(xs) is Word16:
+        return n == 16
+
     if not isinstance(xs, tuple):
         return False
 
@@ -60,17 +153,64 @@ def is_n_bit_vector(xs: Any, n: int) -> bool:
     return True
 
 
+# lazily built conversion tables (see `_conversion_tables`)
+_BITS16: list[tuple[bool, ...]] = []
+_BITS15: list[tuple[bool, ...]] = []
+_BITS8: list[tuple[bool, ...]] = []
+_INT_FROM_BITS: dict[tuple[bool, ...], int] = {}
+
+
+def _conversion_tables() -> None:
+    """Builds the lookup tables used by `to_int` and `int_to_bit_vector`.
+
+    `_BITS16` and `_BITS15` hold every 16- and 15-bit vector indexed by value and `_BITS8`
+    holds every byte. `_INT_FROM_BITS` maps every 16- and 15-bit vector, and every
+    vector of 1 to 8 bits, back to its value. Other widths are converted a byte at a time.
+    """
+    if _INT_FROM_BITS:
+        return
+
+    bits8 = [tuple(bool((i >> j) & 1) for j in range(7, -1, -1)) for i in range(2**8)]
+    bits16 = [hi + lo for hi in bits8 for lo in bits8]
+    bits15 = [bs[1:] for bs in bits16[: 2**15]]
+
+    int_from_bits = {}
+
+    for n in range(1, 9):
+        for i in range(2**n):
+            int_from_bits[bits8[i][8 - n :]] = i
+
+    int_from_bits.update((bs, i) for i, bs in enumerate(bits15))
+    int_from_bits.update((bs, i) for i, bs in enumerate(bits16))
+
+    _BITS8[:] = bits8
+    _BITS16[:] = bits16
+    _BITS15[:] = bits15
+    _INT_FROM_BITS.update(int_from_bits)
+
+
 def to_int(bs: tuple[bool, ...]) -> int:
     """Converts a tuple of boolean values into an integer."""
+    if type(bs) is Word16:
+        return bs.value
+
     # pre-conditions
     assert isinstance(bs, tuple), "input must be a tuple"
+    assert len(bs) > 0, "input must not be empty"
     assert all(isinstance(b, bool) for b in bs), "input must be a tuple of bools"
 
     # body
-    int_values = [int(value) for value in bs]
-    str_values = [str(value) for value in int_values]
-    binary_repr = "".join(str_values)
-    out = int(binary_repr, 2)
+    if not _INT_FROM_BITS:
+        _conversion_tables()
+
+    out = _INT_FROM_BITS.get(bs)
+
+    if out is None:
+        out = 0
+
+        for i in range(0, len(bs), 8):
+            chunk = bs[i : i + 8]
+            out = (out << len(chunk)) | _INT_FROM_BITS.get(chunk, 0)
 
     # post-conditions
     assert isinstance(out, int), "output must be an integer"
@@ -84,15 +224,31 @@ def int_to_bit_vector(i: int, n: int) -> tuple[bool, ...]:
     assert isinstance(i, int), "input must be an integer"
     assert isinstance(n, int), "input must be an integer"
     assert n >= 0, "input must be a non-negative integer"
+    assert i >= 0, "input must be a non-negative integer"
 
     if n < i.bit_length():
         raise ValueError("input is too large to fit in `n` bits")
 
     # body
-    binary = bin(i)
-    binary = binary[2:]  # remove the "0b" prefix
-    binary = binary.zfill(n)  # pad with leading zeros
-    out = tuple(bit == "1" for bit in binary)
+    if not _INT_FROM_BITS:
+        _conversion_tables()
+
+    if n == 16:
+        out = _BITS16[i]
+    elif n == 15:
+        out = _BITS15[i]
+    elif n <= 8:
+        out = _BITS8[i][8 - n :]
+    elif n < 16:
+        out = _BITS16[i][16 - n :]
+    else:
+        n_bytes = (n + 7) // 8
+        out = ()
+
+        for k in range(n_bytes - 1, -1, -1):
+            out += _BITS8[(i >> (8 * k)) & 0xFF]
+
+        out = out[8 * n_bytes - n :]
 
     # post-conditions
     assert is_n_bit_vector(out, n), "output must be an `n`-bit tuple of bools"